@@ -40,6 +40,13 @@ def is_sqlite(url: str) -> bool:
     return url.startswith("sqlite")
 
 
+def include_name(name, type_, parent_names) -> bool:
+    """Ignora objetos fora do metadata (ex.: tabela FTS5 de prontuários e suas shadow tables)."""
+    if type_ == "table" and name and name.startswith("records_fts"):
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """
     Executa migrações no modo 'offline'.
@@ -53,6 +60,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         compare_type=True,
         render_as_batch=is_sqlite(url),  # essencial para ALTER TABLE no SQLite
+        include_name=include_name,
         dialect_opts={"paramstyle": "named"},
     )
 
@@ -77,6 +85,7 @@ def run_migrations_online() -> None:
             target_metadata=target_metadata,
             compare_type=True,
             render_as_batch=is_sqlite(DATABASE_URL),  # essencial para SQLite
+            include_name=include_name,
         )
 
         with context.begin_transaction():
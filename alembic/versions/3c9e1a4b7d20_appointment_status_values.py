@@ -0,0 +1,55 @@
+# alembic/scripts.py.mako
+
+"""appointment status values
+
+Revision ID: 3c9e1a4b7d20
+Revises: f698720e50a9
+Create Date: 2026-10-19 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e1a4b7d20'
+down_revision: Union[str, Sequence[str], None] = 'f698720e50a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# O CHECK original não batia com os status usados pelo router (CONFIRMED, CANCELLED, ...)
+OLD_TO_NEW = {"DONE": "COMPLETED", "CANCELED": "CANCELLED", "NOSHOW": "NO_SHOW"}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_constraint('ck_appointment_status', type_='check')
+
+    for old, new in OLD_TO_NEW.items():
+        op.execute(sa.text("UPDATE appointments SET status = :new WHERE status = :old").bindparams(old=old, new=new))
+
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.create_check_constraint(
+            'ck_appointment_status',
+            "status in ('SCHEDULED','CONFIRMED','CANCELLED','COMPLETED','NO_SHOW')",
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_constraint('ck_appointment_status', type_='check')
+
+    for old, new in OLD_TO_NEW.items():
+        op.execute(sa.text("UPDATE appointments SET status = :old WHERE status = :new").bindparams(old=old, new=new))
+    # CONFIRMED não existia: volta para SCHEDULED
+    op.execute(sa.text("UPDATE appointments SET status = 'SCHEDULED' WHERE status = 'CONFIRMED'"))
+
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.create_check_constraint(
+            'ck_appointment_status',
+            "status in ('SCHEDULED','DONE','CANCELED','NOSHOW')",
+        )
@@ -0,0 +1,38 @@
+# alembic/scripts.py.mako
+
+"""appointment keyset indexes
+
+Revision ID: 7b2d5e8f1a36
+Revises: 3c9e1a4b7d20
+Create Date: 2026-10-19 10:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2d5e8f1a36'
+down_revision: Union[str, Sequence[str], None] = '3c9e1a4b7d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.create_index('ix_appointments_professional_status_date', ['professional_id', 'status', 'date', 'id'], unique=False)
+        batch_op.create_index('ix_appointments_status_date', ['status', 'date', 'id'], unique=False)
+        batch_op.create_index('ix_appointments_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_appointments_professional_created_at', ['professional_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_index('ix_appointments_professional_created_at')
+        batch_op.drop_index('ix_appointments_created_at_id')
+        batch_op.drop_index('ix_appointments_status_date')
+        batch_op.drop_index('ix_appointments_professional_status_date')
@@ -0,0 +1,87 @@
+# alembic/scripts.py.mako
+
+"""records fts external content
+
+Revision ID: a2c4e6f8b031
+Revises: f7b1d3e5a824
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2c4e6f8b031'
+down_revision: Union[str, Sequence[str], None] = 'f7b1d3e5a824'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# records_fts deixa de guardar uma cópia descomprimida de notes: vira um índice
+# "external content" sobre a view records_notes_source (notes_text(notes)).
+# ATENÇÃO: a view referencia `records`; um batch_alter_table que recrie a tabela no SQLite
+# precisa derrubar view, índice e triggers antes e recriá-los depois (como aqui).
+EXTERNAL_DDL = [
+    "CREATE VIEW IF NOT EXISTS records_notes_source AS "
+    "SELECT id, notes_text(notes) AS notes FROM records",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5("
+    "notes, content = 'records_notes_source', content_rowid = 'id', "
+    "tokenize = 'unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS records_fts_ai AFTER INSERT ON records BEGIN "
+    "INSERT INTO records_fts(rowid, notes) VALUES (new.id, notes_text(new.notes)); END",
+    "CREATE TRIGGER IF NOT EXISTS records_fts_ad AFTER DELETE ON records BEGIN "
+    "INSERT INTO records_fts(records_fts, rowid, notes) "
+    "VALUES ('delete', old.id, notes_text(old.notes)); END",
+    "CREATE TRIGGER IF NOT EXISTS records_fts_au AFTER UPDATE OF notes ON records BEGIN "
+    "INSERT INTO records_fts(records_fts, rowid, notes) "
+    "VALUES ('delete', old.id, notes_text(old.notes)); "
+    "INSERT INTO records_fts(rowid, notes) VALUES (new.id, notes_text(new.notes)); END",
+]
+
+# forma anterior (f4a8c2d6e019): tabela FTS5 com conteúdo próprio
+STANDALONE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5("
+    "notes, tokenize = 'unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS records_fts_ai AFTER INSERT ON records BEGIN "
+    "INSERT INTO records_fts(rowid, notes) VALUES (new.id, notes_text(new.notes)); END",
+    "CREATE TRIGGER IF NOT EXISTS records_fts_ad AFTER DELETE ON records BEGIN "
+    "DELETE FROM records_fts WHERE rowid = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS records_fts_au AFTER UPDATE OF notes ON records BEGIN "
+    "UPDATE records_fts SET notes = notes_text(new.notes) WHERE rowid = old.id; END",
+]
+
+
+def _drop_fts() -> None:
+    for name in ("records_fts_ai", "records_fts_ad", "records_fts_au"):
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP TABLE IF EXISTS records_fts")
+    op.execute("DROP VIEW IF EXISTS records_notes_source")
+
+
+def _register_functions() -> None:
+    from core.compression import register_sqlite_functions
+
+    register_sqlite_functions(op.get_bind().connection.driver_connection)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    _register_functions()
+    _drop_fts()
+    for stmt in EXTERNAL_DDL:
+        op.execute(stmt)
+    op.execute("INSERT INTO records_fts(records_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    _register_functions()
+    _drop_fts()
+    for stmt in STANDALONE_DDL:
+        op.execute(stmt)
+    op.execute("INSERT INTO records_fts(rowid, notes) SELECT id, notes_text(notes) FROM records")
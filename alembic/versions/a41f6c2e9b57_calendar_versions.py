@@ -0,0 +1,36 @@
+# alembic/scripts.py.mako
+
+"""calendar versions
+
+Revision ID: a41f6c2e9b57
+Revises: 7b2d5e8f1a36
+Create Date: 2026-10-19 11:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41f6c2e9b57'
+down_revision: Union[str, Sequence[str], None] = '7b2d5e8f1a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('calendar_versions',
+    sa.Column('professional_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['professional_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('professional_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('calendar_versions')
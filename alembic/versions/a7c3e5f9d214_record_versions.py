@@ -0,0 +1,69 @@
+# alembic/scripts.py.mako
+
+"""record versions
+
+Revision ID: a7c3e5f9d214
+Revises: f4a8c2d6e019
+Create Date: 2026-10-19 16:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e5f9d214'
+down_revision: Union[str, Sequence[str], None] = 'f4a8c2d6e019'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('record_versions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('record_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=10), nullable=False),
+    sa.Column('payload', sa.LargeBinary(), nullable=False),
+    sa.Column('professional_id', sa.Integer(), nullable=True),
+    sa.Column('reason', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.CheckConstraint("kind in ('snapshot','delta')", name='ck_record_versions_kind'),
+    sa.ForeignKeyConstraint(['professional_id'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['record_id'], ['records.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('record_id', 'version', name='uq_record_versions_record_version')
+    )
+    with op.batch_alter_table('record_versions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_record_versions_id'), ['id'], unique=False)
+
+    # ADD COLUMN simples: no SQLite não recria a tabela (triggers do FTS ficam intactos)
+    with op.batch_alter_table('records', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    # sem backfill: o snapshot base de cada prontuário é gravado na primeira emenda
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    triggers = []
+    if bind.dialect.name == "sqlite":
+        # DROP COLUMN em batch recria records e descarta os triggers do FTS: guarda e recria
+        triggers = bind.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'records'"
+        ).scalars().all()
+    with op.batch_alter_table('records', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('version')
+    for stmt in triggers:
+        op.execute(stmt.replace("CREATE TRIGGER ", "CREATE TRIGGER IF NOT EXISTS ", 1))
+
+    with op.batch_alter_table('record_versions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_record_versions_id'))
+
+    op.drop_table('record_versions')
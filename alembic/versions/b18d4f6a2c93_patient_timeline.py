@@ -0,0 +1,44 @@
+# alembic/scripts.py.mako
+
+"""patient timeline
+
+Revision ID: b18d4f6a2c93
+Revises: a7c3e5f9d214
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b18d4f6a2c93'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e5f9d214'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('stock_movements', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('patient_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_stock_movements_patient_id', 'patients', ['patient_id'], ['id'], ondelete='SET NULL')
+        batch_op.create_index('ix_stock_patient_created_at', ['patient_id', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_index('ix_appointments_patient_date')
+        batch_op.create_index('ix_appointments_patient_date', ['patient_id', 'date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_index('ix_appointments_patient_date')
+        batch_op.create_index('ix_appointments_patient_date', ['patient_id', 'date'], unique=False)
+
+    with op.batch_alter_table('stock_movements', schema=None) as batch_op:
+        batch_op.drop_index('ix_stock_patient_created_at')
+        batch_op.drop_constraint('fk_stock_movements_patient_id', type_='foreignkey')
+        batch_op.drop_column('patient_id')
@@ -0,0 +1,59 @@
+# alembic/scripts.py.mako
+
+"""waitlist entries
+
+Revision ID: c85a3d1f0e42
+Revises: a41f6c2e9b57
+Create Date: 2026-10-19 12:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c85a3d1f0e42'
+down_revision: Union[str, Sequence[str], None] = 'a41f6c2e9b57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('waitlist_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('patient_id', sa.Integer(), nullable=False),
+    sa.Column('professional_id', sa.Integer(), nullable=False),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('earliest', sa.DateTime(), nullable=False),
+    sa.Column('latest', sa.DateTime(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('reason', sa.String(length=255), nullable=True),
+    sa.Column('offered_date', sa.DateTime(), nullable=True),
+    sa.Column('offer_expires_at', sa.DateTime(), nullable=True),
+    sa.Column('appointment_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.CheckConstraint("status in ('WAITING','OFFERED','ASSIGNED','CANCELLED')", name='ck_waitlist_status'),
+    sa.CheckConstraint('priority between 1 and 5', name='ck_waitlist_priority'),
+    sa.CheckConstraint('earliest <= latest', name='ck_waitlist_range'),
+    sa.ForeignKeyConstraint(['appointment_id'], ['appointments.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['patient_id'], ['patients.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['professional_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('waitlist_entries', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_waitlist_entries_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_waitlist_entries_patient_id'), ['patient_id'], unique=False)
+        batch_op.create_index('ix_waitlist_queue', ['professional_id', 'status', 'priority', 'created_at', 'earliest', 'latest'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('waitlist_entries', schema=None) as batch_op:
+        batch_op.drop_index('ix_waitlist_queue')
+        batch_op.drop_index(batch_op.f('ix_waitlist_entries_patient_id'))
+        batch_op.drop_index(batch_op.f('ix_waitlist_entries_id'))
+
+    op.drop_table('waitlist_entries')
@@ -0,0 +1,32 @@
+# alembic/scripts.py.mako
+
+"""records patient created_at index
+
+Revision ID: d2e7b9a4c618
+Revises: c85a3d1f0e42
+Create Date: 2026-10-19 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2e7b9a4c618'
+down_revision: Union[str, Sequence[str], None] = 'c85a3d1f0e42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('records', schema=None) as batch_op:
+        batch_op.create_index('ix_records_patient_created_at', ['patient_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('records', schema=None) as batch_op:
+        batch_op.drop_index('ix_records_patient_created_at')
@@ -0,0 +1,84 @@
+# alembic/scripts.py.mako
+
+"""record attachments
+
+Revision ID: d3f6b8c1e572
+Revises: c29e5a7b3d41
+Create Date: 2026-10-19 18:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3f6b8c1e572'
+down_revision: Union[str, Sequence[str], None] = 'c29e5a7b3d41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('attachment_blobs',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('sha256')
+    )
+    op.create_table('attachments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('record_id', sa.Integer(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('content_type', sa.String(length=120), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('uploaded_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['record_id'], ['records.id'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['sha256'], ['attachment_blobs.sha256'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['uploaded_by'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('attachments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_attachments_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_attachments_record_id'), ['record_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_attachments_sha256'), ['sha256'], unique=False)
+
+    op.create_table('attachment_uploads',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('record_id', sa.Integer(), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('content_type', sa.String(length=120), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('received', sa.BigInteger(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('attachment_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.CheckConstraint('received >= 0 and received <= size', name='ck_attachment_uploads_received'),
+    sa.ForeignKeyConstraint(['attachment_id'], ['attachments.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['record_id'], ['records.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('attachment_uploads', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_attachment_uploads_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_attachment_uploads_record_id'), ['record_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('attachment_uploads', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_attachment_uploads_record_id'))
+        batch_op.drop_index(batch_op.f('ix_attachment_uploads_id'))
+
+    op.drop_table('attachment_uploads')
+    with op.batch_alter_table('attachments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_attachments_sha256'))
+        batch_op.drop_index(batch_op.f('ix_attachments_record_id'))
+        batch_op.drop_index(batch_op.f('ix_attachments_id'))
+
+    op.drop_table('attachments')
+    op.drop_table('attachment_blobs')
@@ -0,0 +1,52 @@
+# alembic/scripts.py.mako
+
+"""records full-text search (FTS5)
+
+Revision ID: e93c4f7a2b81
+Revises: d2e7b9a4c618
+Create Date: 2026-10-19 14:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e93c4f7a2b81'
+down_revision: Union[str, Sequence[str], None] = 'd2e7b9a4c618'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# ATENÇÃO: um batch_alter_table que recrie `records` no SQLite descarta os triggers abaixo;
+# recrie-os na mesma migration se isso acontecer.
+FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5("
+    "notes, tokenize = 'unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS records_fts_ai AFTER INSERT ON records BEGIN "
+    "INSERT INTO records_fts(rowid, notes) VALUES (new.id, new.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS records_fts_ad AFTER DELETE ON records BEGIN "
+    "DELETE FROM records_fts WHERE rowid = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS records_fts_au AFTER UPDATE OF notes ON records BEGIN "
+    "UPDATE records_fts SET notes = new.notes WHERE rowid = old.id; END",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for stmt in FTS_DDL:
+        op.execute(stmt)
+    op.execute("INSERT INTO records_fts(rowid, notes) SELECT id, notes FROM records")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute("DROP TRIGGER IF EXISTS records_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS records_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS records_fts_ai")
+    op.execute("DROP TABLE IF EXISTS records_fts")
@@ -0,0 +1,99 @@
+# alembic/scripts.py.mako
+
+"""compress record notes
+
+Revision ID: f4a8c2d6e019
+Revises: e93c4f7a2b81
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a8c2d6e019'
+down_revision: Union[str, Sequence[str], None] = 'e93c4f7a2b81'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Só muda o tipo da coluna; as linhas existentes continuam legíveis (TEXT legado) e são
+# reescritas em lotes por scripts/compress_record_notes.py, sem travar a tabela.
+
+def _fts_triggers(expr: str) -> list[str]:
+    return [
+        "CREATE TRIGGER IF NOT EXISTS records_fts_ai AFTER INSERT ON records BEGIN "
+        f"INSERT INTO records_fts(rowid, notes) VALUES (new.id, {expr.format('new')}); END",
+        "CREATE TRIGGER IF NOT EXISTS records_fts_ad AFTER DELETE ON records BEGIN "
+        "DELETE FROM records_fts WHERE rowid = old.id; END",
+        "CREATE TRIGGER IF NOT EXISTS records_fts_au AFTER UPDATE OF notes ON records BEGIN "
+        f"UPDATE records_fts SET notes = {expr.format('new')} WHERE rowid = old.id; END",
+    ]
+
+
+def _drop_fts_triggers() -> None:
+    for name in ("records_fts_ai", "records_fts_ad", "records_fts_au"):
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        # prefixa o marcador de formato RAW (0x00) no conteúdo existente
+        op.execute(
+            "ALTER TABLE records ALTER COLUMN notes TYPE bytea "
+            "USING decode('00', 'hex') || convert_to(notes, 'UTF8')"
+        )
+        return
+
+    if bind.dialect.name == "sqlite":
+        # recriar a tabela (batch) descarta os triggers da busca; recria usando notes_text()
+        _drop_fts_triggers()
+        with op.batch_alter_table('records', schema=None) as batch_op:
+            batch_op.alter_column('notes', existing_type=sa.Text(), type_=sa.LargeBinary(), existing_nullable=False)
+        for stmt in _fts_triggers("notes_text({}.notes)"):
+            op.execute(stmt)
+        return
+
+    with op.batch_alter_table('records', schema=None) as batch_op:
+        batch_op.alter_column('notes', existing_type=sa.Text(), type_=sa.LargeBinary(), existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        from core.compression import register_sqlite_functions
+
+        register_sqlite_functions(bind.connection.driver_connection)
+        _drop_fts_triggers()
+        op.execute("UPDATE records SET notes = notes_text(notes) WHERE typeof(notes) = 'blob'")
+        with op.batch_alter_table('records', schema=None) as batch_op:
+            batch_op.alter_column('notes', existing_type=sa.LargeBinary(), type_=sa.Text(), existing_nullable=False)
+        for stmt in _fts_triggers("{}.notes"):
+            op.execute(stmt)
+        return
+
+    # sem notes_text() no banco: descomprime em Python, em lotes, numa coluna nova
+    _decode_in_batches(bind)
+
+
+def _decode_in_batches(bind, batch_size: int = 1000) -> None:
+    from core.compression import decode_notes
+
+    op.add_column('records', sa.Column('notes_plain', sa.Text(), nullable=True))
+    select_batch = sa.text("SELECT id, notes FROM records WHERE id > :last_id ORDER BY id LIMIT :limit")
+    update_one = sa.text("UPDATE records SET notes_plain = :notes WHERE id = :id")
+    last_id = 0
+    while True:
+        rows = bind.execute(select_batch, {"last_id": last_id, "limit": batch_size}).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        bind.execute(update_one, [{"id": r.id, "notes": decode_notes(r.notes)} for r in rows])
+    with op.batch_alter_table('records', schema=None) as batch_op:
+        batch_op.drop_column('notes')
+        batch_op.alter_column('notes_plain', new_column_name='notes', existing_type=sa.Text(), nullable=False)
@@ -1,22 +0,0 @@
-# auth/auth_bearer.py
-
-from fastapi import Request, HTTPException
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from auth.auth_handler import decode_jwt
-
-
-class JWTBearer(HTTPBearer):
-    def __init__(self, auto_error: bool = True):
-        super(JWTBearer, self).__init__(auto_error=auto_error)
-
-    async def __call__(self, request: Request):
-        credentials: HTTPAuthorizationCredentials = await super(JWTBearer, self).__call__(request)
-        if credentials:
-            if not credentials.scheme == "Bearer":
-                raise HTTPException(status_code=403, detail="Invalid authentication scheme.")
-            payload = decode_jwt(credentials.credentials)
-            if payload is None:
-                raise HTTPException(status_code=403, detail="Invalid token or expired token.")
-            return payload
-        else:
-            raise HTTPException(status_code=403, detail="Invalid authorization code.")
@@ -1,72 +1,148 @@
 # auth/auth_utils.py
 
-from typing import Optional
+from dataclasses import dataclass
+from typing import Optional, Union
 
-from fastapi import Depends, HTTPException, Security, status
-from fastapi.security import OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import Depends, HTTPException, Request, Security, status
+from fastapi.security import OAuth2PasswordBearer, HTTPBearer
 from sqlalchemy.orm import Session
 
 from database import get_db
 from models.user import User
 from core.config import settings
 from .jwt_handler import verify_access_token
+from .user_cache import cache_user, get_cached_user
+from .revocation import current_token_version
 
-# Swagger: fluxo OAuth2 Password (form) — permite "Authorize" com username/password
-oauth2_scheme = OAuth2PasswordBearer(
-    tokenUrl=f"{settings.API_V1_PREFIX}/auth/token",
-    auto_error=False,  # deixamos False para podermos cair no HTTPBearer se não vier token por aqui
-)
 
-# Swagger: esquema HTTP Bearer — permite "Authorize" colando apenas o token (Value)
-bearer_scheme = HTTPBearer(auto_error=False)
+class _OAuth2Doc(OAuth2PasswordBearer):
+    """Swagger: fluxo OAuth2 Password (form) — "Authorize" com username/password. Só documenta."""
 
+    async def __call__(self, request: Request) -> None:
+        return None
 
-def _resolve_token(
-    oauth2_token: Optional[str] = Depends(oauth2_scheme),
-    bearer: Optional[HTTPAuthorizationCredentials] = Security(bearer_scheme),
-) -> str:
-    """
-    Aceita token via:
-      - OAuth2PasswordBearer (após login no cadeado com username/password)
-      - HTTPBearer (colando o JWT no cadeado)
-    Dá preferência ao Bearer explícito; se não houver, usa o OAuth2.
-    """
-    if bearer and bearer.scheme.lower() == "bearer" and bearer.credentials:
-        return bearer.credentials
-    if oauth2_token:
-        return oauth2_token
 
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Credenciais ausentes.",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+class _BearerDoc(HTTPBearer):
+    """Swagger: esquema HTTP Bearer — "Authorize" colando apenas o token (Value). Só documenta."""
+
+    async def __call__(self, request: Request) -> None:
+        return None
+
+
+# Os dois esquemas aparecem no OpenAPI, mas o header é lido uma única vez em _resolve_token
+oauth2_scheme = _OAuth2Doc(
+    tokenUrl=f"{settings.API_V1_PREFIX}/auth/token",
+    scheme_name="OAuth2PasswordBearer",
+    auto_error=False,
+)
+bearer_scheme = _BearerDoc(scheme_name="HTTPBearer", auto_error=False)
 
 
-def get_current_user(token: str = Depends(_resolve_token), db: Session = Depends(get_db)) -> User:
-    credentials_exc = HTTPException(
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Token inválido ou expirado",
+        detail=detail,
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    payload = verify_access_token(token)
-    if payload is None:
-        raise credentials_exc
 
+async def _resolve_token(
+    request: Request,
+    _oauth2: None = Security(oauth2_scheme),
+    _bearer: None = Security(bearer_scheme),
+) -> str:
+    """
+    Token do header "Authorization: Bearer <jwt>" (os dois cadeados do Swagger enviam assim).
+    Async de propósito: só lê o header, sem passar pelo threadpool.
+    """
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and credentials.strip():
+        return credentials.strip()
+    raise _unauthorized("Credenciais ausentes.")
+
+
+def _token_payload(request: Request, token: str) -> dict:
+    """Payload verificado, guardado em request.state para as demais dependências do request."""
+    payload = getattr(request.state, "token_payload", None)
+    if payload is None:
+        payload = verify_access_token(token)
+        if payload is None:
+            raise _unauthorized("Token inválido ou expirado")
+        request.state.token_payload = payload
+    return payload
+
+
+def get_current_user(
+    request: Request,
+    token: str = Depends(_resolve_token),
+    db: Session = Depends(get_db),
+) -> User:
+    """Usuário autenticado (entidade do banco, na sessão do request). Fica em request.state.user."""
+    user = getattr(request.state, "user", None)
+    if user is not None:
+        return user
+
+    payload = _token_payload(request, token)
     email = payload.get("sub")
     if not email:
-        raise credentials_exc
+        raise _unauthorized("Token inválido ou expirado")
+
+    iat = payload.get("iat")
+    user = get_cached_user(db, email, iat)
+    if user is None:
+        user = db.query(User).filter(User.email == email).first()
+        if not user:
+            raise _unauthorized("Token inválido ou expirado")
+        cache_user(email, iat, user)
+
+    if payload.get("ver", 0) < (user.token_version or 0):
+        raise _unauthorized("Token inválido ou expirado")
+    request.state.user = user
+    return user
 
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        raise credentials_exc
 
-    return user
+@dataclass(frozen=True)
+class Principal:
+    """Identidade extraída das claims assinadas do token (id/e-mail/papel), sem ir ao banco."""
+    id: int
+    email: str
+    role: str
+
+
+def get_principal(
+    request: Request,
+    token: str = Depends(_resolve_token),
+    db: Session = Depends(get_db),
+) -> Union[Principal, User]:
+    """
+    Quem está chamando, para checagens de papel e de posse. Em AUTH_MODE=claims confia em
+    uid/role do token e só confere a versão dos tokens do usuário (cache com TTL = janela
+    de revogação). Tokens sem uid/role (antigos) e AUTH_MODE=db caem no get_current_user.
+    O resultado fica em request.state.principal: dependências aninhadas não repetem o trabalho.
+    """
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal
+
+    if settings.AUTH_MODE != "claims":
+        principal = get_current_user(request, token, db)
+    else:
+        payload = _token_payload(request, token)
+        uid, role, email = payload.get("uid"), payload.get("role"), payload.get("sub")
+        if not isinstance(uid, int) or not role or not email:
+            principal = get_current_user(request, token, db)
+        else:
+            version = current_token_version(db, uid)
+            if version is None or payload.get("ver", 0) < version:
+                raise _unauthorized("Token revogado; faça login novamente.")
+            principal = Principal(id=uid, email=email, role=role)
+
+    request.state.principal = principal
+    return principal
 
 
 def require_role(required_roles: list[str]):
-    def role_checker(current_user: User = Depends(get_current_user)):
+    async def role_checker(current_user: Union[Principal, User] = Depends(get_principal)):
         if current_user.role not in required_roles:
             raise HTTPException(status_code=403, detail="Você não tem permissão para acessar este recurso.")
         return current_user
@@ -1,11 +1,18 @@
 # auth/jwt_handler.py
 
+import hashlib
 from datetime import datetime, timedelta
+from time import time
 from typing import Optional, Dict, Any
 
 from jose import JWTError, jwt
+from core.cache import TTLCache
 from core.config import settings
 
+# sha256(token) -> payload já verificado, até o "exp" do token. Só tokens válidos entram:
+# lixo enviado por um atacante não ocupa espaço.
+token_cache = TTLCache(maxsize=settings.JWT_CACHE_MAX_ENTRIES, ttl=settings.JWT_CACHE_MAX_TTL_SECONDS)
+
 
 def create_access_token(
     sub: str,
@@ -34,9 +41,9 @@ def create_access_token(
     return token
 
 
-def verify_access_token(token: str) -> Optional[Dict[str, Any]]:
+def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
     """
-    Decodifica e valida o JWT. Retorna o payload se válido; senão, None.
+    Decodifica e valida o JWT (assinatura + exp), sem cache. Retorna o payload se válido; senão, None.
     """
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -45,3 +52,22 @@ def verify_access_token(token: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def verify_access_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Como decode_access_token, mas reaproveita a verificação do mesmo token (um painel manda
+    centenas de requests com ele). Retorna uma cópia: quem chama pode alterar à vontade.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is None:
+        payload = decode_access_token(token)
+        if payload is None:
+            return None
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            ttl = min(exp - time(), settings.JWT_CACHE_MAX_TTL_SECONDS)
+            if ttl > 0:
+                token_cache.set(key, payload, ttl=ttl)
+    return dict(payload)
+
+
@@ -0,0 +1,147 @@
+# auth/passwords.py
+"""
+Hash/verificação de senha (bcrypt) fora do threadpool dos requests.
+
+bcrypt custa centenas de ms de CPU; rodando nos endpoints sync, uma rajada de logins
+ocupa as threads do anyio e o resto da API fica na fila. Aqui o trabalho vai para um
+ProcessPoolExecutor próprio (fora do GIL), com limite de pedidos pendentes: acima dele
+o login recebe 503 na hora em vez de enfileirar sem fim. PASSWORD_POOL_WORKERS=0 volta
+a executar em thread (dev/testes).
+"""
+
+import asyncio
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from threading import Lock
+from time import monotonic, time
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+
+
+class PasswordPoolBusy(Exception):
+    """Pedidos pendentes acima de PASSWORD_POOL_MAX_PENDING."""
+
+
+# ---------------------------
+# Trabalho executado no processo filho
+# ---------------------------
+
+# O segundo valor é o instante (time()) em que o worker começou o trabalho: o pool
+# calcula a espera na fila como início - envio.
+
+def _verify(plain: str, hashed: str) -> tuple[bool, float]:
+    start = time()
+    try:
+        ok = settings.pwd_context.verify(plain, hashed)
+    except Exception:
+        ok = False
+    return ok, start
+
+
+def _hash(plain: str) -> tuple[str, float]:
+    start = time()
+    return settings.pwd_context.hash(plain), start
+
+
+# ---------------------------
+# Pool + métricas
+# ---------------------------
+
+class _PasswordPool:
+    def __init__(self) -> None:
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = Lock()
+        self.pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        # (espera na fila, tempo total) dos últimos pedidos, em segundos
+        self._samples: deque = deque(maxlen=1000)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: fork de um processo com threads (anyio, pool do SQLAlchemy) não é seguro
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def submit(self, fn, *args, bounded: bool = True) -> Future:
+        with self._lock:
+            if bounded and self.pending >= settings.PASSWORD_POOL_MAX_PENDING:
+                self.rejected += 1
+                raise PasswordPoolBusy()
+            self.pending += 1
+            self.submitted += 1
+            executor = self._get_executor()
+
+        submitted_wall, submitted_mono = time(), monotonic()
+        future = executor.submit(fn, *args)
+
+        def _done(f: Future) -> None:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+                if not f.cancelled() and f.exception() is None:
+                    started_wall = f.result()[1]
+                    self._samples.append((max(0.0, started_wall - submitted_wall), monotonic() - submitted_mono))
+
+        future.add_done_callback(_done)
+        return future
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            samples = list(self._samples)
+            base = {
+                "workers": settings.PASSWORD_POOL_WORKERS,
+                "max_pending": settings.PASSWORD_POOL_MAX_PENDING,
+                "pending": self.pending,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+        waits = sorted(s[0] for s in samples)
+        totals = sorted(s[1] for s in samples)
+
+        def pct(values: list, p: float) -> float:
+            return round(values[min(len(values) - 1, int(p * len(values)))] * 1000, 1) if values else 0.0
+
+        base.update({
+            "queue_wait_ms": {"p50": pct(waits, 0.5), "p95": pct(waits, 0.95), "max": pct(waits, 1.0)},
+            "total_ms": {"p50": pct(totals, 0.5), "p95": pct(totals, 0.95), "max": pct(totals, 1.0)},
+        })
+        return base
+
+
+password_pool = _PasswordPool()
+
+
+# ---------------------------
+# API
+# ---------------------------
+
+async def verify_password(plain: str, hashed: str) -> bool:
+    """Para endpoints async: não ocupa thread do anyio enquanto o bcrypt roda."""
+    if settings.PASSWORD_POOL_WORKERS <= 0:
+        return (await run_in_threadpool(_verify, plain, hashed))[0]
+    ok, _ = await asyncio.wrap_future(password_pool.submit(_verify, plain, hashed))
+    return ok
+
+
+def hash_password(plain: str) -> str:
+    """Para endpoints sync (cadastro/troca de senha): CPU no pool, thread só aguarda."""
+    if settings.PASSWORD_POOL_WORKERS <= 0:
+        return _hash(plain)[0]
+    # operação administrativa e rara: não é recusada pelo limite de pendentes
+    return password_pool.submit(_hash, plain, bounded=False).result()[0]
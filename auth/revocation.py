@@ -0,0 +1,38 @@
+# auth/revocation.py
+
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from core.cache import TTLCache
+from core.config import settings
+from models.user import User
+
+_DELETED = -1
+
+# uid -> users.token_version. Com TTL = janela de revogação: no pior caso, outro processo
+# percebe o rebaixamento/remoção depois de AUTH_REVOCATION_WINDOW_SECONDS.
+token_versions = TTLCache(
+    maxsize=settings.AUTH_TOKEN_VERSION_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_REVOCATION_WINDOW_SECONDS,
+)
+
+
+def current_token_version(db: Session, user_id: int) -> Optional[int]:
+    """Versão vigente dos tokens do usuário; None se ele não existe mais."""
+    version = token_versions.get(user_id)
+    if version is None:
+        row = db.query(User.token_version).filter(User.id == user_id).first()
+        version = row[0] if row else _DELETED
+        token_versions.set(user_id, version)
+    return None if version == _DELETED else version
+
+
+def revoke_tokens(user: User) -> None:
+    """Invalida os tokens já emitidos para `user` (vale após o commit; chame forget_user depois)."""
+    user.token_version = (user.token_version or 0) + 1
+
+
+def forget_user(user_id: int) -> None:
+    """Descarta a versão em cache deste processo; chamar após o commit."""
+    token_versions.pop(user_id)
@@ -0,0 +1,118 @@
+# auth/sessions.py
+"""
+Sessões de refresh token.
+
+O token é aleatório (256 bits) e só o seu HMAC-SHA256 (chave SECRET_KEY) vai para o banco:
+renovar custa um lookup por índice único + um HMAC, sem bcrypt. Cada uso troca o hash na
+mesma linha (compare-and-set), então o token anterior deixa de valer na hora e duas
+renovações simultâneas com o mesmo token não geram duas sessões.
+"""
+
+import hashlib
+import hmac
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models.auth_session import AuthSession
+from models.user import User
+from auth.revocation import revoke_tokens
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _new_token() -> tuple[str, str]:
+    token = secrets.token_urlsafe(32)
+    return token, hash_token(token)
+
+
+def hash_token(token: str) -> str:
+    return hmac.new(settings.SECRET_KEY.encode(), token.encode(), hashlib.sha256).hexdigest()
+
+
+def create_session(db: Session, user_id: int) -> str:
+    """Abre uma sessão (login) e retorna o refresh token em claro; o chamador faz o commit."""
+    token, token_hash = _new_token()
+    db.add(AuthSession(
+        user_id=user_id,
+        token_hash=token_hash,
+        expires_at=_now() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    return token
+
+
+def rotate_session(db: Session, token: str) -> Optional[tuple[User, str]]:
+    """
+    Valida o refresh token e o substitui por um novo (commit incluso).
+    Retorna (usuário, novo token) ou None se inválido, expirado ou já usado.
+    """
+    now = _now()
+    row = db.execute(
+        select(AuthSession.id, User)
+        .join(User, User.id == AuthSession.user_id)
+        .where(AuthSession.token_hash == hash_token(token), AuthSession.expires_at > now)
+    ).first()
+    if row is None:
+        return None
+    session_id, user = row
+
+    new_token, new_hash = _new_token()
+    result = db.execute(
+        update(AuthSession)
+        .where(AuthSession.id == session_id, AuthSession.token_hash == hash_token(token))
+        .values(token_hash=new_hash, last_used_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:  # outra renovação usou o mesmo token antes
+        db.rollback()
+        return None
+    db.commit()
+    return user, new_token
+
+
+def revoke_session(db: Session, token: str) -> bool:
+    """Logout: remove a sessão deste refresh token (commit incluso)."""
+    result = db.execute(
+        delete(AuthSession)
+        .where(AuthSession.token_hash == hash_token(token))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def revoke_all_sessions(db: Session, user: User) -> int:
+    """
+    Remove todas as sessões do usuário e invalida os access tokens já emitidos
+    (token_version). Vale após o commit, feito pelo chamador; depois, forget_user.
+    """
+    result = db.execute(
+        delete(AuthSession)
+        .where(AuthSession.user_id == user.id)
+        .execution_options(synchronize_session=False)
+    )
+    revoke_tokens(user)
+    return result.rowcount
+
+
+def sweep_expired_sessions(db: Session, batch_size: int = settings.SESSION_SWEEP_BATCH_SIZE) -> int:
+    """Apaga sessões expiradas em lotes (transações curtas, sem travar o banco)."""
+    cutoff = _now()
+    total = 0
+    while True:
+        ids = select(AuthSession.id).where(AuthSession.expires_at <= cutoff).limit(batch_size)
+        result = db.execute(
+            delete(AuthSession)
+            .where(AuthSession.id.in_(ids.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            return total
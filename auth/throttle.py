@@ -0,0 +1,210 @@
+# auth/throttle.py
+"""
+Limite de tentativas de login por IP e por e-mail (janela deslizante).
+
+Roda antes de qualquer consulta ao banco ou bcrypt: numa rajada de credential stuffing,
+o excedente custa um lookup em memória. A janela é o contador deslizante aproximado
+(bucket atual + fração do anterior), que ocupa dois inteiros por chave.
+
+Só falhas contam: a tentativa reserva uma unidade antes da verificação (para que
+tentativas simultâneas também sejam barradas) e o login bem-sucedido a devolve.
+
+Backends:
+  - memory: dicionário do processo (padrão; cada worker do uvicorn tem o seu);
+  - sqlite: arquivo local compartilhado pelos workers da mesma máquina.
+"""
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from itertools import islice
+from math import ceil
+from threading import Lock
+from time import time
+from typing import Optional, Protocol
+
+from core.config import settings
+
+
+class ThrottleBackend(Protocol):
+    def acquire(self, key: str, limit: int, window: int, now: float) -> Optional[int]:
+        """Reserva uma tentativa; retorna o bucket usado ou None se a chave passou do limite."""
+
+    def release(self, key: str, bucket: int) -> None:
+        """Devolve a tentativa reservada em `bucket` (login bem-sucedido)."""
+
+
+def _estimate(prev: int, curr: int, bucket: int, window: int, now: float) -> float:
+    elapsed = now - bucket * window
+    return prev * (1 - elapsed / window) + curr
+
+
+class MemoryBackend:
+    """
+    key -> [bucket, anterior, atual], em ordem de uso (LRU). No teto de chaves, saem primeiro
+    as sem atividade recente e, se ainda faltar espaço, as usadas há mais tempo.
+    """
+
+    PRUNE_HEADROOM = 0.1  # fração do teto liberada por limpeza (não roda a cada chave nova)
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._data: OrderedDict[str, list[int]] = OrderedDict()
+        self._lock = Lock()
+
+    def acquire(self, key: str, limit: int, window: int, now: float) -> Optional[int]:
+        bucket = int(now // window)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                if len(self._data) >= self.max_keys:
+                    self._prune(bucket)
+                entry = self._data[key] = [bucket, 0, 0]
+            else:
+                self._data.move_to_end(key)
+            if entry[0] != bucket:
+                # avança a janela: o atual vira anterior (ou zera, se ficou mais de um bucket parado)
+                entry[1] = entry[2] if entry[0] == bucket - 1 else 0
+                entry[2] = 0
+                entry[0] = bucket
+            if _estimate(entry[1], entry[2], bucket, window, now) >= limit:
+                return None
+            entry[2] += 1
+            return bucket
+
+    def release(self, key: str, bucket: int) -> None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return
+            if entry[0] == bucket:
+                entry[2] = max(0, entry[2] - 1)
+            elif entry[0] == bucket + 1:
+                entry[1] = max(0, entry[1] - 1)
+
+    def _prune(self, bucket: int) -> None:
+        stale = [k for k, e in self._data.items() if e[0] < bucket - 1 or (e[1] == 0 and e[2] == 0)]
+        for k in stale:
+            del self._data[k]
+        # ainda cheio (rajada de chaves novas): esquece as usadas há mais tempo, não todas
+        target = int(self.max_keys * (1 - self.PRUNE_HEADROOM))
+        excess = len(self._data) - min(target, self.max_keys - 1)
+        if excess > 0:
+            for k in list(islice(self._data, excess)):
+                del self._data[k]
+
+
+class SQLiteBackend:
+    """Mesma janela num SQLite local (WAL), para workers que compartilham a máquina."""
+
+    PRUNE_EVERY = 1000  # aquisições entre limpezas de buckets antigos
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        self._calls = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS login_throttle ("
+                " key TEXT NOT NULL, bucket INTEGER NOT NULL, count INTEGER NOT NULL,"
+                " PRIMARY KEY (key, bucket)) WITHOUT ROWID"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def acquire(self, key: str, limit: int, window: int, now: float) -> Optional[int]:
+        bucket = int(now // window)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            counts = dict(conn.execute(
+                "SELECT bucket, count FROM login_throttle WHERE key = ? AND bucket IN (?, ?)",
+                (key, bucket - 1, bucket),
+            ).fetchall())
+            if _estimate(counts.get(bucket - 1, 0), counts.get(bucket, 0), bucket, window, now) >= limit:
+                return None
+            conn.execute(
+                "INSERT INTO login_throttle (key, bucket, count) VALUES (?, ?, 1) "
+                "ON CONFLICT (key, bucket) DO UPDATE SET count = count + 1",
+                (key, bucket),
+            )
+            self._calls += 1
+            if self._calls % self.PRUNE_EVERY == 0:
+                conn.execute("DELETE FROM login_throttle WHERE bucket < ?", (bucket - 1,))
+            return bucket
+        finally:
+            conn.execute("COMMIT")
+
+    def release(self, key: str, bucket: int) -> None:
+        self._connect().execute(
+            "UPDATE login_throttle SET count = max(count - 1, 0) WHERE key = ? AND bucket = ?",
+            (key, bucket),
+        )
+
+
+class LoginThrottle:
+    def __init__(self, backend: ThrottleBackend) -> None:
+        self.backend = backend
+        self._lock = Lock()
+        self.allowed = 0
+        self.rejected_ip = 0
+        self.rejected_email = 0
+
+    @property
+    def retry_after(self) -> int:
+        return ceil(settings.LOGIN_THROTTLE_WINDOW_SECONDS)
+
+    def acquire(self, ip: str, email: str) -> Optional[list[tuple[str, int]]]:
+        """
+        Reserva uma tentativa para o IP e para o e-mail. Retorna as reservas (para release)
+        ou None se alguma das chaves está acima do limite (nada fica reservado).
+        """
+        now = time()
+        window = settings.LOGIN_THROTTLE_WINDOW_SECONDS
+        held: list[tuple[str, int]] = []
+        for key, limit, counter in (
+            (f"ip:{ip}", settings.LOGIN_THROTTLE_IP_LIMIT, "rejected_ip"),
+            (f"email:{email}", settings.LOGIN_THROTTLE_EMAIL_LIMIT, "rejected_email"),
+        ):
+            bucket = self.backend.acquire(key, limit, window, now)
+            if bucket is None:
+                self.release(held)
+                with self._lock:
+                    setattr(self, counter, getattr(self, counter) + 1)
+                return None
+            held.append((key, bucket))
+        with self._lock:
+            self.allowed += 1
+        return held
+
+    def release(self, held: list[tuple[str, int]]) -> None:
+        for key, bucket in held:
+            self.backend.release(key, bucket)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": settings.LOGIN_THROTTLE_BACKEND,
+                "window_seconds": settings.LOGIN_THROTTLE_WINDOW_SECONDS,
+                "ip_limit": settings.LOGIN_THROTTLE_IP_LIMIT,
+                "email_limit": settings.LOGIN_THROTTLE_EMAIL_LIMIT,
+                "allowed": self.allowed,
+                "rejected_ip": self.rejected_ip,
+                "rejected_email": self.rejected_email,
+            }
+
+
+def _make_backend() -> ThrottleBackend:
+    if settings.LOGIN_THROTTLE_BACKEND == "sqlite":
+        return SQLiteBackend(str(settings.LOGIN_THROTTLE_SQLITE_PATH))
+    return MemoryBackend(settings.LOGIN_THROTTLE_MAX_KEYS)
+
+
+login_throttle = LoginThrottle(_make_backend())
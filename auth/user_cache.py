@@ -0,0 +1,40 @@
+# auth/user_cache.py
+
+from typing import Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from core.cache import TTLCache
+from core.config import settings
+from models.user import User
+
+# (sub, iat) -> cópia destacada do User (nunca a instância de uma sessão)
+user_cache = TTLCache(maxsize=settings.USER_CACHE_MAX_ENTRIES, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+
+def _detached_copy(user: User) -> User:
+    copy = User(**{attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs})
+    make_transient_to_detached(copy)
+    return copy
+
+
+def cache_user(sub: str, iat: Optional[int], user: User) -> None:
+    user_cache.set((sub, iat), _detached_copy(user))
+
+
+def get_cached_user(db: Session, sub: str, iat: Optional[int]) -> Optional[User]:
+    """
+    Usuário do cache já anexado à sessão do request, sem SQL (merge com load=False):
+    o endpoint pode usá-lo como se viesse de db.query.
+    """
+    cached = user_cache.get((sub, iat))
+    if cached is None:
+        return None
+    return db.merge(cached, load=False)
+
+
+def invalidate_user(*emails: Optional[str]) -> int:
+    """Descarta as entradas desses e-mails (todas as emissões de token). Chamar após o commit."""
+    targets = {e for e in emails if e}
+    return user_cache.pop_matching(lambda key: key[0] in targets)
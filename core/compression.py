@@ -0,0 +1,74 @@
+# core/compression.py
+
+import zlib
+from typing import Optional, Union
+
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+from core.config import settings
+
+# Primeiro byte do valor armazenado indica o formato
+FORMAT_RAW = 0x00    # UTF-8 sem compressão (textos curtos)
+FORMAT_ZLIB = 0x01   # zlib (deflate)
+
+
+def encode_notes(text: str, min_bytes: Optional[int] = None) -> bytes:
+    """Texto -> bytes com marcador de formato; comprime a partir de `min_bytes`."""
+    threshold = settings.RECORD_NOTES_COMPRESS_MIN_BYTES if min_bytes is None else min_bytes
+    raw = text.encode("utf-8")
+    if len(raw) >= threshold:
+        packed = zlib.compress(raw, settings.RECORD_NOTES_COMPRESS_LEVEL)
+        if len(packed) + 1 < len(raw):  # só vale se realmente encolher
+            return bytes([FORMAT_ZLIB]) + packed
+    return bytes([FORMAT_RAW]) + raw
+
+
+def is_encoded(value) -> bool:
+    """True se o valor cru do banco já está no formato com marcador."""
+    if not isinstance(value, (bytes, memoryview)):
+        return False
+    data = bytes(value[:1])
+    return data in (bytes([FORMAT_RAW]), bytes([FORMAT_ZLIB]))
+
+
+def decode_notes(value: Union[str, bytes, memoryview, None]) -> Optional[str]:
+    """
+    Inverso de encode_notes. Linhas legadas ainda não migradas passam direto: TEXT (str) ou
+    UTF-8 sem marcador (o ALTER da coluna no SQLite só faz CAST para BLOB). Texto clínico
+    nunca começa com U+0000/U+0001, então o primeiro byte distingue os casos.
+    """
+    if value is None or isinstance(value, str):
+        return value
+    data = bytes(value)
+    if not data:
+        return ""
+    fmt, body = data[0], data[1:]
+    if fmt == FORMAT_ZLIB:
+        return zlib.decompress(body).decode("utf-8")
+    if fmt == FORMAT_RAW:
+        return body.decode("utf-8")
+    return data.decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    """
+    Texto comprimido de forma transparente (zlib acima de um limiar), gravado como BLOB.
+    Do lado Python é sempre `str`.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return encode_notes(value)
+
+    def result_processor(self, dialect, coltype):
+        # ignora o processor do LargeBinary: no SQLite, linhas legadas chegam como str
+        return decode_notes
+
+
+def register_sqlite_functions(dbapi_connection) -> None:
+    """notes_text(blob) -> texto puro; usada pelos triggers da busca FTS5 dos prontuários."""
+    dbapi_connection.create_function("notes_text", 1, decode_notes, deterministic=True)
@@ -3,6 +3,7 @@
 from pathlib import Path
 import os
 import secrets
+from typing import Literal, Optional
 from dotenv import load_dotenv
 from passlib.context import CryptContext
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -28,18 +29,124 @@ class Settings(BaseSettings):
     DATABASE_URL: str = os.getenv("DATABASE_URL", f"sqlite:///{(BASE_DIR / 'db.sqlite3')}")
     SQLALCHEMY_ECHO: bool = False
     SQLALCHEMY_POOL_PRE_PING: bool = True
+    # Pool de conexões (por engine e por processo; vale para o primário, o async e as réplicas).
+    # Endpoints sync rodam no threadpool do anyio (40 threads): com POOL_SIZE + MAX_OVERFLOW menor
+    # que isso, requests esperam conexão (ver /metrics/db) e estouram após POOL_TIMEOUT.
+    SQLALCHEMY_POOL_SIZE: int = 5
+    SQLALCHEMY_MAX_OVERFLOW: int = 10
+    SQLALCHEMY_POOL_TIMEOUT: float = 30.0        # segundos esperando uma conexão livre
+    SQLALCHEMY_POOL_RECYCLE: int = -1            # segundos; -1 não recicla (Postgres atrás de LB: ~1800)
+    # /metrics/db: checkout acima deste tempo entra na lista de sessões presas
+    SQLALCHEMY_POOL_LONG_CHECKOUT_SECONDS: float = 5.0
+    SQLALCHEMY_POOL_MAX_OUTLIERS: int = 50
+    # Perfil SQLite aplicado a cada conexão nova (engine sync e async; o Alembic usa engine próprio)
+    SQLITE_PRAGMAS_ENABLED: bool = True
+    SQLITE_JOURNAL_MODE: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY"] = "WAL"
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"  # NORMAL é seguro com WAL
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000          # espera pelo lock de escrita em vez de "database is locked"
+    SQLITE_CACHE_SIZE_KIB: int = 65536          # cache de páginas por conexão
+    SQLITE_MMAP_SIZE_BYTES: int = 256 * 1024 ** 2
+    SQLITE_TEMP_STORE: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+    SQLITE_FOREIGN_KEYS: bool = True            # SQLite não aplica FKs/ON DELETE sem isso
+    # Engine async (get_async_db). Vazio: deriva de DATABASE_URL (sqlite+aiosqlite / postgresql+asyncpg)
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Réplicas de leitura (JSON: '["postgresql://...", ...]'), usadas em round-robin por get_read_db.
+    # Vazio: todas as leituras vão ao primário. O driver async de cada réplica é derivado da URL.
+    READ_REPLICA_URLS: list[str] = []
+    # Read-your-writes: após uma escrita bem-sucedida, as leituras do mesmo usuário ficam no
+    # primário por este tempo (cobre o atraso de replicação). Estado por processo.
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    READ_YOUR_WRITES_MAX_USERS: int = 10000
+
+    # Prontuários: notes acima do limiar são gravadas comprimidas (zlib)
+    RECORD_NOTES_COMPRESS_MIN_BYTES: int = 512
+    RECORD_NOTES_COMPRESS_LEVEL: int = 6
+    # Histórico de emendas: snapshot completo a cada N versões (limita os deltas por leitura)
+    RECORD_VERSION_SNAPSHOT_INTERVAL: int = 16
 
     # === SECURITY (JWT) ===
     SECRET_KEY: str = os.getenv("SECRET_KEY", secrets.token_urlsafe(32))
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
     pwd_context: CryptContext = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    # claims: require_role/ownership confiam em uid/role do token (sem SELECT em users);
+    # db: carrega o usuário a cada request. Em ambos, token com "ver" antigo é recusado.
+    AUTH_MODE: Literal["claims", "db"] = "claims"
+    # JWT já verificado, por sha256 do token, até o exp (teto em segundos abaixo)
+    JWT_CACHE_MAX_ENTRIES: int = 4096
+    JWT_CACHE_MAX_TTL_SECONDS: int = 3600
+    # Janela máxima para outro processo notar papel alterado/usuário removido (modo claims)
+    AUTH_REVOCATION_WINDOW_SECONDS: int = 30
+    AUTH_TOKEN_VERSION_CACHE_MAX_ENTRIES: int = 10000
+    # bcrypt em processos separados (0 = executa em thread, como antes)
+    PASSWORD_POOL_WORKERS: int = min(4, os.cpu_count() or 1)
+    PASSWORD_POOL_MAX_PENDING: int = 64   # acima disso, login responde 503 sem enfileirar
+    # Refresh token (rotação a cada uso): renova o access token sem senha/bcrypt
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    SESSION_SWEEP_BATCH_SIZE: int = 1000  # linhas por DELETE na varredura de sessões expiradas
+    # Limite de falhas de login (janela deslizante), checado antes do banco/bcrypt.
+    # memory: por processo; sqlite: compartilhado entre workers da mesma máquina.
+    LOGIN_THROTTLE_BACKEND: Literal["memory", "sqlite"] = "memory"
+    LOGIN_THROTTLE_SQLITE_PATH: Path = BASE_DIR / "login_throttle.sqlite3"
+    LOGIN_THROTTLE_WINDOW_SECONDS: int = 300
+    LOGIN_THROTTLE_EMAIL_LIMIT: int = 10   # falhas por conta na janela
+    LOGIN_THROTTLE_IP_LIMIT: int = 100     # falhas por IP (alto: estações atrás do mesmo NAT)
+    LOGIN_THROTTLE_MAX_KEYS: int = 100000  # teto de chaves no backend em memória
+    # Usa o primeiro IP de X-Forwarded-For (só atrás de proxy confiável)
+    LOGIN_THROTTLE_TRUST_FORWARDED: bool = False
+
+    # === LISTAGENS ===
+    # Se definido, GET /appointments sem date_from/date_to/cursor se limita aos últimos N dias
+    APPOINTMENTS_LIST_DEFAULT_DAYS: int | None = None
+
+    # === FEED iCalendar (.ics) ===
+    ICS_PAST_DAYS: int = 30          # janela do feed: hoje - N dias ...
+    ICS_FUTURE_DAYS: int = 180       # ... até hoje + N dias
+    ICS_EVENT_MINUTES: int = 30      # duração padrão de cada consulta no calendário
+    ICS_FEED_TOKEN_DAYS: int = 365   # validade do token de assinatura do feed
+
+    # === LISTA DE ESPERA ===
+    # assign: agenda direto o melhor candidato; offer: reserva a vaga por WAITLIST_OFFER_MINUTES
+    # esperando o aceite (vencida, é reoferecida; ver scripts/sweep_waitlist_offers.py)
+    WAITLIST_AUTOFILL_MODE: Literal["assign", "offer"] = "assign"
+    WAITLIST_OFFER_MINUTES: int = 120
+
+    # === EXPORTAÇÃO LGPD ===
+    EXPORT_DIR: Path = BASE_DIR / "exports"   # arquivos .zip gerados (fora do controle de versão)
+    EXPORT_MAX_PATIENTS: int = 500            # pacientes por job
+    EXPORT_BATCH_SIZE: int = 500              # linhas por round-trip (yield_per)
+    # retenção: o .zip é apagado N horas depois de pronto e o job em RUNNING há mais de N
+    # minutos (worker morto) vira FAILED; ver scripts/sweep_exports.py
+    EXPORT_RETENTION_HOURS: int = 72
+    EXPORT_STALE_RUNNING_MINUTES: int = 60
+
+    # === ANEXOS DE PRONTUÁRIO ===
+    ATTACHMENTS_DIR: Path = BASE_DIR / "attachments"     # blobs por sha256 + uploads em andamento
+    ATTACHMENT_MAX_BYTES: int = 2 * 1024 ** 3             # 2 GiB por arquivo
+    ATTACHMENT_MAX_CHUNK_BYTES: int = 64 * 1024 ** 2      # maior pedaço aceito por PUT
+    ATTACHMENT_READ_CHUNK_BYTES: int = 1024 ** 2          # bloco do streaming de download
+
+    # === CACHE (em memória, por processo) ===
+    # Usuário autenticado por (sub, iat): evita o SELECT em users a cada request.
+    # Invalidação explícita só alcança o processo local; o TTL limita a defasagem nos demais.
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_ENTRIES: int = 2048
+    # Agregados de calendário: TTL curto para faixas que tocam hoje/futuro, maior para faixas passadas
+    CALENDAR_CACHE_TTL_SECONDS: int = 30
+    CALENDAR_CACHE_PAST_TTL_SECONDS: int = 300
+    CALENDAR_CACHE_MAX_ENTRIES: int = 512
+
+    # === EVENTOS (SSE) ===
+    EVENTS_BACKLOG_SIZE: int = 1000           # eventos guardados para retomada (Last-Event-ID)
+    EVENTS_SUBSCRIBER_QUEUE_SIZE: int = 256   # fila por cliente; estourou, o cliente reconecta
+    EVENTS_HEARTBEAT_SECONDS: int = 15
 
     # === CORS (opcional – ajuste conforme seu front) ===
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
     CORS_ALLOW_CREDENTIALS: bool = True
     CORS_ALLOW_METHODS: list[str] = ["*"]
     CORS_ALLOW_HEADERS: list[str] = ["*"]
+    CORS_EXPOSE_HEADERS: list[str] = ["X-Next-Cursor", "X-Total-Count"]
 
     # Configuração do Pydantic Settings
     model_config = SettingsConfigDict(
@@ -0,0 +1,108 @@
+# core/events.py
+
+import asyncio
+import secrets
+from collections import deque
+from threading import Lock
+from typing import Any, Optional
+
+from core.config import settings
+
+# Sentinela enviada ao assinante cuja fila estourou (cliente lento): ele deve reconectar
+OVERFLOW = object()
+
+
+class Subscription:
+    """Fila de um assinante, presa ao event loop que a criou."""
+
+    def __init__(self, hub: "EventHub", queue_size: int):
+        self.hub = hub
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def _put(self, item: Any) -> None:
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # descarta o que estiver pendente e avisa; o cliente retoma pelo token
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+
+    def push(self, event: tuple[int, dict]) -> None:
+        # publish() roda no threadpool (endpoints sync); entrega thread-safe no loop do assinante
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:  # loop encerrado
+            self.hub.unsubscribe(self)
+
+    async def get(self) -> Any:
+        return await self.queue.get()
+
+
+class EventHub:
+    """
+    Pub/sub em memória (por processo) com buffer circular para retomada.
+    O token de retomada é "<epoch>-<seq>"; epoch muda a cada start, então um token de
+    outro processo/instância sempre força recarga completa no cliente.
+    Com vários workers, cada um só enxerga os eventos publicados nele mesmo.
+    """
+
+    def __init__(self, backlog: int = 1000, queue_size: int = 256):
+        self.epoch = secrets.token_hex(4)
+        self.queue_size = queue_size
+        self._seq = 0
+        self._buffer: deque[tuple[int, dict]] = deque(maxlen=backlog)
+        self._subs: set[Subscription] = set()
+        self._lock = Lock()
+
+    def token(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def _parse_token(self, token: Optional[str]) -> Optional[int]:
+        epoch, _, seq = (token or "").partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def publish(self, data: dict) -> str:
+        with self._lock:
+            self._seq += 1
+            event = (self._seq, data)
+            self._buffer.append(event)
+            subs = list(self._subs)
+        for sub in subs:
+            sub.push(event)
+        return self.token(event[0])
+
+    def subscribe(self, last_token: Optional[str] = None) -> tuple[Subscription, list[tuple[int, dict]], bool]:
+        """
+        Registra um assinante (chamar dentro do event loop).
+        Retorna (assinatura, eventos perdidos desde o token, reset). reset=True quando o
+        token é inválido/antigo demais e o cliente precisa recarregar a lista inteira.
+        """
+        sub = Subscription(self, self.queue_size)
+        with self._lock:
+            self._subs.add(sub)
+            if last_token is None:
+                return sub, [], False
+            last = self._parse_token(last_token)
+            oldest = self._buffer[0][0] if self._buffer else self._seq + 1
+            if last is None or last > self._seq or last < oldest - 1:
+                return sub, [], True
+            return sub, [e for e in self._buffer if e[0] > last], False
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._subs.discard(sub)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subs)
+
+
+# Feed de mudanças de consultas (alimentado pelo appointment_router após commit)
+appointment_events = EventHub(
+    backlog=settings.EVENTS_BACKLOG_SIZE,
+    queue_size=settings.EVENTS_SUBSCRIBER_QUEUE_SIZE,
+)
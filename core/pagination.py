@@ -0,0 +1,51 @@
+# core/pagination.py
+
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+# Headers usados pelas listagens paginadas por cursor (expostos via CORS)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Tipo não suportado no cursor: {type(value)!r}")
+
+
+def encode_cursor(*values: Any) -> str:
+    """Cursor opaco (base64url de um array JSON) com os valores da última linha da página."""
+    raw = json.dumps(list(values), default=_default, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """Decodifica um cursor de `size` posições; cursor malformado vira 400."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Cursor inválido.")
+    return values
+
+
+def parse_cursor_datetime(value: Any) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Cursor inválido.")
+
+
+def keyset_after(column, id_column, value: Any, last_id: int, ascending: bool = True):
+    """Condição "depois de (value, id)" na ordem (column, id), asc ou desc."""
+    if ascending:
+        return or_(column > value, and_(column == value, id_column > last_id))
+    return or_(column < value, and_(column == value, id_column < last_id))
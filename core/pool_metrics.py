@@ -0,0 +1,176 @@
+# core/pool_metrics.py
+"""
+Métricas do pool de conexões do SQLAlchemy, por engine e por processo.
+
+- checkout/checkin (eventos do pool): conexões em uso, duração de cada checkout e os
+  checkouts longos (sessão presa além de SQLALCHEMY_POOL_LONG_CHECKOUT_SECONDS);
+- espera por conexão: não há evento antes do checkout, então os pools monitorados
+  (MonitoredQueuePool / MonitoredAsyncQueuePool) cronometram o próprio _do_get.
+
+Cada checkout é anotado com o request em curso (request_label, definido no middleware
+de main.py), para que os outliers apontem a rota que segurou a conexão.
+"""
+
+from bisect import bisect_left
+from collections import deque
+from contextvars import ContextVar
+from threading import Lock
+from time import monotonic, time
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from core.config import settings
+
+# "GET /api/v1/patients/" do request atual; o anyio copia o contexto para o threadpool
+request_label: ContextVar[str] = ContextVar("request_label", default="-")
+
+# limites superiores (ms) dos buckets; o último bucket é "acima do maior limite"
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """Contagem por bucket (ms). Não é thread-safe: o PoolMonitor serializa o acesso."""
+
+    def __init__(self, bounds: tuple = BUCKETS_MS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect_left(self.bounds, ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def snapshot(self) -> dict:
+        labels = [f"<={b}ms" for b in self.bounds] + [f">{self.bounds[-1]}ms"]
+        return {
+            "count": self.total,
+            "avg_ms": round(self.sum_ms / self.total, 3) if self.total else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class PoolMonitor:
+    def __init__(self, name: str, long_checkout_seconds: float, max_outliers: int) -> None:
+        self.name = name
+        self.long_checkout_seconds = long_checkout_seconds
+        self.pool: Optional[Pool] = None
+        self._lock = Lock()
+        self._active: dict[int, tuple[float, str]] = {}  # id(connection_record) -> (início, request)
+        self._outliers: deque = deque(maxlen=max_outliers)
+        self.wait = Histogram()
+        self.checkout = Histogram()
+        self.timeouts = 0
+
+    def attach(self, engine: Engine) -> None:
+        self.pool = engine.pool
+        if isinstance(engine.pool, _TimedGetMixin):
+            engine.pool._monitor = self
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+
+    # --- eventos do pool ---
+
+    def _on_checkout(self, _dbapi_connection, connection_record, _proxy) -> None:
+        with self._lock:
+            self._active[id(connection_record)] = (monotonic(), request_label.get())
+
+    def _on_checkin(self, _dbapi_connection, connection_record) -> None:
+        now = monotonic()
+        with self._lock:
+            entry = self._active.pop(id(connection_record), None)
+            if entry is None:
+                return
+            held = now - entry[0]
+            self.checkout.observe(held * 1000)
+            if held >= self.long_checkout_seconds:
+                self._outliers.append({"request": entry[1], "held_s": round(held, 3), "released_at": time()})
+
+    # --- chamados por _TimedGetMixin ---
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait.observe(seconds * 1000)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def stats(self) -> dict:
+        now = monotonic()
+        pool = self.pool
+        with self._lock:
+            held = sorted(
+                (
+                    {"request": label, "held_s": round(now - started, 3)}
+                    for started, label in self._active.values()
+                    if now - started >= self.long_checkout_seconds
+                ),
+                key=lambda o: -o["held_s"],
+            )
+            return {
+                "pool": type(pool).__name__ if pool is not None else None,
+                # size/overflow só existem no QueuePool (SQLite em memória usa outro pool)
+                "size": pool.size() if isinstance(pool, QueuePool) else None,
+                "checked_out": len(self._active),
+                "checked_in": pool.checkedin() if isinstance(pool, QueuePool) else None,
+                "overflow": pool.overflow() if isinstance(pool, QueuePool) else None,
+                "timeouts": self.timeouts,
+                "wait": self.wait.snapshot(),
+                "checkout_duration": self.checkout.snapshot(),
+                "long_checkouts": {
+                    "threshold_s": self.long_checkout_seconds,
+                    "held_now": held,
+                    "recent": list(self._outliers),
+                },
+            }
+
+
+class _TimedGetMixin:
+    """Cronometra a espera por uma conexão (fila do pool + abertura de conexão nova)."""
+
+    _monitor: Optional[PoolMonitor] = None
+
+    def _do_get(self):
+        monitor = self._monitor
+        if monitor is None:
+            return super()._do_get()
+        start = monotonic()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            monitor.record_timeout()  # TimeoutError do pool (ou falha ao conectar)
+            raise
+        monitor.record_wait(monotonic() - start)
+        return conn
+
+    def recreate(self):
+        # engine.dispose() troca o pool: o monitor acompanha
+        new = super().recreate()
+        new._monitor = self._monitor
+        if self._monitor is not None:
+            self._monitor.pool = new
+        return new
+
+
+class MonitoredQueuePool(_TimedGetMixin, QueuePool):
+    pass
+
+
+class MonitoredAsyncQueuePool(_TimedGetMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def new_monitor(name: str) -> PoolMonitor:
+    return PoolMonitor(
+        name,
+        long_checkout_seconds=settings.SQLALCHEMY_POOL_LONG_CHECKOUT_SECONDS,
+        max_outliers=settings.SQLALCHEMY_POOL_MAX_OUTLIERS,
+    )
@@ -1,23 +1,176 @@
 # database.py
-from sqlalchemy import create_engine
+from itertools import count
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
-from typing import Generator
+from starlette.requests import Request
+from typing import AsyncGenerator, Generator, Hashable, Optional
+from core.cache import TTLCache
 from core.config import settings
+from core.pool_metrics import MonitoredAsyncQueuePool, MonitoredQueuePool, PoolMonitor, new_monitor
+from auth.jwt_handler import verify_access_token
+
+
+def sqlite_pragmas() -> list[str]:
+    """PRAGMAs do perfil SQLite (settings.SQLITE_*), na ordem em que são aplicados."""
+    if not settings.SQLITE_PRAGMAS_ENABLED:
+        return []
+    return [
+        f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+        f"PRAGMA cache_size={-int(settings.SQLITE_CACHE_SIZE_KIB)}",  # negativo = KiB
+        f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE_BYTES)}",
+        f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}",
+        f"PRAGMA foreign_keys={'ON' if settings.SQLITE_FOREIGN_KEYS else 'OFF'}",
+    ]
+
+
+def _apply_sqlite_profile(dbapi_connection) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _sqlite_on_connect(dbapi_connection, _record):
+    from core.compression import register_sqlite_functions
+
+    # funções SQL usadas pelos triggers (ex.: notes_text na busca de prontuários)
+    register_sqlite_functions(dbapi_connection)
+    _apply_sqlite_profile(dbapi_connection)
+
+
+# métricas do pool por engine ("primary", "primary_async", "replica_0", ...), expostas em /metrics/db
+pool_monitors: dict[str, PoolMonitor] = {}
+
+
+def _pool_args(url: str, poolclass) -> dict:
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}  # SQLite em memória usa pool próprio (uma conexão), sem tamanho/overflow
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.SQLALCHEMY_POOL_SIZE,
+        "max_overflow": settings.SQLALCHEMY_MAX_OVERFLOW,
+        "pool_timeout": settings.SQLALCHEMY_POOL_TIMEOUT,
+        "pool_recycle": settings.SQLALCHEMY_POOL_RECYCLE,
+    }
 
-# Ajustes para SQLite (necessário no ambiente local)
-connect_args = {}
-if settings.DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
-
-engine = create_engine(
-    settings.DATABASE_URL,
-    future=True,
-    echo=settings.SQLALCHEMY_ECHO,
-    pool_pre_ping=settings.SQLALCHEMY_POOL_PRE_PING,
-    connect_args=connect_args,
-)
 
+def _monitor(name: str, eng: Engine) -> None:
+    pool_monitors[name] = monitor = new_monitor(name)
+    monitor.attach(eng)
+
+
+def _make_engine(url: str, name: str) -> Engine:
+    # Ajustes para SQLite (necessário no ambiente local)
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    eng = create_engine(
+        url,
+        future=True,
+        echo=settings.SQLALCHEMY_ECHO,
+        pool_pre_ping=settings.SQLALCHEMY_POOL_PRE_PING,
+        connect_args=connect_args,
+        **_pool_args(url, MonitoredQueuePool),
+    )
+    if eng.dialect.name == "sqlite":
+        event.listen(eng, "connect", _sqlite_on_connect)
+    _monitor(name, eng)
+    return eng
+
+
+engine = _make_engine(settings.DATABASE_URL, "primary")
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
+
+
+# === Engine async (endpoints de leitura quentes em async def) ===
+# Mesmo banco, driver async: aiosqlite no SQLite local, asyncpg no Postgres.
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def _async_database_url(sync_url: str) -> str:
+    url = make_url(sync_url.replace("postgres://", "postgresql://", 1))
+    return url.set(drivername=_ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)).render_as_string(
+        hide_password=False
+    )
+
+
+def _make_async_engine(url: str, name: str) -> AsyncEngine:
+    eng = create_async_engine(
+        url,
+        echo=settings.SQLALCHEMY_ECHO,
+        pool_pre_ping=settings.SQLALCHEMY_POOL_PRE_PING,
+        **_pool_args(url, MonitoredAsyncQueuePool),
+    )
+    if eng.dialect.name == "sqlite":
+        event.listen(eng.sync_engine, "connect", _sqlite_on_connect)
+    _monitor(name, eng.sync_engine)
+    return eng
+
+
+async_engine = _make_async_engine(
+    settings.ASYNC_DATABASE_URL or _async_database_url(settings.DATABASE_URL), "primary_async"
+)
+
+# expire_on_commit=False: objetos seguem legíveis após o commit sem novo I/O implícito
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+# === Réplicas de leitura (listagens e relatórios) ===
+replica_engines: list[Engine] = [
+    _make_engine(url, f"replica_{i}") for i, url in enumerate(settings.READ_REPLICA_URLS)
+]
+async_replica_engines: list[AsyncEngine] = [
+    _make_async_engine(_async_database_url(url), f"replica_{i}_async")
+    for i, url in enumerate(settings.READ_REPLICA_URLS)
+]
+_next_replica = count()  # next() em itertools.count é atômico no CPython
+
+# usuários que escreveram há pouco: suas leituras vão ao primário até a entrada expirar
+_recent_writers = TTLCache(maxsize=settings.READ_YOUR_WRITES_MAX_USERS, ttl=settings.READ_YOUR_WRITES_SECONDS)
+
+
+def _writer_key(request: Request) -> Optional[Hashable]:
+    """Identifica o usuário do request (id do principal/usuário já resolvido ou claims do Bearer)."""
+    for attr in ("principal", "user"):
+        resolved = getattr(request.state, attr, None)
+        if resolved is not None:
+            return resolved.id
+    payload = getattr(request.state, "token_payload", None)
+    if payload is None:
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token.strip():
+            return None
+        payload = verify_access_token(token.strip())
+        if payload is None:
+            return None
+    return payload.get("uid") or payload.get("sub")
+
+
+def mark_recent_write(request: Request) -> None:
+    """Chamado após uma escrita bem-sucedida: fixa as próximas leituras do usuário no primário."""
+    if not replica_engines:
+        return
+    key = _writer_key(request)
+    if key is not None:
+        _recent_writers.set(key, True)
+
+
+def _use_replica(request: Request) -> bool:
+    if not replica_engines:
+        return False
+    key = _writer_key(request)
+    return key is None or _recent_writers.get(key) is None
+
+
+def read_routing_stats() -> dict:
+    return {"replicas": len(replica_engines), "pinned_users": _recent_writers.stats()["size"]}
+
+
 Base = declarative_base()
 
 # 🔴 IMPORTANTE: registra as tabelas no Base.metadata
@@ -34,7 +187,39 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def read_engine(request: Request) -> Engine:
+    """
+    Engine para leituras do request: uma réplica em round-robin, ou o primário se não houver
+    réplicas ou se o usuário escreveu nos últimos READ_YOUR_WRITES_SECONDS.
+    """
+    if _use_replica(request):
+        return replica_engines[next(_next_replica) % len(replica_engines)]
+    return engine
 
 
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """Sessão para listagens/relatórios, ligada a read_engine(request). Somente leitura."""
+    db = SessionLocal(bind=read_engine(request))
+    try:
+        yield db
+    finally:
+        db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependência de sessão async (escopo por request): o request não ocupa thread do
+    threadpool enquanto espera o banco. Só a API 2.0 (select/execute), sem db.query.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Versão async de get_read_db (mesma escolha de réplica e mesma fixação no primário)."""
+    if _use_replica(request):
+        bind = async_replica_engines[next(_next_replica) % len(async_replica_engines)]
+    else:
+        bind = async_engine
+    async with AsyncSessionLocal(bind=bind) as db:
+        yield db
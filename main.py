@@ -5,6 +5,9 @@ from fastapi import FastAPI, Request
 from starlette.middleware.cors import CORSMiddleware
 
 from core.config import settings, AppInfo
+from auth.passwords import password_pool
+from core.pool_metrics import request_label
+from database import mark_recent_write
 
 # importe APENAS os routers; não inclua nada fora deste arquivo
 from routers import (
@@ -15,11 +18,15 @@ from routers import (
     item_router,
     stock_router,
     user_admin_router,
+    waitlist_router,
+    export_router,
+    attachment_router,
+    metrics_router,
 )
 
 description = """
 SGHSS — Sistema de Gestão Hospitalar e de Saúde.
-Módulos: Auth, Pacientes, Consultas, Prontuários, Itens e Estoque.
+Módulos: Auth, Pacientes, Consultas, Lista de espera, Prontuários, Itens, Estoque e Exportação (LGPD).
 """
 
 app = FastAPI(
@@ -39,13 +46,19 @@ app.add_middleware(
     allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
     allow_methods=settings.CORS_ALLOW_METHODS,
     allow_headers=settings.CORS_ALLOW_HEADERS,
+    expose_headers=settings.CORS_EXPOSE_HEADERS,
 )
 
+_READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
 # Middleware simples de latência e request-id
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
     start = monotonic()
+    request_label.set(f"{request.method} {request.url.path}")  # identifica checkouts longos do pool
     response = await call_next(request)
+    if request.method not in _READ_METHODS and response.status_code < 400:
+        mark_recent_write(request)  # read-your-writes: leituras do usuário voltam ao primário
     process_time = monotonic() - start
     response.headers["X-Process-Time"] = f"{process_time:.4f}s"
     req_id = request.headers.get("X-Request-ID")
@@ -60,9 +73,19 @@ app.include_router(auth_router.router,        prefix=api_prefix)  # /api/v1/auth
 app.include_router(patient_router.router,     prefix=api_prefix)  # /api/v1/patients/...
 app.include_router(appointment_router.router, prefix=api_prefix)  # /api/v1/appointments/...
 app.include_router(record_router.router,      prefix=api_prefix)  # /api/v1/patients/{id}/records/...
+app.include_router(record_router.search_router, prefix=api_prefix)  # /api/v1/records/search
+app.include_router(attachment_router.router,  prefix=api_prefix)  # /api/v1/patients/{id}/records/{id}/attachments/...
 app.include_router(item_router.router,        prefix=api_prefix)  # /api/v1/items/...
 app.include_router(stock_router.router,       prefix=api_prefix)  # /api/v1/stock/...
 app.include_router(user_admin_router.router,  prefix=settings.API_V1_PREFIX)
+app.include_router(waitlist_router.router,    prefix=api_prefix)  # /api/v1/waitlist/...
+app.include_router(export_router.router,      prefix=api_prefix)  # /api/v1/exports/...
+app.include_router(metrics_router.router,     prefix=api_prefix)  # /api/v1/metrics/...
+
+# Encerra os processos do bcrypt junto com o servidor
+@app.on_event("shutdown")
+def shutdown_password_pool():
+    password_pool.shutdown()
 
 # Endpoints utilitários
 @app.get("/")
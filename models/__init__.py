@@ -4,6 +4,12 @@ from . import patient  # noqa: F401
 from . import appointment  # noqa: F401
 from . import item  # noqa: F401
 from . import stock_movement  # noqa: F401
+from . import calendar_version  # noqa: F401
+from . import waitlist  # noqa: F401
+from . import record_version  # noqa: F401
+from . import export_job  # noqa: F401
+from . import attachment  # noqa: F401
+from . import auth_session  # noqa: F401
 
 # Pacote pode ter variações de "record"
 try:
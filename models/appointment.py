@@ -19,9 +19,17 @@ class Appointment(Base):
     professional = relationship("User", backref="appointments")
 
     __table_args__ = (
-        CheckConstraint("status in ('SCHEDULED','DONE','CANCELED','NOSHOW')", name="ck_appointment_status"),
+        CheckConstraint(
+            "status in ('SCHEDULED','CONFIRMED','CANCELLED','COMPLETED','NO_SHOW')",
+            name="ck_appointment_status",
+        ),
         Index("ix_appointments_professional_date", "professional_id", "date"),
-        Index("ix_appointments_patient_date", "patient_id", "date"),
+        Index("ix_appointments_patient_date", "patient_id", "date", "id"),  # inclui id: keyset da linha do tempo
+        # listagens por keyset (sort, id) com/sem filtro de status
+        Index("ix_appointments_professional_status_date", "professional_id", "status", "date", "id"),
+        Index("ix_appointments_status_date", "status", "date", "id"),
+        Index("ix_appointments_created_at_id", "created_at", "id"),
+        Index("ix_appointments_professional_created_at", "professional_id", "created_at", "id"),
     )
 
     def __repr__(self) -> str:
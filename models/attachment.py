@@ -0,0 +1,54 @@
+# models/attachment.py
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, CheckConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
+from database import Base
+
+class AttachmentBlob(Base):
+    """Conteúdo endereçado por hash (sha256): arquivos idênticos ocupam o disco uma vez só."""
+    __tablename__ = "attachment_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(BigInteger, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<AttachmentBlob {self.sha256[:12]} size={self.size}>"
+
+class Attachment(Base):
+    __tablename__ = "attachments"
+
+    id = Column(Integer, primary_key=True, index=True)
+    record_id = Column(Integer, ForeignKey("records.id", ondelete="RESTRICT"), nullable=False, index=True)
+    sha256 = Column(String(64), ForeignKey("attachment_blobs.sha256", ondelete="RESTRICT"), nullable=False, index=True)
+    filename = Column(String(255), nullable=False)
+    content_type = Column(String(120), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    uploaded_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), nullable=False)
+
+    blob = relationship("AttachmentBlob")
+
+    def __repr__(self) -> str:
+        return f"<Attachment id={self.id} record={self.record_id} {self.filename}>"
+
+class AttachmentUpload(Base):
+    """Upload em partes (retomável): `received` é o offset do próximo pedaço esperado."""
+    __tablename__ = "attachment_uploads"
+
+    id = Column(Integer, primary_key=True, index=True)
+    record_id = Column(Integer, ForeignKey("records.id", ondelete="CASCADE"), nullable=False, index=True)
+    filename = Column(String(255), nullable=False)
+    content_type = Column(String(120), nullable=False)
+    size = Column(BigInteger, nullable=False)  # tamanho total declarado
+    received = Column(BigInteger, nullable=False, default=0)
+    created_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    attachment_id = Column(Integer, ForeignKey("attachments.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), nullable=False)
+
+    __table_args__ = (
+        CheckConstraint("received >= 0 and received <= size", name="ck_attachment_uploads_received"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<AttachmentUpload id={self.id} {self.received}/{self.size}>"
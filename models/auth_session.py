@@ -0,0 +1,18 @@
+# models/auth_session.py
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from datetime import datetime, timezone
+from database import Base
+
+class AuthSession(Base):
+    """Sessão de refresh token. Guarda só o HMAC do token; a rotação troca o hash na mesma linha."""
+    __tablename__ = "auth_sessions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash = Column(String(64), nullable=False, unique=True, index=True)  # HMAC-SHA256 hex
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), nullable=False)
+    last_used_at = Column(DateTime, nullable=True)
+    expires_at = Column(DateTime, nullable=False, index=True)  # usado pela varredura de expiradas
+
+    def __repr__(self) -> str:
+        return f"<AuthSession id={self.id} user={self.user_id} expires={self.expires_at}>"
@@ -0,0 +1,15 @@
+# models/calendar_version.py
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from datetime import datetime, timezone
+from database import Base
+
+class CalendarVersion(Base):
+    """Contador de mudanças da agenda de cada profissional (ETag/Last-Modified do feed .ics)."""
+    __tablename__ = "calendar_versions"
+
+    professional_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<CalendarVersion professional={self.professional_id} v={self.version}>"
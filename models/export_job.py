@@ -0,0 +1,26 @@
+# models/export_job.py
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, CheckConstraint
+from datetime import datetime, timezone
+from database import Base
+
+class ExportJob(Base):
+    """Exportação de dados de pacientes (portabilidade LGPD) gerada em segundo plano."""
+    __tablename__ = "export_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    requested_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    patient_ids = Column(JSON, nullable=False)
+    status = Column(String(20), nullable=False, default="PENDING")
+    file_name = Column(String(255), nullable=True)  # relativo a EXPORT_DIR
+    size_bytes = Column(Integer, nullable=True)
+    error = Column(String(500), nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        CheckConstraint("status in ('PENDING','RUNNING','DONE','FAILED')", name="ck_export_jobs_status"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ExportJob id={self.id} {self.status} patients={len(self.patient_ids or [])}>"
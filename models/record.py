@@ -1,8 +1,9 @@
 # models/record.py
-from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index, DDL, event
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from database import Base
+from core.compression import CompressedText
 
 class Record(Base):
     __tablename__ = "records"
@@ -10,13 +11,57 @@ class Record(Base):
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(Integer, ForeignKey("patients.id", ondelete="RESTRICT"), nullable=False, index=True)
     professional_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=False, index=True)
-    notes = Column(Text, nullable=False)
+    notes = Column(CompressedText, nullable=False)  # comprimido acima de RECORD_NOTES_COMPRESS_MIN_BYTES
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), nullable=False)
+    # versão atual (denormalizada); o histórico fica em record_versions
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(DateTime, nullable=True)
 
     patient = relationship("Patient", back_populates="records")
     professional = relationship("User", backref="records")
+    versions = relationship("RecordVersion", back_populates="record", lazy="dynamic", passive_deletes="all")
+
+    __table_args__ = (
+        # paginação por keyset do prontuário: (created_at, id) dentro do paciente
+        Index("ix_records_patient_created_at", "patient_id", "created_at", "id"),
+    )
 
     def __repr__(self) -> str:
         return f"<Record id={self.id} patient={self.patient_id}>"
 
 
+
+
+# ---------------------------
+# Busca textual (SQLite FTS5)
+# ---------------------------
+# unicode61 + remove_diacritics: "insulina" casa com "INSULINA" e "açúcar" com "acucar".
+# Índice "external content": o FTS5 guarda só o índice invertido, não uma cópia do texto.
+# O conteúdo vem da view records_notes_source, que descomprime notes com notes_text(...)
+# (ver database.py); snippet() lê por ela apenas as linhas retornadas.
+# Mantido por triggers; só existe no SQLite. Com conteúdo externo a remoção precisa do
+# texto antigo (comando 'delete'), por isso o update é delete + insert.
+RECORDS_FTS_TABLE = "records_fts"
+RECORDS_FTS_SOURCE = "records_notes_source"
+
+RECORDS_FTS_DDL = [
+    f"CREATE VIEW IF NOT EXISTS {RECORDS_FTS_SOURCE} AS "
+    "SELECT id, notes_text(notes) AS notes FROM records",
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {RECORDS_FTS_TABLE} USING fts5("
+    f"notes, content = '{RECORDS_FTS_SOURCE}', content_rowid = 'id', "
+    "tokenize = 'unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS records_fts_ai AFTER INSERT ON records BEGIN "
+    f"INSERT INTO {RECORDS_FTS_TABLE}(rowid, notes) VALUES (new.id, notes_text(new.notes)); END",
+    f"CREATE TRIGGER IF NOT EXISTS records_fts_ad AFTER DELETE ON records BEGIN "
+    f"INSERT INTO {RECORDS_FTS_TABLE}({RECORDS_FTS_TABLE}, rowid, notes) "
+    "VALUES ('delete', old.id, notes_text(old.notes)); END",
+    f"CREATE TRIGGER IF NOT EXISTS records_fts_au AFTER UPDATE OF notes ON records BEGIN "
+    f"INSERT INTO {RECORDS_FTS_TABLE}({RECORDS_FTS_TABLE}, rowid, notes) "
+    "VALUES ('delete', old.id, notes_text(old.notes)); "
+    f"INSERT INTO {RECORDS_FTS_TABLE}(rowid, notes) VALUES (new.id, notes_text(new.notes)); END",
+]
+
+for _stmt in RECORDS_FTS_DDL:
+    event.listen(Record.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+for _stmt in (f"DROP TABLE IF EXISTS {RECORDS_FTS_TABLE}", f"DROP VIEW IF EXISTS {RECORDS_FTS_SOURCE}"):
+    event.listen(Record.__table__, "before_drop", DDL(_stmt).execute_if(dialect="sqlite"))
@@ -0,0 +1,33 @@
+# models/record_version.py
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, CheckConstraint, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
+from database import Base
+from core.compression import CompressedText
+
+class RecordVersion(Base):
+    """
+    Histórico append-only do prontuário. `payload` guarda o texto completo (snapshot) ou a
+    diferença para a versão anterior (delta, JSON). A versão atual vive em records.notes.
+    """
+    __tablename__ = "record_versions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    record_id = Column(Integer, ForeignKey("records.id", ondelete="RESTRICT"), nullable=False)
+    version = Column(Integer, nullable=False)
+    kind = Column(String(10), nullable=False)  # snapshot | delta
+    payload = Column(CompressedText, nullable=False)
+    professional_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    reason = Column(String(255), nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), nullable=False)
+
+    record = relationship("Record", back_populates="versions")
+
+    __table_args__ = (
+        # a unicidade também serve de índice para "último snapshot <= v" e para a listagem
+        UniqueConstraint("record_id", "version", name="uq_record_versions_record_version"),
+        CheckConstraint("kind in ('snapshot','delta')", name="ck_record_versions_kind"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<RecordVersion record={self.record_id} v={self.version} {self.kind}>"
@@ -16,6 +16,7 @@ class StockMovement(Base):
     expiration_date = Column(Date, nullable=True, index=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    patient_id = Column(Integer, ForeignKey("patients.id", ondelete="SET NULL"), nullable=True)  # dispensação (OUT)
 
     item = relationship("Item", back_populates="stock_movements")
     user = relationship("User", backref="stock_movements")
@@ -24,6 +25,8 @@ class StockMovement(Base):
         CheckConstraint("quantity > 0", name="ck_stock_mov_quantity_positive"),
         CheckConstraint("type in ('IN','OUT')", name="ck_stock_mov_type"),
         Index("ix_stock_item_created_at", "item_id", "created_at"),
+        # linha do tempo do paciente: keyset (created_at, id)
+        Index("ix_stock_patient_created_at", "patient_id", "created_at", "id"),
     )
 
     def __repr__(self) -> str:
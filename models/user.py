@@ -13,6 +13,8 @@ class User(Base):
     # Default: menor privilégio
     role = Column(String(32), nullable=False, default="technician", index=True)
     cpf = Column(String(14), unique=True, index=True, nullable=False)
+    # Incrementado ao mudar o papel: tokens com "ver" menor deixam de valer
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     def __repr__(self) -> str:
         return f"<User id={self.id} email={self.email}>"
@@ -0,0 +1,38 @@
+# models/waitlist.py
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, CheckConstraint, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
+from database import Base
+
+class WaitlistEntry(Base):
+    __tablename__ = "waitlist_entries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    patient_id = Column(Integer, ForeignKey("patients.id", ondelete="CASCADE"), nullable=False, index=True)
+    professional_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    priority = Column(Integer, nullable=False, default=3)  # 1 = mais urgente ... 5 = menos urgente
+    earliest = Column(DateTime, nullable=False)  # janela aceita pelo paciente (UTC-naive)
+    latest = Column(DateTime, nullable=False)
+    status = Column(String(20), nullable=False, default="WAITING")
+    reason = Column(String(255), nullable=True)
+    offered_date = Column(DateTime, nullable=True)
+    offer_expires_at = Column(DateTime, nullable=True)
+    appointment_id = Column(Integer, ForeignKey("appointments.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), nullable=False)
+
+    patient = relationship("Patient")
+    professional = relationship("User")
+
+    __table_args__ = (
+        CheckConstraint("status in ('WAITING','OFFERED','ASSIGNED','CANCELLED')", name="ck_waitlist_status"),
+        CheckConstraint("priority between 1 and 5", name="ck_waitlist_priority"),
+        CheckConstraint("earliest <= latest", name="ck_waitlist_range"),
+        # fila de prioridade: varre em ordem (priority, created_at) e filtra a janela no próprio índice
+        Index(
+            "ix_waitlist_queue",
+            "professional_id", "status", "priority", "created_at", "earliest", "latest",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<WaitlistEntry id={self.id} patient={self.patient_id} prio={self.priority} {self.status}>"
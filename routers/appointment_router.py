@@ -1,19 +1,62 @@
 # routers/appointment_router.py
 
-from datetime import datetime
+import asyncio
+import json
+from collections import defaultdict
+from datetime import date as date_type, datetime, time, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from typing import Optional, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-
-from database import get_db
-from auth.auth_utils import get_current_user
-from models.user import User
+from sqlalchemy import and_, func, select
+
+from database import get_async_db, get_async_read_db, get_db, get_read_db, SessionLocal
+from core.cache import TTLCache
+from core.config import settings
+from core.events import appointment_events, OVERFLOW
+from core.pagination import (
+    NEXT_CURSOR_HEADER,
+    TOTAL_COUNT_HEADER,
+    encode_cursor,
+    decode_cursor,
+    parse_cursor_datetime,
+    keyset_after,
+)
+from auth.auth_utils import get_principal, Principal
+from auth.jwt_handler import create_access_token, verify_access_token
+from auth.revocation import current_token_version
 from models.patient import Patient
+from models.user import User
 from models.appointment import Appointment
-from schemas.appointment import AppointmentCreate, AppointmentOut
+from models.calendar_version import CalendarVersion
+from models.waitlist import WaitlistEntry
+from schemas.appointment import (
+    AppointmentCreate,
+    AppointmentOut,
+    AppointmentRecurringCreate,
+    AppointmentBulkCreate,
+    AppointmentBatchOut,
+    OccurrenceConflict,
+    RecurrenceRule,
+    MAX_BATCH_OCCURRENCES,
+    BulkStatusChange,
+    BulkStatusResult,
+    CalendarBucket,
+    CalendarOut,
+)
+from services.appointments.service import (
+    bulk_transition,
+    bump_calendar_version,
+    held_offers,
+    slot_taken,
+    publish_change as _publish,
+)
+from services.appointments.waitlist import fill_slot
+from services.appointments.ical import iter_professional_calendar
 
 router = APIRouter(prefix="/appointments", tags=["Appointments"])
 
@@ -23,6 +66,14 @@ router = APIRouter(prefix="/appointments", tags=["Appointments"])
 AllowedStatus = Literal["SCHEDULED", "CONFIRMED", "CANCELLED", "COMPLETED", "NO_SHOW"]
 ALLOWED_STATUSES: set[str] = {"SCHEDULED", "CONFIRMED", "CANCELLED", "COMPLETED", "NO_SHOW"}
 
+MAX_CALENDAR_RANGE = timedelta(days=366)
+
+# Agregados do calendário (chave: escopo + faixa + agrupamento)
+_calendar_cache = TTLCache(
+    maxsize=settings.CALENDAR_CACHE_MAX_ENTRIES,
+    ttl=settings.CALENDAR_CACHE_TTL_SECONDS,
+)
+
 
 class AppointmentUpdate(BaseModel):
     """Atualização parcial."""
@@ -37,7 +88,14 @@ class StatusChange(BaseModel):
     status: AllowedStatus
 
 
-def _can_manage(appt: Appointment, current_user: User) -> bool:
+def _naive_utc(value: datetime) -> datetime:
+    """Datas do banco são UTC sem tzinfo: entradas com offset são convertidas antes de comparar/gravar."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _can_manage(appt: Appointment, current_user: Principal) -> bool:
     """Regra simples:
        - admin pode tudo
        - o profissional 'owner' da consulta pode editar/deletar
@@ -49,13 +107,120 @@ def _can_manage(appt: Appointment, current_user: User) -> bool:
 
 def _exists_same_slot(db: Session, professional_id: int, date: datetime, exclude_id: int | None = None) -> bool:
     """Anti-overbooking exato (mesma data/hora)."""
-    q = db.query(Appointment).filter(
-        Appointment.professional_id == professional_id,
-        Appointment.date == date,
+    return slot_taken(db, professional_id, date, exclude_id)
+
+
+def _taken_slots(db: Session, professional_id: int, dates: list[datetime]) -> set[datetime]:
+    """
+    Horários já ocupados do profissional, com UMA consulta de faixa em (professional_id, date),
+    mais os reservados por ofertas pendentes da lista de espera.
+    """
+    lo, hi = min(dates), max(dates)
+    rows = (
+        db.query(Appointment.date)
+        .filter(
+            Appointment.professional_id == professional_id,
+            Appointment.date >= lo,
+            Appointment.date <= hi,
+            Appointment.status != "CANCELLED",
+        )
+        .all()
     )
-    if exclude_id is not None:
-        q = q.filter(Appointment.id != exclude_id)
-    return db.query(q.exists()).scalar() is True
+    offers = (
+        held_offers(db, professional_id)
+        .filter(WaitlistEntry.offered_date >= lo, WaitlistEntry.offered_date <= hi)
+        .with_entities(WaitlistEntry.offered_date)
+        .all()
+    )
+    return {r[0] for r in rows} | {r[0] for r in offers}
+
+
+def _existing_professionals(db: Session, ids: set[int]) -> set[int]:
+    """Ids de profissionais que existem, numa única consulta (professional_id vem do payload do admin)."""
+    if not ids:
+        return set()
+    return {uid for (uid,) in db.query(User.id).filter(User.id.in_(ids)).all()}
+
+
+def _expand_recurrence(start: datetime, rule: RecurrenceRule) -> list[datetime]:
+    """Expande a regra em datas concretas (DTSTART incluso), respeitando count/until."""
+    # sem count, expande até MAX+1 para detectar faixas grandes demais
+    limit = rule.count or MAX_BATCH_OCCURRENCES + 1
+    out: list[datetime] = []
+
+    if rule.freq == "DAILY":
+        step = timedelta(days=rule.interval)
+        current = start
+        while len(out) < limit and (rule.until is None or current <= rule.until):
+            out.append(current)
+            current += step
+        return out
+
+    weekdays = sorted(set(rule.by_weekday or [start.weekday()]))
+    week_start = start - timedelta(days=start.weekday())
+    while len(out) < limit:
+        for wd in weekdays:
+            occ = week_start + timedelta(days=wd)
+            if occ < start:
+                continue
+            if rule.until is not None and occ > rule.until:
+                return out
+            out.append(occ)
+            if len(out) >= limit:
+                break
+        week_start += timedelta(weeks=rule.interval)
+    return out
+
+
+def _schedule_batch(
+    db: Session,
+    planned: list[tuple[int, int, int, datetime, Optional[str]]],
+    conflicts: list[OccurrenceConflict],
+    on_conflict: str,
+) -> AppointmentBatchOut:
+    """
+    Insere as ocorrências planejadas (index, patient_id, professional_id, date, reason) numa
+    única transação. Conflitos de horário são checados com uma consulta por profissional.
+    """
+    by_prof: dict[int, list[datetime]] = defaultdict(list)
+    for _, _, prof_id, when, _ in planned:
+        by_prof[prof_id].append(when)
+    taken = {prof_id: _taken_slots(db, prof_id, dates) for prof_id, dates in by_prof.items()}
+
+    to_insert: list[Appointment] = []
+    for index, patient_id, prof_id, when, reason in planned:
+        if when in taken[prof_id]:
+            conflicts.append(OccurrenceConflict(
+                index=index,
+                professional_id=prof_id,
+                date=when,
+                detail="Já existe uma consulta para este profissional neste horário.",
+            ))
+            continue
+        taken[prof_id].add(when)  # evita duplicidade dentro do próprio lote
+        to_insert.append(Appointment(
+            patient_id=patient_id,
+            professional_id=prof_id,
+            date=when,
+            status="SCHEDULED",
+            reason=reason,
+        ))
+
+    conflicts.sort(key=lambda c: c.index)
+    if conflicts and on_conflict == "abort":
+        raise HTTPException(
+            status_code=409,
+            detail=[c.model_dump(mode="json") for c in conflicts],
+        )
+
+    db.add_all(to_insert)
+    bump_calendar_version(db, (a.professional_id for a in to_insert))
+    db.flush()  # gera ids/defaults; serializa antes do commit para evitar refresh por linha
+    created = [AppointmentOut.model_validate(a) for a in to_insert]
+    db.commit()
+    for out in created:
+        _publish("created", out.model_dump(mode="json"))
+    return AppointmentBatchOut(created=created, conflicts=conflicts)
 
 
 # ---------------------------
@@ -66,38 +231,155 @@ def _exists_same_slot(db: Session, professional_id: int, date: datetime, exclude
 def create_appointment(
     data: AppointmentCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_principal),
 ):
     # valida paciente
     patient = db.query(Patient).filter(Patient.id == data.patient_id).first()
     if not patient:
         raise HTTPException(status_code=404, detail="Paciente não encontrado")
 
+    when = _naive_utc(data.date)
+
     # anti-overbooking exato para o profissional autenticado
-    if _exists_same_slot(db, current_user.id, data.date):
+    if _exists_same_slot(db, current_user.id, when):
         raise HTTPException(status_code=409, detail="Já existe uma consulta para este profissional neste horário.")
 
     appt = Appointment(
         patient_id=data.patient_id,
         professional_id=current_user.id,  # profissional autenticado
-        date=data.date,                    # Pydantic já entrega datetime
+        date=when,                         # UTC sem tzinfo, como o resto da agenda
         status="SCHEDULED",
         reason=getattr(data, "reason", None),
     )
     db.add(appt)
+    bump_calendar_version(db, [appt.professional_id])
     db.commit()
     db.refresh(appt)
+    _publish("created", appt)
     return appt
 
 
+# ---------------------------
+# CREATE (recorrente / em lote)
+# ---------------------------
+
+@router.post("/recurring", response_model=AppointmentBatchOut, status_code=status.HTTP_201_CREATED)
+def create_recurring_appointments(
+    data: AppointmentRecurringCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_principal),
+):
+    """
+    Agenda uma série (ex.: terapia/diálise semanal) a partir de uma regra tipo RRULE.
+    on_conflict=skip agenda o que estiver livre; abort devolve 409 se houver qualquer conflito.
+    """
+    patient = db.query(Patient).filter(Patient.id == data.patient_id).first()
+    if not patient:
+        raise HTTPException(status_code=404, detail="Paciente não encontrado")
+
+    professional_id = current_user.id
+    if current_user.role == "admin" and data.professional_id is not None:
+        professional_id = data.professional_id
+        if not _existing_professionals(db, {professional_id}):
+            raise HTTPException(status_code=404, detail="Profissional não encontrado")
+
+    rule = data.rule.model_copy(update={"until": _naive_utc(data.rule.until) if data.rule.until else None})
+    dates = _expand_recurrence(_naive_utc(data.date), rule)
+    if not dates:
+        raise HTTPException(status_code=400, detail="A regra não gera nenhuma ocorrência.")
+    if len(dates) > MAX_BATCH_OCCURRENCES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A regra gera mais de {MAX_BATCH_OCCURRENCES} ocorrências.",
+        )
+
+    planned = [(i, data.patient_id, professional_id, when, data.reason) for i, when in enumerate(dates)]
+    return _schedule_batch(db, planned, [], data.on_conflict)
+
+
+@router.post("/bulk", response_model=AppointmentBatchOut, status_code=status.HTTP_201_CREATED)
+def create_appointments_bulk(
+    data: AppointmentBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_principal),
+):
+    """
+    Importação de agendas: cria várias consultas numa única transação.
+    Não-admin só agenda para si mesmo (professional_id do payload é ignorado).
+    """
+    patient_ids = {it.patient_id for it in data.items}
+    existing = {
+        pid for (pid,) in db.query(Patient.id).filter(Patient.id.in_(patient_ids)).all()
+    }
+
+    is_admin = current_user.role == "admin"
+    professionals = (
+        _existing_professionals(db, {it.professional_id for it in data.items}) if is_admin else {current_user.id}
+    )
+
+    planned: list[tuple[int, int, int, datetime, Optional[str]]] = []
+    conflicts: list[OccurrenceConflict] = []
+    for i, it in enumerate(data.items):
+        prof_id = it.professional_id if is_admin else current_user.id
+        when = _naive_utc(it.date)
+        if it.patient_id not in existing:
+            conflicts.append(OccurrenceConflict(
+                index=i, professional_id=prof_id, date=when, detail="Paciente não encontrado",
+            ))
+            continue
+        if prof_id not in professionals:
+            conflicts.append(OccurrenceConflict(
+                index=i, professional_id=prof_id, date=when, detail="Profissional não encontrado",
+            ))
+            continue
+        planned.append((i, it.patient_id, prof_id, when, it.reason))
+
+    return _schedule_batch(db, planned, conflicts, data.on_conflict)
+
+
+@router.post("/bulk/status", response_model=BulkStatusResult)
+def change_status_bulk(
+    body: BulkStatusChange,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_principal),
+):
+    """
+    Muda o status de todas as consultas que casam com o filtro, em lotes de UPDATE ... WHERE.
+    Só transições permitidas são aplicadas (ex.: status finais não mudam).
+    Não-admin só afeta as próprias consultas. Cancelamentos liberam os horários para a
+    lista de espera, como no cancelamento individual.
+    """
+    professional_id = body.professional_id if current_user.role == "admin" else current_user.id
+    rows = bulk_transition(
+        db,
+        body.to_status,
+        from_statuses=body.from_status,
+        professional_id=professional_id,
+        date_from=_naive_utc(body.date_from) if body.date_from else None,
+        date_to=_naive_utc(body.date_to) if body.date_to else None,
+    )
+    for r in rows:
+        _publish("status", {
+            "id": r.id,
+            "professional_id": r.professional_id,
+            "date": r.date.isoformat(),
+            "status": body.to_status,
+        })
+        if body.to_status == "CANCELLED":
+            background_tasks.add_task(fill_slot, r.professional_id, r.date)
+    return BulkStatusResult(to_status=body.to_status, updated=len(rows), ids=[r.id for r in rows])
+
+
 # ---------------------------
 # READ (listagem com filtros)
 # ---------------------------
 
 @router.get("/", response_model=list[AppointmentOut])
-def list_appointments(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def list_appointments(
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_principal),
     # filtros
     patient_id: Optional[int] = None,
     professional_id: Optional[int] = None,
@@ -108,8 +390,14 @@ def list_appointments(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     sort: Literal["date_asc", "date_desc", "created_desc", "created_asc"] = "date_asc",
+    cursor: Optional[str] = Query(None, description="Cursor do header X-Next-Cursor (dispensa offset)"),
+    count: bool = Query(False, description="Inclui o total filtrado no header X-Total-Count"),
 ):
-    q = db.query(Appointment)
+    """
+    Listagem ordenada por (date|created_at, id). Com `cursor`, pagina por keyset (sem OFFSET);
+    o cursor da próxima página vem no header X-Next-Cursor quando a página está cheia.
+    """
+    q = select(Appointment)
 
     if patient_id is not None:
         q = q.filter(Appointment.patient_id == patient_id)
@@ -123,21 +411,316 @@ def list_appointments(
     if status_filter is not None:
         q = q.filter(Appointment.status == status_filter)
 
+    if date_from is None and date_to is None and settings.APPOINTMENTS_LIST_DEFAULT_DAYS:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        date_from = now - timedelta(days=settings.APPOINTMENTS_LIST_DEFAULT_DAYS)
+
     if date_from is not None:
         q = q.filter(Appointment.date >= date_from)
     if date_to is not None:
         q = q.filter(Appointment.date <= date_to)
 
-    if sort == "date_asc":
-        q = q.order_by(Appointment.date.asc())
-    elif sort == "date_desc":
-        q = q.order_by(Appointment.date.desc())
-    elif sort == "created_desc":
-        q = q.order_by(Appointment.created_at.desc())
+    if count:
+        total = await db.scalar(select(func.count()).select_from(q.order_by(None).subquery()))
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+
+    column = Appointment.date if sort.startswith("date") else Appointment.created_at
+    ascending = sort.endswith("asc")
+
+    if cursor is not None:
+        cur_sort, value, last_id = decode_cursor(cursor, 3)
+        if cur_sort != sort or not isinstance(last_id, int):
+            raise HTTPException(status_code=400, detail="Cursor inválido para esta ordenação.")
+        q = q.filter(keyset_after(column, Appointment.id, parse_cursor_datetime(value), last_id, ascending))
+        offset = 0
+
+    if ascending:
+        q = q.order_by(column.asc(), Appointment.id.asc())
     else:
-        q = q.order_by(Appointment.created_at.asc())
+        q = q.order_by(column.desc(), Appointment.id.desc())
+
+    rows = (await db.scalars(q.offset(offset).limit(limit))).all()
+    if len(rows) == limit:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(sort, getattr(last, column.key), last.id)
+    return rows
+
+
+# ---------------------------
+# READ (calendário agregado)
+# ---------------------------
+
+def _bucket_expr(db: Session, group_by: str):
+    """Expressão SQL do balde (dia ou semana iniciando na segunda), por dialeto."""
+    if db.get_bind().dialect.name == "sqlite":
+        if group_by == "week":
+            return func.date(Appointment.date, "weekday 0", "-6 days")
+        return func.date(Appointment.date)
+    return func.date_trunc(group_by, Appointment.date)
+
+
+def _calendar_version(db: Session, professional_id: Optional[int]) -> int:
+    """Versão da agenda do profissional; sem profissional, a soma de todas (muda a cada escrita)."""
+    q = db.query(func.coalesce(func.sum(CalendarVersion.version), 0))
+    if professional_id is not None:
+        q = q.filter(CalendarVersion.professional_id == professional_id)
+    return q.scalar()
 
-    return q.offset(offset).limit(limit).all()
+
+def _as_date(value) -> date_type:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date_type):
+        return value
+    return date_type.fromisoformat(str(value)[:10])
+
+
+@router.get("/calendar", response_model=CalendarOut)
+def appointments_calendar(
+    date_from: datetime = Query(..., alias="from"),
+    date_to: datetime = Query(..., alias="to"),
+    group_by: Literal["day", "week"] = "day",
+    professional_id: Optional[int] = None,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_principal),
+):
+    """
+    Contagem de consultas por balde (dia/semana), profissional e status, num único GROUP BY
+    sobre o índice (professional_id, date). Não-admin só enxerga a própria agenda.
+    """
+    date_from, date_to = _naive_utc(date_from), _naive_utc(date_to)
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' deve ser posterior a 'from'.")
+    if date_to - date_from > MAX_CALENDAR_RANGE:
+        raise HTTPException(status_code=400, detail="Intervalo máximo é de 366 dias.")
+
+    if current_user.role != "admin":
+        professional_id = current_user.id
+
+    # a versão da agenda (bump_calendar_version em toda escrita) entra na chave: escrita nova,
+    # chave nova, sem esperar o TTL e valendo entre processos
+    key = (professional_id, date_from, date_to, group_by, _calendar_version(db, professional_id))
+    cached = _calendar_cache.get(key)
+    if cached is not None:
+        return cached
+
+    bucket = _bucket_expr(db, group_by).label("bucket")
+    q = db.query(
+        Appointment.professional_id,
+        bucket,
+        Appointment.status,
+        func.count(Appointment.id),
+    ).filter(Appointment.date >= date_from, Appointment.date <= date_to)
+    if professional_id is not None:
+        q = q.filter(Appointment.professional_id == professional_id)
+    rows = (
+        q.group_by(Appointment.professional_id, bucket, Appointment.status)
+        .order_by(Appointment.professional_id, bucket)
+        .all()
+    )
+
+    grouped: dict[tuple[int, date_type], dict[str, int]] = {}
+    for prof_id, b, st, n in rows:
+        grouped.setdefault((prof_id, _as_date(b)), {})[st] = n
+    result = CalendarOut(
+        date_from=date_from,
+        date_to=date_to,
+        group_by=group_by,
+        buckets=[
+            CalendarBucket(professional_id=prof_id, bucket=b, counts=counts, total=sum(counts.values()))
+            for (prof_id, b), counts in grouped.items()
+        ],
+    )
+
+    # faixas inteiramente no passado praticamente não mudam: TTL mais longo
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    past = date_to < now
+    ttl = settings.CALENDAR_CACHE_PAST_TTL_SECONDS if past else settings.CALENDAR_CACHE_TTL_SECONDS
+    _calendar_cache.set(key, result, ttl=ttl)
+    return result
+
+
+# ---------------------------
+# FEED iCalendar (.ics) por profissional
+# ---------------------------
+
+ICS_TOKEN_SCOPE = "ics"
+
+
+@router.post("/calendar/feed-token")
+def calendar_feed_token(
+    request: Request,
+    professional_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_principal),
+):
+    """
+    Gera a URL assinada do feed .ics (apps de calendário não mandam Authorization).
+    O token só vale para o feed do profissional indicado; não serve como access token.
+    Carrega a token_version do profissional: logout-all, troca de senha, mudança de papel
+    ou remoção do profissional invalidam o feed, como os access tokens.
+    """
+    pid = current_user.id
+    if current_user.role == "admin" and professional_id is not None:
+        pid = professional_id
+    version = current_token_version(db, pid)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Profissional não encontrado")
+
+    token = create_access_token(
+        sub=f"{ICS_TOKEN_SCOPE}:{pid}",
+        extra={"scope": ICS_TOKEN_SCOPE, "pid": pid, "ver": version},
+        expires_delta=timedelta(days=settings.ICS_FEED_TOKEN_DAYS),
+    )
+    url = request.url_for("professional_calendar_feed", professional_id=pid).include_query_params(token=token)
+    return {
+        "professional_id": pid,
+        "token": token,
+        "url": str(url),
+        "expires_in_days": settings.ICS_FEED_TOKEN_DAYS,
+    }
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+@router.get("/calendar/{professional_id}.ics", name="professional_calendar_feed")
+def professional_calendar_feed(
+    professional_id: int,
+    token: str = Query(..., description="Token de /appointments/calendar/feed-token"),
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Feed iCalendar da agenda (janela hoje-ICS_PAST_DAYS .. hoje+ICS_FUTURE_DAYS).
+    ETag/Last-Modified vêm do contador calendar_versions: sem mudanças, responde 304
+    sem consultar a tabela de consultas. Com mudanças, o .ics é gerado em streaming.
+    """
+    payload = verify_access_token(token)
+    if not payload or payload.get("scope") != ICS_TOKEN_SCOPE or payload.get("pid") != professional_id:
+        raise HTTPException(status_code=401, detail="Token do feed inválido ou expirado")
+    token_version = current_token_version(db, professional_id)
+    if token_version is None or payload.get("ver", 0) < token_version:
+        raise HTTPException(status_code=401, detail="Token do feed revogado")
+
+    cv = db.get(CalendarVersion, professional_id)
+    version = cv.version if cv else 0
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    # a janela anda com o dia: o dia entra na validação junto com o contador
+    day_start = datetime.combine(now.date(), time.min)
+    last_modified = max(cv.updated_at, day_start) if cv else day_start
+    last_modified = last_modified.replace(microsecond=0)
+    etag = f'"{professional_id}-{version}-{now.date().isoformat()}"'
+
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True),
+        "Cache-Control": "private, no-cache",
+    }
+
+    not_modified = False
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    elif if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).astimezone(timezone.utc).replace(tzinfo=None)
+            not_modified = last_modified <= since
+        except (TypeError, ValueError):
+            pass
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    window_start = day_start - timedelta(days=settings.ICS_PAST_DAYS)
+    window_end = day_start + timedelta(days=settings.ICS_FUTURE_DAYS + 1)
+
+    def stream():
+        # sessão própria: a de get_db pode ser fechada antes do fim do streaming
+        session = SessionLocal()
+        try:
+            for chunk in iter_professional_calendar(session, professional_id, window_start, window_end):
+                yield chunk.encode("utf-8")
+        finally:
+            session.close()
+
+    return StreamingResponse(stream(), media_type="text/calendar; charset=utf-8", headers=headers)
+
+
+# ---------------------------
+# FEED de mudanças (SSE)
+# ---------------------------
+
+def _sse(seq: int, data: dict) -> str:
+    return f"id: {appointment_events.token(seq)}\nevent: {data['type']}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.get("/events")
+async def appointment_events_stream(
+    request: Request,
+    professional_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    last_event_id: Optional[str] = Query(None, description="Token de retomada (ou header Last-Event-ID)"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: Principal = Depends(get_principal),
+):
+    """
+    Server-Sent Events com criações/alterações/mudanças de status de consultas, publicadas
+    após o commit. Cada evento traz um `id` que serve de token de retomada: reconectando
+    com Last-Event-ID, o cliente recebe o que perdeu. Se o token for antigo demais (ou de
+    outra instância), chega um evento `reset` e o cliente deve recarregar a lista.
+    """
+    if current_user.role != "admin":
+        professional_id = current_user.id
+    # comparar datetime com e sem tzinfo levanta TypeError no meio do stream
+    if date_from is not None:
+        date_from = _naive_utc(date_from)
+    if date_to is not None:
+        date_to = _naive_utc(date_to)
+
+    def matches(data: dict) -> bool:
+        appt = data["appointment"]
+        if professional_id is not None and appt["professional_id"] != professional_id:
+            return False
+        if date_from is not None or date_to is not None:
+            when = _naive_utc(datetime.fromisoformat(appt["date"]))
+            if date_from is not None and when < date_from:
+                return False
+            if date_to is not None and when > date_to:
+                return False
+        return True
+
+    sub, missed, reset = appointment_events.subscribe(last_event_id or last_event_id_header)
+
+    async def stream():
+        try:
+            if reset:
+                yield "event: reset\ndata: {}\n\n"
+            for seq, data in missed:
+                if matches(data):
+                    yield _sse(seq, data)
+            while not await request.is_disconnected():
+                try:
+                    item = await asyncio.wait_for(sub.get(), timeout=settings.EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if item is OVERFLOW:
+                    # cliente lento: encerra; ele reconecta com o último id recebido
+                    break
+                seq, data = item
+                if matches(data):
+                    yield _sse(seq, data)
+        finally:
+            appointment_events.unsubscribe(sub)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # ---------------------------
@@ -145,12 +728,12 @@ def list_appointments(
 # ---------------------------
 
 @router.get("/{appointment_id}", response_model=AppointmentOut)
-def get_appointment(
+async def get_appointment(
     appointment_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_principal),
 ):
-    appt = db.get(Appointment, appointment_id)
+    appt = await db.get(Appointment, appointment_id)
     if not appt:
         raise HTTPException(status_code=404, detail="Consulta não encontrada")
 
@@ -168,8 +751,9 @@ def get_appointment(
 def update_appointment(
     appointment_id: int,
     payload: AppointmentUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_principal),
 ):
     appt = db.get(Appointment, appointment_id)
     if not appt:
@@ -185,11 +769,15 @@ def update_appointment(
             raise HTTPException(status_code=404, detail="Paciente não encontrado")
         appt.patient_id = payload.patient_id
 
+    freed_slot = None
     if payload.date is not None:
+        new_date = _naive_utc(payload.date)
         # anti-overbooking exato
-        if _exists_same_slot(db, appt.professional_id, payload.date, exclude_id=appt.id):
+        if _exists_same_slot(db, appt.professional_id, new_date, exclude_id=appt.id):
             raise HTTPException(status_code=409, detail="Já existe uma consulta para este profissional neste horário.")
-        appt.date = payload.date
+        if new_date != appt.date:
+            freed_slot = appt.date  # remarcação libera o horário antigo
+        appt.date = new_date
 
     if payload.reason is not None:
         appt.reason = payload.reason
@@ -197,10 +785,16 @@ def update_appointment(
     if payload.status is not None:
         if payload.status not in ALLOWED_STATUSES:
             raise HTTPException(status_code=400, detail="Status inválido.")
+        if payload.status == "CANCELLED" and appt.status != "CANCELLED":
+            freed_slot = appt.date
         appt.status = payload.status
 
+    bump_calendar_version(db, [appt.professional_id])
     db.commit()
     db.refresh(appt)
+    _publish("updated", appt)
+    if freed_slot is not None:
+        background_tasks.add_task(fill_slot, appt.professional_id, freed_slot)
     return appt
 
 
@@ -212,8 +806,9 @@ def update_appointment(
 def change_status(
     appointment_id: int,
     body: StatusChange,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_principal),
 ):
     appt = db.get(Appointment, appointment_id)
     if not appt:
@@ -222,48 +817,68 @@ def change_status(
     if not _can_manage(appt, current_user):
         raise HTTPException(status_code=403, detail="Sem permissão")
 
+    freed = body.status == "CANCELLED" and appt.status != "CANCELLED"
     appt.status = body.status
+    bump_calendar_version(db, [appt.professional_id])
     db.commit()
     db.refresh(appt)
+    _publish("status", appt)
+    if freed:
+        background_tasks.add_task(fill_slot, appt.professional_id, appt.date)
     return appt
 
 
 @router.post("/{appointment_id}/confirm", response_model=AppointmentOut)
-def confirm(appointment_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def confirm(appointment_id: int, db: Session = Depends(get_db), current_user: Principal = Depends(get_principal)):
     appt = db.get(Appointment, appointment_id)
     if not appt:
         raise HTTPException(status_code=404, detail="Consulta não encontrada")
     if not _can_manage(appt, current_user):
         raise HTTPException(status_code=403, detail="Sem permissão")
     appt.status = "CONFIRMED"
+    bump_calendar_version(db, [appt.professional_id])
     db.commit()
     db.refresh(appt)
+    _publish("status", appt)
     return appt
 
 
 @router.post("/{appointment_id}/cancel", response_model=AppointmentOut)
-def cancel(appointment_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def cancel(
+    appointment_id: int,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_principal),
+):
     appt = db.get(Appointment, appointment_id)
     if not appt:
         raise HTTPException(status_code=404, detail="Consulta não encontrada")
     if not _can_manage(appt, current_user):
         raise HTTPException(status_code=403, detail="Sem permissão")
+    freed = appt.status != "CANCELLED"
     appt.status = "CANCELLED"
+    bump_calendar_version(db, [appt.professional_id])
     db.commit()
     db.refresh(appt)
+    _publish("status", appt)
+    if freed:
+        # lista de espera roda depois da resposta, sem atrasar o cancelamento
+        background_tasks.add_task(fill_slot, appt.professional_id, appt.date)
     return appt
 
 
 @router.post("/{appointment_id}/complete", response_model=AppointmentOut)
-def complete(appointment_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def complete(appointment_id: int, db: Session = Depends(get_db), current_user: Principal = Depends(get_principal)):
     appt = db.get(Appointment, appointment_id)
     if not appt:
         raise HTTPException(status_code=404, detail="Consulta não encontrada")
     if not _can_manage(appt, current_user):
         raise HTTPException(status_code=403, detail="Sem permissão")
     appt.status = "COMPLETED"
+    bump_calendar_version(db, [appt.professional_id])
     db.commit()
     db.refresh(appt)
+    _publish("status", appt)
     return appt
 
 
@@ -275,13 +890,16 @@ def complete(appointment_id: int, db: Session = Depends(get_db), current_user: U
 def delete_appointment(
     appointment_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_principal),
 ):
     appt = db.get(Appointment, appointment_id)
     if not appt:
         return
     if not _can_manage(appt, current_user):
         raise HTTPException(status_code=403, detail="Sem permissão")
+    data = AppointmentOut.model_validate(appt).model_dump(mode="json")
     db.delete(appt)
+    bump_calendar_version(db, [appt.professional_id])
     db.commit()
+    _publish("deleted", data)
 
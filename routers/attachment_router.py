@@ -0,0 +1,230 @@
+# routers/attachment_router.py
+
+import re
+from typing import Optional
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from database import get_db, get_read_db
+from auth.auth_utils import require_role
+from models.attachment import Attachment, AttachmentUpload
+from models.record import Record
+from schemas.attachment import UploadCreate, UploadOut, AttachmentOut
+from services.records.attachments import (
+    ChunkError,
+    RangeNotSatisfiable,
+    blob_path,
+    finalize_upload,
+    iter_file_range,
+    parse_range,
+    upload_lock,
+    write_chunk,
+)
+
+router = APIRouter(prefix="/patients", tags=["Attachments"])
+
+_CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+_ASCII_UNSAFE_RE = re.compile(r'[^A-Za-z0-9._ -]')
+
+
+# ---------------------------
+# Helpers
+# ---------------------------
+
+def _get_record_or_404(db: Session, patient_id: int, record_id: int) -> Record:
+    rec = db.query(Record).filter(Record.id == record_id, Record.patient_id == patient_id).first()
+    if not rec:
+        raise HTTPException(status_code=404, detail="Prontuário não encontrado")
+    return rec
+
+
+def _get_upload_or_404(db: Session, patient_id: int, record_id: int, upload_id: int) -> AttachmentUpload:
+    _get_record_or_404(db, patient_id, record_id)
+    upload = db.get(AttachmentUpload, upload_id)
+    if not upload or upload.record_id != record_id:
+        raise HTTPException(status_code=404, detail="Upload não encontrado")
+    return upload
+
+
+def _save_offset(db: Session, upload: AttachmentUpload, start: int, received: int) -> bool:
+    """Avança o offset só se ainda for `start` (outro processo pode ter gravado antes)."""
+    updated = (
+        db.query(AttachmentUpload)
+        .filter(AttachmentUpload.id == upload.id, AttachmentUpload.received == start)
+        .update({AttachmentUpload.received: received}, synchronize_session=False)
+    )
+    db.commit()
+    db.refresh(upload)  # aqui no threadpool, e não na serialização da resposta
+    return updated == 1
+
+
+# ---------------------------
+# UPLOAD (em partes, retomável)
+# ---------------------------
+
+@router.post(
+    "/{patient_id}/records/{record_id}/attachments/uploads",
+    response_model=UploadOut,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_upload(
+    patient_id: int,
+    record_id: int,
+    payload: UploadCreate,
+    db: Session = Depends(get_db),
+    _user=Depends(require_role(["doctor"])),
+):
+    """
+    Abre um upload. Envie o conteúdo com PUT .../uploads/{id} (um ou mais pedaços, com
+    Content-Range: bytes início-fim/total) e conclua com POST .../uploads/{id}/complete.
+    """
+    _get_record_or_404(db, patient_id, record_id)
+    if payload.size > settings.ATTACHMENT_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Arquivo maior que o permitido.")
+    upload = AttachmentUpload(**payload.model_dump(), record_id=record_id, received=0, created_by=_user.id)
+    db.add(upload)
+    db.commit()
+    db.refresh(upload)
+    return upload
+
+
+@router.get("/{patient_id}/records/{record_id}/attachments/uploads/{upload_id}", response_model=UploadOut)
+def get_upload(
+    patient_id: int,
+    record_id: int,
+    upload_id: int,
+    db: Session = Depends(get_db),
+    _user=Depends(require_role(["doctor"])),
+):
+    """Estado do upload; `received` é o offset de onde retomar."""
+    return _get_upload_or_404(db, patient_id, record_id, upload_id)
+
+
+@router.put("/{patient_id}/records/{record_id}/attachments/uploads/{upload_id}", response_model=UploadOut)
+async def put_upload_chunk(
+    patient_id: int,
+    record_id: int,
+    upload_id: int,
+    request: Request,
+    content_range: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    _user=Depends(require_role(["doctor"])),
+):
+    """
+    Recebe um pedaço em streaming direto para o disco. Sem Content-Range, o corpo é
+    anexado no offset atual. Offset diferente do esperado -> 409 (consulte GET e retome).
+    """
+    async with upload_lock(upload_id):
+        # lido já com o lock: o offset conferido é o do último PUT concluído
+        upload = await run_in_threadpool(_get_upload_or_404, db, patient_id, record_id, upload_id)
+        if upload.attachment_id is not None:
+            raise HTTPException(status_code=409, detail="Upload já concluído.")
+
+        start, length = upload.received, None
+        if content_range is not None:
+            m = _CONTENT_RANGE_RE.match(content_range.strip())
+            if not m or int(m.group(3)) != upload.size or int(m.group(2)) < int(m.group(1)):
+                raise HTTPException(status_code=400, detail="Content-Range inválido para este upload.")
+            start, length = int(m.group(1)), int(m.group(2)) - int(m.group(1)) + 1
+
+        try:
+            received = await write_chunk(upload, start, request.stream(), length)
+        except ChunkError as exc:
+            status_code = 409 if start != upload.received else 400
+            raise HTTPException(status_code=status_code, detail=str(exc))
+
+        if not await run_in_threadpool(_save_offset, db, upload, start, received):
+            raise HTTPException(status_code=409, detail=f"Offset esperado: {upload.received}")
+    return upload
+
+
+@router.post(
+    "/{patient_id}/records/{record_id}/attachments/uploads/{upload_id}/complete",
+    response_model=AttachmentOut,
+    status_code=status.HTTP_201_CREATED,
+)
+def complete_upload(
+    patient_id: int,
+    record_id: int,
+    upload_id: int,
+    db: Session = Depends(get_db),
+    _user=Depends(require_role(["doctor"])),
+):
+    """Confere o tamanho, calcula o sha256 e publica o anexo (reaproveita blob idêntico)."""
+    upload = _get_upload_or_404(db, patient_id, record_id, upload_id)
+    if upload.attachment_id is not None:
+        return db.get(Attachment, upload.attachment_id)
+    if upload.received != upload.size:
+        raise HTTPException(status_code=409, detail=f"Upload incompleto: {upload.received} de {upload.size} bytes.")
+
+    attachment = finalize_upload(db, upload, _user.id)
+    db.commit()
+    db.refresh(attachment)
+    return attachment
+
+
+# ---------------------------
+# LIST / DOWNLOAD
+# ---------------------------
+
+@router.get("/{patient_id}/records/{record_id}/attachments", response_model=list[AttachmentOut])
+def list_attachments(
+    patient_id: int,
+    record_id: int,
+    db: Session = Depends(get_read_db),
+    _user=Depends(require_role(["doctor", "admin"])),
+):
+    _get_record_or_404(db, patient_id, record_id)
+    return db.query(Attachment).filter(Attachment.record_id == record_id).order_by(Attachment.id).all()
+
+
+@router.get("/{patient_id}/records/{record_id}/attachments/{attachment_id}")
+def download_attachment(
+    patient_id: int,
+    record_id: int,
+    attachment_id: int,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    db: Session = Depends(get_db),
+    _user=Depends(require_role(["doctor", "admin"])),
+):
+    """Download em streaming; aceita `Range: bytes=início-fim` (206) para retomada/seek."""
+    _get_record_or_404(db, patient_id, record_id)
+    att = db.get(Attachment, attachment_id)
+    if not att or att.record_id != record_id:
+        raise HTTPException(status_code=404, detail="Anexo não encontrado")
+
+    path = blob_path(att.sha256)
+    if not path.is_file():
+        raise HTTPException(status_code=410, detail="Conteúdo do anexo indisponível.")
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": f'"{att.sha256}"',
+        "Content-Disposition": (
+            f'attachment; filename="{_ASCII_UNSAFE_RE.sub("_", att.filename)}"; '
+            f"filename*=UTF-8''{quote(att.filename)}"
+        ),
+    }
+    try:
+        byte_range = parse_range(range_header, att.size)
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{att.size}"})
+
+    start, end = byte_range or (0, att.size - 1)
+    headers["Content-Length"] = str(end - start + 1)
+    status_code = 200
+    if byte_range is not None:
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{att.size}"
+
+    return StreamingResponse(
+        iter_file_range(path, start, end),
+        status_code=status_code,
+        media_type=att.content_type,
+        headers=headers,
+    )
@@ -1,17 +1,23 @@
 # routers/auth_router.py
 
-from typing import Annotated, Literal
+from typing import Annotated, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel, EmailStr, Field
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from database import get_db
 from models.user import User
 from core.config import settings
 from auth.jwt_handler import create_access_token
 from auth.auth_utils import get_current_user  # retorna User a partir do token
+from auth.passwords import PasswordPoolBusy, verify_password
+from auth.throttle import login_throttle
+from auth.sessions import create_session, rotate_session, revoke_session, revoke_all_sessions
+from auth.revocation import forget_user
+from auth.user_cache import invalidate_user
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
@@ -29,6 +35,12 @@ class TokenResponse(BaseModel):
     expires_in: int = settings.ACCESS_TOKEN_EXPIRE_MINUTES
     user_id: int
     role: str
+    refresh_token: Optional[str] = None
+    refresh_expires_in: int = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60  # minutos
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str = Field(min_length=16, max_length=128)
 
 
 class UserOut(BaseModel):
@@ -43,71 +55,140 @@ class UserOut(BaseModel):
 
 # ======== HELPERS ========
 
-def _verify_password(plain: str, hashed: str) -> bool:
-    try:
-        return settings.pwd_context.verify(plain, hashed)
-    except Exception:
-        return False
-
-
 def _normalize_email(email: str) -> str:
     return (email or "").strip().lower()
 
 
-# ======== ROUTES ========
-
-@router.post("/login", response_model=TokenResponse)
-def login(data: LoginRequest, db: Session = Depends(get_db)) -> TokenResponse:
+def _find_user(db: Session, email: str):
     """
-    Autentica por e-mail/senha (JSON) e retorna um JWT.
-    Token inclui claims úteis: uid, role.
+    Busca o usuário e devolve a conexão ao pool antes do bcrypt: segurá-la durante a
+    verificação esgota o pool numa rajada de logins. O objeto sai da sessão já carregado.
     """
-    email = _normalize_email(data.email)
     user = db.query(User).filter(User.email == email).first()
+    if user is not None:
+        db.expunge(user)
+    db.rollback()
+    return user
+
+
+def _client_ip(request: Request) -> str:
+    if settings.LOGIN_THROTTLE_TRUST_FORWARDED:
+        forwarded = request.headers.get("X-Forwarded-For", "")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "-"
 
-    if not user or not _verify_password(data.password, user.password):
+
+async def _authenticate(request: Request, db: Session, email: str, password: str) -> User:
+    """
+    Endpoints de login são async: a consulta vai para o threadpool e o bcrypt para o
+    pool de processos (auth/passwords.py), sem prender thread durante a verificação.
+    O limite de tentativas (auth/throttle.py) vem antes de tudo isso.
+    """
+    # threadpool: no backend sqlite a reserva pode esperar o lock de escrita
+    held = await run_in_threadpool(login_throttle.acquire, _client_ip(request), email)
+    if held is None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Muitas tentativas de login; aguarde e tente novamente.",
+            headers={"Retry-After": str(login_throttle.retry_after)},
+        )
+    try:
+        user = await run_in_threadpool(_find_user, db, email)
+        ok = user is not None and await verify_password(password, user.password)
+    except PasswordPoolBusy:
+        login_throttle.release(held)  # recusa por carga não é falha de credencial
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Muitos logins simultâneos; tente novamente em instantes.",
+            headers={"Retry-After": "1"},
+        )
+    except BaseException:
+        login_throttle.release(held)
+        raise
+    if not ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciais inválidas"
         )
+    await run_in_threadpool(login_throttle.release, held)  # só falhas contam
+    return user
+
 
+def _issue_tokens(db: Session, user: User, refresh_token: Optional[str] = None) -> TokenResponse:
+    """Access token com claims atuais do usuário; sem refresh_token, abre uma sessão nova."""
+    if refresh_token is None:
+        refresh_token = create_session(db, user.id)
+        db.commit()
     token = create_access_token(
         sub=user.email,
-        extra={"uid": user.id, "role": user.role},
+        extra={"uid": user.id, "role": user.role, "ver": user.token_version or 0},
     )
-
     return TokenResponse(
         access_token=token,
         user_id=user.id,
         role=user.role,
+        refresh_token=refresh_token,
     )
 
 
+# ======== ROUTES ========
+
+@router.post("/login", response_model=TokenResponse)
+async def login(request: Request, data: LoginRequest, db: Session = Depends(get_db)) -> TokenResponse:
+    """
+    Autentica por e-mail/senha (JSON) e retorna um JWT.
+    Token inclui claims úteis: uid, role e ver (versão dos tokens do usuário).
+    """
+    user = await _authenticate(request, db, _normalize_email(data.email), data.password)
+    return await run_in_threadpool(_issue_tokens, db, user)
+
+
 @router.post("/token", response_model=TokenResponse)
-def token(form: Annotated[OAuth2PasswordRequestForm, Depends()], db: Session = Depends(get_db)) -> TokenResponse:
+async def token(
+    request: Request,
+    form: Annotated[OAuth2PasswordRequestForm, Depends()],
+    db: Session = Depends(get_db),
+) -> TokenResponse:
     """
     Fluxo OAuth2 Password (usado pelo cadeado do Swagger).
     Recebe username/password como form-data e retorna JWT.
     """
-    email = _normalize_email(form.username)
-    user = db.query(User).filter(User.email == email).first()
+    user = await _authenticate(request, db, _normalize_email(form.username), form.password)
+    return await run_in_threadpool(_issue_tokens, db, user)
+
 
-    if not user or not _verify_password(form.password, user.password):
+@router.post("/refresh", response_model=TokenResponse)
+def refresh(data: RefreshRequest, db: Session = Depends(get_db)) -> TokenResponse:
+    """
+    Troca o refresh token por um novo par (rotação): o token enviado deixa de valer.
+    Sem senha/bcrypt; papel e versão vêm do banco, então mudanças de papel valem aqui.
+    """
+    rotated = rotate_session(db, data.refresh_token)
+    if rotated is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Credenciais inválidas"
+            detail="Refresh token inválido ou expirado"
         )
+    user, new_refresh = rotated
+    return _issue_tokens(db, user, refresh_token=new_refresh)
 
-    token = create_access_token(
-        sub=user.email,
-        extra={"uid": user.id, "role": user.role},
-    )
 
-    return TokenResponse(
-        access_token=token,
-        user_id=user.id,
-        role=user.role,
-    )
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(data: RefreshRequest, db: Session = Depends(get_db)):
+    """Encerra a sessão do refresh token (o access token atual vale até expirar)."""
+    revoke_session(db, data.refresh_token)
+    return None
+
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+def logout_all(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Encerra todas as sessões do usuário e invalida os access tokens já emitidos."""
+    revoke_all_sessions(db, current_user)
+    db.commit()
+    invalidate_user(current_user.email)
+    forget_user(current_user.id)
+    return None
 
 
 @router.get("/me", response_model=UserOut)
@@ -0,0 +1,88 @@
+# routers/export_router.py
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from database import get_db
+from auth.auth_utils import require_role
+from models.export_job import ExportJob
+from models.patient import Patient
+from models.user import User
+from schemas.export import ExportCreate, ExportJobOut
+from services.patients.export import export_path, run_export
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+
+# ---------------------------
+# Helpers
+# ---------------------------
+
+def _get_or_404(db: Session, job_id: int) -> ExportJob:
+    job = db.get(ExportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Exportação não encontrada")
+    return job
+
+
+# ---------------------------
+# CREATE
+# ---------------------------
+
+@router.post("/", response_model=ExportJobOut, status_code=status.HTTP_202_ACCEPTED)
+def create_export(
+    payload: ExportCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    _user: User = Depends(require_role(["admin"])),
+):
+    """
+    Agenda a exportação (LGPD) de um ou mais pacientes. Acompanhe em GET /exports/{id}
+    e baixe em GET /exports/{id}/download quando status = DONE.
+    """
+    patient_ids = list(dict.fromkeys(payload.patient_ids))  # sem repetidos, mantendo a ordem
+    if len(patient_ids) > settings.EXPORT_MAX_PATIENTS:
+        raise HTTPException(status_code=400, detail=f"Máximo de {settings.EXPORT_MAX_PATIENTS} pacientes por exportação.")
+
+    found = db.query(func.count(Patient.id)).filter(Patient.id.in_(patient_ids)).scalar()
+    if found != len(patient_ids):
+        raise HTTPException(status_code=404, detail="Paciente não encontrado")
+
+    job = ExportJob(requested_by=_user.id, patient_ids=patient_ids, status="PENDING")
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    background_tasks.add_task(run_export, job.id)
+    return job
+
+
+# ---------------------------
+# STATUS / DOWNLOAD
+# ---------------------------
+
+@router.get("/{job_id}", response_model=ExportJobOut)
+def get_export(
+    job_id: int,
+    db: Session = Depends(get_db),
+    _user: User = Depends(require_role(["admin"])),
+):
+    return _get_or_404(db, job_id)
+
+
+@router.get("/{job_id}/download")
+def download_export(
+    job_id: int,
+    db: Session = Depends(get_db),
+    _user: User = Depends(require_role(["admin"])),
+):
+    job = _get_or_404(db, job_id)
+    if job.status != "DONE":
+        raise HTTPException(status_code=409, detail=f"Exportação ainda não disponível (status {job.status}).")
+    path = export_path(job)
+    if path is None or not path.is_file():
+        raise HTTPException(status_code=410, detail="Arquivo da exportação não está mais disponível.")
+    # FileResponse lê do disco em blocos: o zip não passa inteiro pela memória
+    return FileResponse(path, media_type="application/zip", filename=f"sghss_export_{job.id}.zip")
@@ -3,16 +3,17 @@
 from typing import Optional, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
+from sqlalchemy import func, case, select
+from sqlalchemy.exc import IntegrityError
 
-from database import get_db
+from database import get_async_db, get_async_read_db, get_db
 from models.item import Item
 from models.stock_movement import StockMovement
 from schemas.item import ItemCreate, ItemUpdate, ItemOut
 from schemas.common import Page
-from auth.auth_utils import get_current_user
-from models.user import User
+from auth.auth_utils import get_principal, Principal
 
 router = APIRouter(prefix="/items", tags=["items"])
 
@@ -34,7 +35,7 @@ def _balance_expr():
 def create_item(
     payload: ItemCreate,
     db: Session = Depends(get_db),
-    _user: User = Depends(get_current_user),
+    _user: Principal = Depends(get_principal),
 ) -> ItemOut:
     exists = db.query(Item).filter(func.lower(Item.name) == func.lower(payload.name)).first()
     if exists:
@@ -48,20 +49,20 @@ def create_item(
 
 # ---------- LIST ----------
 @router.get("", response_model=Page[ItemOut])
-def list_items(
-    db: Session = Depends(get_db),
-    _user: User = Depends(get_current_user),
+async def list_items(
+    db: AsyncSession = Depends(get_async_read_db),
+    _user: Principal = Depends(get_principal),
     q: Optional[str] = Query(None, description="Busca por nome/categoria (contém)"),
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=100),
     order: Literal["name_asc", "name_desc", "id_desc", "id_asc"] = "name_asc",
 ) -> Page[ItemOut]:
-    query = db.query(Item)
+    query = select(Item)
     if q:
         like = f"%{q.strip()}%"
         query = query.filter((Item.name.ilike(like)) | (Item.category.ilike(like)))
 
-    total = query.count()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
 
     if order == "name_asc":
         query = query.order_by(Item.name.asc())
@@ -72,18 +73,18 @@ def list_items(
     else:
         query = query.order_by(Item.id.asc())
 
-    items = query.offset((page - 1) * size).limit(size).all()
+    items = (await db.scalars(query.offset((page - 1) * size).limit(size))).all()
     return Page[ItemOut](items=items, page=page, size=size, total=total)
 
 
 # ---------- READ ----------
 @router.get("/{item_id}", response_model=ItemOut)
-def get_item(
+async def get_item(
     item_id: int,
-    db: Session = Depends(get_db),
-    _user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    _user: Principal = Depends(get_principal),
 ) -> ItemOut:
-    item = db.get(Item, item_id)
+    item = await db.get(Item, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item não encontrado.")
     return item
@@ -95,7 +96,7 @@ def update_item(
     item_id: int,
     payload: ItemUpdate,
     db: Session = Depends(get_db),
-    _user: User = Depends(get_current_user),
+    _user: Principal = Depends(get_principal),
 ) -> ItemOut:
     item = db.get(Item, item_id)
     if not item:
@@ -125,30 +126,32 @@ def update_item(
 def delete_item(
     item_id: int,
     db: Session = Depends(get_db),
-    _user: User = Depends(get_current_user),
+    _user: Principal = Depends(get_principal),
 ):
     item = db.get(Item, item_id)
     if not item:
         return
     db.delete(item)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Item possui movimentações de estoque.")
 
 
 # ---------- BALANCE ----------
 @router.get("/{item_id}/balance")
-def get_item_balance(
+async def get_item_balance(
     item_id: int,
-    db: Session = Depends(get_db),
-    _user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+    _user: Principal = Depends(get_principal),
 ) -> dict:
-    item = db.get(Item, item_id)
+    item = await db.get(Item, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item não encontrado.")
 
     balance = (
-        db.query(_balance_expr())
-        .filter(StockMovement.item_id == item_id)
-        .scalar()
+        await db.scalar(select(_balance_expr()).filter(StockMovement.item_id == item_id))
     ) or 0
 
     return {
@@ -159,4 +162,3 @@ def get_item_balance(
         "min_stock": item.min_stock,
         "below_min_stock": balance < item.min_stock,
     }
-
@@ -0,0 +1,40 @@
+# routers/metrics_router.py
+
+from fastapi import APIRouter, Depends
+
+from auth.auth_utils import require_role
+from auth.jwt_handler import token_cache
+from auth.user_cache import user_cache
+from auth.revocation import token_versions
+from auth.passwords import password_pool
+from auth.throttle import login_throttle
+from database import pool_monitors, read_routing_stats
+from models.user import User
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+# Contadores em memória: valem para este processo (cada worker tem os seus)
+
+@router.get("/auth")
+def auth_metrics(
+    _current_admin: User = Depends(require_role(["admin"])),
+):
+    return {
+        "jwt_cache": token_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "token_versions": token_versions.stats(),
+        "password_pool": password_pool.stats(),
+        "login_throttle": login_throttle.stats(),
+    }
+
+
+@router.get("/db")
+def db_metrics(
+    _current_admin: User = Depends(require_role(["admin"])),
+):
+    """Pool de conexões por engine: em uso, overflow, espera por conexão e checkouts longos."""
+    return {
+        "pools": {name: monitor.stats() for name, monitor in pool_monitors.items()},
+        "read_routing": read_routing_stats(),
+    }
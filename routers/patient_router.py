@@ -3,14 +3,20 @@
 from typing import Optional, Literal
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from database import get_db
+from database import get_async_db, get_async_read_db, get_db, get_read_db
 from models.patient import Patient
+from models.record import Record
 from models.user import User
-from auth.auth_utils import get_current_user, require_role
-from schemas.patient import PatientCreate, PatientUpdate, PatientOut
+from auth.auth_utils import get_principal, require_role, Principal
+from schemas.patient import PatientCreate, PatientUpdate, PatientOut, TimelineEvent
+from services.patients.timeline import KINDS, timeline_page
+from core.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor, parse_cursor_datetime
 
 router = APIRouter(prefix="/patients", tags=["Patients"])
 
@@ -39,7 +45,7 @@ def _get_or_404(db: Session, patient_id: int) -> Patient:
 def create_patient(
     payload: PatientCreate,
     db: Session = Depends(get_db),
-    _user: User = Depends(get_current_user),  # qualquer autenticado pode criar
+    _user: Principal = Depends(get_principal),  # qualquer autenticado pode criar
 ):
     cpf_digits = _only_digits(payload.cpf) if payload.cpf else None
 
@@ -65,9 +71,9 @@ def create_patient(
 # ---------------------------
 
 @router.get("/", response_model=list[PatientOut])
-def list_patients(
-    db: Session = Depends(get_db),
-    _user: User = Depends(get_current_user),
+async def list_patients(
+    db: AsyncSession = Depends(get_async_read_db),
+    _user: Principal = Depends(get_principal),
     name_like: Optional[str] = Query(None, description="Filtro por nome (contém)"),
     cpf_like: Optional[str] = Query(None, min_length=3, description="Filtro por CPF (contém)"),
     birth_from: Optional[date] = Query(None, description="Data de nascimento inicial"),
@@ -76,7 +82,7 @@ def list_patients(
     offset: int = Query(0, ge=0),
     sort: Literal["id_asc", "id_desc", "name_asc", "name_desc", "birth_asc", "birth_desc"] = "id_asc",
 ):
-    q = db.query(Patient)
+    q = select(Patient)
 
     if name_like:
         like = f"%{name_like.strip()}%"
@@ -104,7 +110,7 @@ def list_patients(
     else:
         q = q.order_by(Patient.id.asc())
 
-    return q.offset(offset).limit(limit).all()
+    return (await db.scalars(q.offset(offset).limit(limit))).all()
 
 
 # ---------------------------
@@ -112,12 +118,54 @@ def list_patients(
 # ---------------------------
 
 @router.get("/{patient_id}", response_model=PatientOut)
-def get_patient(
+async def get_patient(
     patient_id: int,
-    db: Session = Depends(get_db),
-    _user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    _user: Principal = Depends(get_principal),
 ):
-    return _get_or_404(db, patient_id)
+    obj = await db.get(Patient, patient_id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="Paciente não encontrado")
+    return obj
+
+
+# ---------------------------
+# LINHA DO TEMPO
+# ---------------------------
+
+@router.get("/{patient_id}/timeline", response_model=list[TimelineEvent])
+def get_timeline(
+    patient_id: int,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    _user: User = Depends(require_role(["doctor", "admin"])),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Cursor do header X-Next-Cursor"),
+    order: Literal["asc", "desc"] = "desc",
+    kinds: Optional[list[Literal["appointment", "record", "dispense"]]] = Query(None),
+):
+    """
+    Consultas, prontuários e dispensações do paciente num feed único, ordenado por
+    (at, kind, id) e paginado por cursor (header X-Next-Cursor).
+    """
+    _get_or_404(db, patient_id)
+
+    parsed = None
+    if cursor is not None:
+        cur_order, at, kind, last_id = decode_cursor(cursor, 4)
+        if cur_order != order or kind not in KINDS or not isinstance(last_id, int):
+            raise HTTPException(status_code=400, detail="Cursor inválido para esta ordenação.")
+        parsed = (parse_cursor_datetime(at), kind, last_id)
+
+    events = timeline_page(db, patient_id, limit, parsed, order == "asc", kinds or KINDS)
+    if len(events) == limit:
+        at, kind, obj = events[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(order, at, kind, obj.id)
+
+    return [
+        TimelineEvent.model_validate({"at": at, "kind": kind, "id": obj.id, kind: obj}, from_attributes=True)
+        for at, kind, obj in events
+    ]
 
 
 # ---------------------------
@@ -129,7 +177,7 @@ def update_patient(
     patient_id: int,
     payload: PatientUpdate,
     db: Session = Depends(get_db),
-    _user: User = Depends(get_current_user),
+    _user: Principal = Depends(get_principal),
 ):
     p = _get_or_404(db, patient_id)
 
@@ -160,6 +208,12 @@ def update_patient(
 # ---------------------------
 # DELETE (admin-only)
 # ---------------------------
+# Guarda do prontuário: paciente com prontuário não é excluído. O histórico de versões e os
+# anexos são append-only (FKs RESTRICT) e o prontuário precisa ser mantido mesmo após o fim
+# do atendimento. Consultas e lista de espera saem junto com o paciente.
+
+_HAS_RECORDS_DETAIL = "Paciente possui prontuários (com histórico e anexos) e não pode ser excluído."
+
 
 @router.delete("/{patient_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_patient(
@@ -168,7 +222,13 @@ def delete_patient(
     _admin: User = Depends(require_role(["admin","medico(a)","enfermeiro(a)"])),
 ):
     p = _get_or_404(db, patient_id)
+    if db.query(Record.id).filter(Record.patient_id == patient_id).first() is not None:
+        raise HTTPException(status_code=409, detail=_HAS_RECORDS_DETAIL)
     db.delete(p)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:  # prontuário criado entre a checagem e o commit (FKs RESTRICT)
+        db.rollback()
+        raise HTTPException(status_code=409, detail=_HAS_RECORDS_DETAIL)
     return None
 
@@ -1,19 +1,54 @@
 # routers/record_router.py
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database import get_db
-from models.record import Record
+import re
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, load_only
+from database import get_db, get_read_db, read_engine, SessionLocal
+from models.record import Record, RECORDS_FTS_TABLE
 from models.patient import Patient
-from schemas.record import RecordCreate, RecordOut
+from schemas.record import (
+    RecordCreate,
+    RecordUpdate,
+    RecordOut,
+    RecordSummaryOut,
+    RecordSearchHit,
+    RecordVersionOut,
+    RecordVersionDetail,
+)
+from schemas.common import Page
 from datetime import datetime, timezone
 from auth.auth_utils import require_role
+from services.records.versioning import (
+    VersionConflict,
+    amend_record,
+    get_version,
+    list_versions,
+    notes_at,
+)
+from core.pagination import (
+    NEXT_CURSOR_HEADER,
+    encode_cursor,
+    decode_cursor,
+    parse_cursor_datetime,
+    keyset_after,
+)
 
 router = APIRouter(
     prefix="/patients",
     tags=["Records"]
 )
 
+# Busca transversal (todos os pacientes ou um só): /records/search
+search_router = APIRouter(
+    prefix="/records",
+    tags=["Records"]
+)
+
 # Somente doctor pode criar prontuários
 @router.post("/{patient_id}/records", response_model=RecordOut)
 def create_record(
@@ -28,6 +63,7 @@ def create_record(
 
     db_record = Record(
         patient_id=patient_id,
+        professional_id=_user.id,
         notes=record.notes,
         created_at=datetime.now(timezone.utc)
     )
@@ -36,14 +72,211 @@ def create_record(
     db.refresh(db_record)
     return db_record
 
+
+def _records_query(db: Session, patient_id: int, order: str, cursor: Optional[str], summary: bool):
+    q = db.query(Record).filter(Record.patient_id == patient_id)
+    if summary:
+        q = q.options(load_only(Record.id, Record.patient_id, Record.professional_id, Record.created_at))
+
+    ascending = order == "asc"
+    if cursor is not None:
+        cur_order, value, last_id = decode_cursor(cursor, 3)
+        if cur_order != order or not isinstance(last_id, int):
+            raise HTTPException(status_code=400, detail="Cursor inválido para esta ordenação.")
+        q = q.filter(keyset_after(Record.created_at, Record.id, parse_cursor_datetime(value), last_id, ascending))
+
+    if ascending:
+        return q.order_by(Record.created_at.asc(), Record.id.asc())
+    return q.order_by(Record.created_at.desc(), Record.id.desc())
+
+
+def _ndjson_stream(bind: Engine, patient_id: int, order: str, cursor: Optional[str], summary: bool):
+    out = RecordSummaryOut if summary else RecordOut
+
+    def stream():
+        # sessão própria (mesma escolha de réplica de get_read_db): a da dependência pode ser
+        # fechada antes do fim do streaming
+        db = SessionLocal(bind=bind)
+        try:
+            for rec in _records_query(db, patient_id, order, cursor, summary).yield_per(500):
+                yield out.model_validate(rec).model_dump_json() + "\n"
+        finally:
+            db.close()
+
+    return stream()
+
+
 # Aqui pode ficar acessível para perfis com acesso clínico
-@router.get("/{patient_id}/records", response_model=list[RecordOut])
+@router.get("/{patient_id}/records", response_model=list[RecordOut | RecordSummaryOut])
 def get_records(
     patient_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    _user=Depends(require_role(["doctor", "admin"])),  # <- ajustado
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Cursor do header X-Next-Cursor"),
+    order: Literal["asc", "desc"] = "asc",
+    fields: Literal["full", "summary"] = Query("full", description="summary omite o corpo de notes"),
+    format: Literal["json", "ndjson"] = Query("json", description="ndjson exporta o prontuário inteiro em streaming"),
+):
+    """
+    Prontuário paginado por keyset em (created_at, id) usando ix_records_patient_created_at.
+    format=ndjson ignora `limit` e transmite tudo (a partir do cursor, se houver), uma linha por registro.
+    """
+    summary = fields == "summary"
+
+    if format == "ndjson":
+        # valida o cursor antes de começar a transmitir
+        if cursor is not None:
+            _records_query(db, patient_id, order, cursor, summary)
+        return StreamingResponse(
+            _ndjson_stream(read_engine(request), patient_id, order, cursor, summary),
+            media_type="application/x-ndjson",
+        )
+
+    records = _records_query(db, patient_id, order, cursor, summary).limit(limit).all()
+    if len(records) == limit:
+        last = records[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(order, last.created_at, last.id)
+
+    out = RecordSummaryOut if summary else RecordOut
+    return [out.model_validate(r) for r in records]
+
+
+# ---------------------------
+# Emendas e histórico de versões
+# ---------------------------
+
+def _get_record_or_404(db: Session, patient_id: int, record_id: int) -> Record:
+    rec = db.query(Record).filter(Record.id == record_id, Record.patient_id == patient_id).first()
+    if not rec:
+        raise HTTPException(status_code=404, detail="Prontuário não encontrado")
+    return rec
+
+
+@router.patch("/{patient_id}/records/{record_id}", response_model=RecordOut)
+def amend_record_endpoint(
+    patient_id: int,
+    record_id: int,
+    payload: RecordUpdate,
+    db: Session = Depends(get_db),
+    _user=Depends(require_role(["doctor"])),
+):
+    """
+    Emenda o prontuário: a versão anterior é preservada no histórico (append-only).
+    Envie `version` (a que foi lida) para detectar edição concorrente -> 409.
+    """
+    rec = _get_record_or_404(db, patient_id, record_id)
+    if payload.notes is None:
+        return rec
+    try:
+        amend_record(db, rec, payload.notes, _user.id, payload.reason, payload.version)
+    except VersionConflict:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Prontuário alterado por outra emenda; recarregue e tente novamente.")
+    db.commit()
+    db.refresh(rec)
+    return rec
+
+
+@router.get("/{patient_id}/records/{record_id}/versions", response_model=list[RecordVersionOut])
+def get_record_versions(
+    patient_id: int,
+    record_id: int,
     db: Session = Depends(get_db),
-    _user=Depends(require_role(["doctor", "admin"]))  # <- ajustado
+    _user=Depends(require_role(["doctor", "admin"])),
 ):
-    records = db.query(Record).filter(Record.patient_id == patient_id).all()
-    return records
+    """Histórico de emendas (mais recente primeiro), sem o texto."""
+    rec = _get_record_or_404(db, patient_id, record_id)
+    return list_versions(db, rec)
 
 
+@router.get("/{patient_id}/records/{record_id}/versions/{version}", response_model=RecordVersionDetail)
+def get_record_version(
+    patient_id: int,
+    record_id: int,
+    version: int,
+    db: Session = Depends(get_db),
+    _user=Depends(require_role(["doctor", "admin"])),
+):
+    """Texto do prontuário como estava na versão pedida."""
+    rec = _get_record_or_404(db, patient_id, record_id)
+    entry = get_version(db, rec, version)
+    notes = notes_at(db, rec, version)
+    if entry is None or notes is None:
+        raise HTTPException(status_code=404, detail="Versão não encontrada")
+    return RecordVersionDetail(
+        version=entry.version,
+        kind=entry.kind,
+        professional_id=entry.professional_id,
+        reason=entry.reason,
+        created_at=entry.created_at,
+        notes=notes,
+    )
+
+
+# ---------------------------
+# Busca textual em notes (FTS5)
+# ---------------------------
+
+_TOKEN_RE = re.compile(r"\w+\*?", re.UNICODE)
+_MARK_OPEN, _MARK_CLOSE = "<mark>", "</mark>"
+
+
+def _fts_query(q: str) -> str:
+    """
+    Converte a busca livre em expressão FTS5 segura: cada termo vira uma frase entre aspas
+    (sem operadores vindos do usuário) e todos são exigidos (AND). "insul*" busca por prefixo.
+    """
+    terms = []
+    for tok in _TOKEN_RE.findall(q):
+        word = tok.rstrip("*")
+        if word:
+            terms.append(f'"{word}"' + ("*" if tok.endswith("*") else ""))
+    if not terms:
+        raise HTTPException(status_code=400, detail="Busca vazia.")
+    return " ".join(terms)
+
+
+@search_router.get("/search", response_model=Page[RecordSearchHit])
+def search_records(
+    q: str = Query(..., min_length=2, max_length=200, description="Termos (prefixo com *: insul*)"),
+    patient_id: Optional[int] = None,
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    _user=Depends(require_role(["doctor", "admin"])),
+) -> Page[RecordSearchHit]:
+    """
+    Busca em prontuários por relevância (bm25), com trecho destacado.
+    Ignora acentos e caixa ("insulina" casa com "Insulína").
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        raise HTTPException(status_code=501, detail="Busca textual disponível apenas com SQLite (FTS5).")
+
+    match = _fts_query(q)
+    where = f"{RECORDS_FTS_TABLE} MATCH :match"
+    params: dict = {"match": match}
+    if patient_id is not None:
+        where += " AND r.patient_id = :patient_id"
+        params["patient_id"] = patient_id
+
+    base = f"FROM {RECORDS_FTS_TABLE} JOIN records r ON r.id = {RECORDS_FTS_TABLE}.rowid WHERE {where}"
+    total = db.execute(text(f"SELECT count(*) {base}"), params).scalar_one()
+    rows = db.execute(
+        text(
+            f"SELECT r.id, r.patient_id, r.professional_id, r.created_at, "
+            f"snippet({RECORDS_FTS_TABLE}, 0, :mark_open, :mark_close, '…', 16) AS snippet, "
+            f"bm25({RECORDS_FTS_TABLE}) AS rank "
+            f"{base} ORDER BY rank, r.id LIMIT :limit OFFSET :offset"
+        ).columns(created_at=Record.created_at.type),
+        {**params, "mark_open": _MARK_OPEN, "mark_close": _MARK_CLOSE, "limit": size, "offset": (page - 1) * size},
+    ).mappings().all()
+
+    return Page[RecordSearchHit](
+        items=[RecordSearchHit(**row) for row in rows],
+        page=page,
+        size=size,
+        total=total,
+    )
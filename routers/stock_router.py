@@ -4,15 +4,16 @@ from datetime import date, timedelta
 from typing import Optional, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
+from sqlalchemy import func, case, select
 
-from database import get_db
+from database import get_async_read_db, get_db, get_read_db
 from models.item import Item
 from models.stock_movement import StockMovement
+from models.patient import Patient
 from schemas.stock import MovementCreate, MovementOut
-from auth.auth_utils import get_current_user
-from models.user import User
+from auth.auth_utils import get_principal, Principal
 
 router = APIRouter(prefix="/stock", tags=["stock"])
 
@@ -30,12 +31,16 @@ def get_balance(db: Session, item_id: int) -> int:
     return (db.query(_balance_expr()).filter(StockMovement.item_id == item_id).scalar() or 0)
 
 
+async def get_balance_async(db: AsyncSession, item_id: int) -> int:
+    return (await db.scalar(select(_balance_expr()).filter(StockMovement.item_id == item_id))) or 0
+
+
 # ---------- MOVE ----------
 @router.post("/move", response_model=MovementOut, status_code=status.HTTP_201_CREATED)
 def move_stock(
     payload: MovementCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_principal),
 ):
     item = db.get(Item, payload.item_id)
     if not item:
@@ -44,6 +49,12 @@ def move_stock(
     if payload.type not in ("IN", "OUT"):
         raise HTTPException(status_code=400, detail="type deve ser 'IN' ou 'OUT'.")
 
+    if payload.patient_id is not None:
+        if payload.type != "OUT":
+            raise HTTPException(status_code=400, detail="patient_id só se aplica a saídas (dispensação).")
+        if not db.get(Patient, payload.patient_id):
+            raise HTTPException(status_code=404, detail="Paciente não encontrado.")
+
     if payload.type == "OUT":
         balance = get_balance(db, payload.item_id)
         if payload.quantity > balance:
@@ -64,9 +75,10 @@ def move_stock(
 # ---------- LIST ----------
 @router.get("/movements", response_model=list[MovementOut])
 def list_movements(
-    db: Session = Depends(get_db),
-    _user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    _user: Principal = Depends(get_principal),
     item_id: Optional[int] = None,
+    patient_id: Optional[int] = None,
     type: Optional[Literal["IN", "OUT"]] = Query(None),
     limit: int = Query(50, ge=1, le=500),
     offset: int = Query(0, ge=0),
@@ -74,6 +86,8 @@ def list_movements(
     q = db.query(StockMovement)
     if item_id is not None:
         q = q.filter(StockMovement.item_id == item_id)
+    if patient_id is not None:
+        q = q.filter(StockMovement.patient_id == patient_id)
     if type is not None:
         q = q.filter(StockMovement.type == type)
     return q.order_by(StockMovement.id.desc()).offset(offset).limit(limit).all()
@@ -82,8 +96,8 @@ def list_movements(
 # ---------- ALERTS ----------
 @router.get("/alerts/low")
 def low_stock_alerts(
-    db: Session = Depends(get_db),
-    _user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    _user: Principal = Depends(get_principal),
 ):
     alerts = []
     items = db.query(Item).all()
@@ -106,8 +120,8 @@ def low_stock_alerts(
 @router.get("/alerts/expiry")
 def expiry_alerts(
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
-    _user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    _user: Principal = Depends(get_principal),
 ):
     today = date.today()
     limit_date = today + timedelta(days=days)
@@ -135,14 +149,13 @@ def expiry_alerts(
 
 # ---------- QUICK BALANCE ----------
 @router.get("/balance/{item_id}")
-def quick_balance(
+async def quick_balance(
     item_id: int,
-    db: Session = Depends(get_db),
-    _user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+    _user: Principal = Depends(get_principal),
 ):
-    item = db.get(Item, item_id)
+    item = await db.get(Item, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item não encontrado.")
-    bal = get_balance(db, item_id)
+    bal = await get_balance_async(db, item_id)
     return {"item_id": item_id, "name": item.name, "balance": int(bal), "unit": item.unit}
-
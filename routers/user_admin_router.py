@@ -2,13 +2,17 @@
 from typing import Optional, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Form
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from pydantic import EmailStr
 
-from database import get_db
+from database import get_db, get_read_db
 from models.user import User
-from core.config import settings
 from auth.auth_utils import require_role
+from auth.user_cache import invalidate_user
+from auth.revocation import revoke_tokens, forget_user
+from auth.passwords import hash_password
+from auth.sessions import revoke_all_sessions
 from schemas.user_admin import (
     UserAdminCreate,
     UserAdminUpdate,
@@ -71,7 +75,7 @@ def list_roles_meta(
 
 @router.get("", response_model=list[UserAdminOut])
 def list_users(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _current_admin: User = Depends(require_role(["admin"])),
     role: Optional[RoleLiteral] = Query(None),
     email_like: Optional[str] = Query(None),
@@ -140,7 +144,7 @@ def create_user(
     user = User(
         name=payload.name.strip(),
         email=email,
-        password=settings.pwd_context.hash(payload.password),
+        password=hash_password(payload.password),
         role=payload.role,  # admin | doctor | nurse | technician
         cpf=cpf_digits,
     )
@@ -177,7 +181,7 @@ def create_user_form(
     user = User(
         name=name.strip(),
         email=email_norm,
-        password=settings.pwd_context.hash(password),
+        password=hash_password(password),
         role=role,
         cpf=cpf_digits,
     )
@@ -198,6 +202,7 @@ def update_user(
     current_admin: User = Depends(require_role(["admin"])),
 ):
     user = _get_user_or_404(db, user_id)
+    old_email = user.email
 
     if payload.email is not None:
         new_email = _normalize_email(payload.email)
@@ -235,17 +240,40 @@ def update_user(
                     status_code=400,
                     detail="Você não pode remover seu próprio papel de admin.",
                 )
+        if new_role != user.role:
+            revoke_tokens(user)  # tokens antigos carregam o papel anterior nas claims
         user.role = new_role
 
     if payload.password is not None:
         if len(payload.password) < 4:
             raise HTTPException(status_code=400, detail="Senha deve ter pelo menos 4 caracteres.")
-        user.password = settings.pwd_context.hash(payload.password)
+        user.password = hash_password(payload.password)
+        revoke_all_sessions(db, user)  # senha trocada: derruba sessões e tokens já emitidos
 
     db.commit()
+    invalidate_user(old_email, user.email)  # papel/e-mail novos valem já no próximo request
+    forget_user(user.id)
     db.refresh(user)
     return user
 
+# ---------------------------
+# REVOGAR SESSÕES
+# ---------------------------
+
+@router.delete("/{user_id}/sessions", status_code=status.HTTP_204_NO_CONTENT)
+def revoke_user_sessions(
+    user_id: int,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(require_role(["admin"])),
+):
+    """Encerra todas as sessões (refresh tokens) do usuário e invalida seus access tokens."""
+    user = _get_user_or_404(db, user_id)
+    revoke_all_sessions(db, user)
+    db.commit()
+    invalidate_user(user.email)
+    forget_user(user.id)
+    return None
+
 # ---------------------------
 # DELETE
 # ---------------------------
@@ -266,8 +294,16 @@ def delete_user(
         if admins <= 1:
             raise HTTPException(status_code=400, detail="Não é possível deletar o último admin do sistema.")
 
+    email = user.email
+    revoke_all_sessions(db, user)  # não depende de PRAGMA foreign_keys para o CASCADE
     db.delete(user)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Usuário possui consultas ou prontuários vinculados.")
+    invalidate_user(email)
+    forget_user(user_id)
     return None
 
 
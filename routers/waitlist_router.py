@@ -0,0 +1,152 @@
+# routers/waitlist_router.py
+
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from database import get_db, get_read_db
+from auth.auth_utils import get_principal, Principal
+from models.user import User
+from models.patient import Patient
+from models.waitlist import WaitlistEntry
+from schemas.waitlist import WaitlistCreate, WaitlistOut, WaitlistStatus
+from schemas.appointment import AppointmentOut
+from services.appointments.waitlist import accept_offer, decline_offer, fill_slot
+
+router = APIRouter(prefix="/waitlist", tags=["Waitlist"])
+
+
+# ---------------------------
+# Helpers
+# ---------------------------
+
+def _can_manage(professional_id: int, current_user: Principal) -> bool:
+    """Mesma regra das consultas: admin pode tudo; o profissional só mexe na própria agenda."""
+    if current_user.role == "admin":
+        return True
+    return professional_id == current_user.id
+
+
+def _get_or_404(db: Session, entry_id: int, current_user: Principal) -> WaitlistEntry:
+    entry = db.get(WaitlistEntry, entry_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Entrada da lista de espera não encontrada")
+    if not _can_manage(entry.professional_id, current_user):
+        raise HTTPException(status_code=403, detail="Sem permissão")
+    return entry
+
+
+# ---------------------------
+# CREATE
+# ---------------------------
+
+@router.post("/", response_model=WaitlistOut, status_code=status.HTTP_201_CREATED)
+def create_entry(
+    payload: WaitlistCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_principal),
+):
+    if not _can_manage(payload.professional_id, current_user):
+        raise HTTPException(status_code=403, detail="Sem permissão")
+    if not db.get(Patient, payload.patient_id):
+        raise HTTPException(status_code=404, detail="Paciente não encontrado")
+    if not db.get(User, payload.professional_id):
+        raise HTTPException(status_code=404, detail="Profissional não encontrado")
+
+    entry = WaitlistEntry(**payload.model_dump())
+    db.add(entry)
+    db.commit()
+    db.refresh(entry)
+    return entry
+
+
+# ---------------------------
+# LIST
+# ---------------------------
+
+@router.get("/", response_model=list[WaitlistOut])
+def list_entries(
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_principal),
+    professional_id: Optional[int] = None,
+    patient_id: Optional[int] = None,
+    status_filter: Optional[WaitlistStatus] = Query(None, alias="status"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+):
+    if current_user.role != "admin":
+        professional_id = current_user.id  # não-admin só vê a própria lista
+
+    q = db.query(WaitlistEntry)
+    if professional_id is not None:
+        q = q.filter(WaitlistEntry.professional_id == professional_id)
+    if patient_id is not None:
+        q = q.filter(WaitlistEntry.patient_id == patient_id)
+    if status_filter is not None:
+        q = q.filter(WaitlistEntry.status == status_filter)
+    q = q.order_by(WaitlistEntry.priority, WaitlistEntry.created_at, WaitlistEntry.id)
+    return q.offset(offset).limit(limit).all()
+
+
+# ---------------------------
+# OFERTAS (WAITLIST_AUTOFILL_MODE=offer)
+# ---------------------------
+
+@router.post("/{entry_id}/accept", response_model=AppointmentOut)
+def accept(
+    entry_id: int,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_principal),
+):
+    entry = _get_or_404(db, entry_id, current_user)
+    if entry.status != "OFFERED":
+        raise HTTPException(status_code=409, detail="Não há oferta pendente para esta entrada.")
+
+    professional_id, slot = entry.professional_id, entry.offered_date
+    appt = accept_offer(db, entry)
+    if appt is None:
+        # vencida ou horário ocupado: devolve à fila e oferece ao próximo
+        decline_offer(db, entry)
+        background_tasks.add_task(fill_slot, professional_id, slot, [entry_id])
+        raise HTTPException(status_code=409, detail="Oferta expirada ou horário não está mais disponível.")
+    return appt
+
+
+@router.post("/{entry_id}/decline", response_model=WaitlistOut)
+def decline(
+    entry_id: int,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_principal),
+):
+    entry = _get_or_404(db, entry_id, current_user)
+    if entry.status != "OFFERED":
+        raise HTTPException(status_code=409, detail="Não há oferta pendente para esta entrada.")
+
+    professional_id, slot = entry.professional_id, entry.offered_date
+    decline_offer(db, entry)
+    background_tasks.add_task(fill_slot, professional_id, slot, [entry_id])
+    db.refresh(entry)
+    return entry
+
+
+# ---------------------------
+# DELETE (sai da fila)
+# ---------------------------
+
+@router.delete("/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
+def cancel_entry(
+    entry_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_principal),
+):
+    entry = db.get(WaitlistEntry, entry_id)
+    if not entry:
+        return
+    if not _can_manage(entry.professional_id, current_user):
+        raise HTTPException(status_code=403, detail="Sem permissão")
+    if entry.status in ("WAITING", "OFFERED"):
+        entry.status = "CANCELLED"
+        db.commit()
@@ -1,20 +1,22 @@
 # schemas/appointment.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Literal
-from datetime import datetime
+from datetime import date, datetime
+
+AppointmentStatus = Literal["SCHEDULED", "CONFIRMED", "CANCELLED", "COMPLETED", "NO_SHOW"]
 
 class AppointmentCreate(BaseModel):
     patient_id: int
     professional_id: int
     date: datetime
     reason: str | None = None
-    status: Literal["SCHEDULED", "DONE", "CANCELED", "NOSHOW"] = "SCHEDULED"
+    status: AppointmentStatus = "SCHEDULED"
 
 class AppointmentUpdate(BaseModel):
     # permite remarcação, alterar status/motivo
     date: datetime | None = None
     reason: str | None = None
-    status: Literal["SCHEDULED", "DONE", "CANCELED", "NOSHOW"] | None = None
+    status: AppointmentStatus | None = None
 
 class AppointmentOut(BaseModel):
     id: int
@@ -28,3 +30,85 @@ class AppointmentOut(BaseModel):
     class Config:
         from_attributes = True
 
+
+# ---------------------------
+# Agendamento em lote / recorrente
+# ---------------------------
+
+MAX_BATCH_OCCURRENCES = 200
+
+class RecurrenceRule(BaseModel):
+    """Subconjunto do RRULE (RFC 5545): FREQ, INTERVAL, COUNT, UNTIL e BYDAY."""
+    freq: Literal["DAILY", "WEEKLY"] = "WEEKLY"
+    interval: int = Field(1, ge=1, le=52)
+    count: int | None = Field(None, ge=1, le=MAX_BATCH_OCCURRENCES)
+    until: datetime | None = None
+    # 0 = segunda ... 6 = domingo (só vale para WEEKLY)
+    by_weekday: list[int] | None = Field(None, min_length=1, max_length=7)
+
+    @model_validator(mode="after")
+    def _check_bounds(self):
+        if self.count is None and self.until is None:
+            raise ValueError("Informe 'count' ou 'until'.")
+        if self.by_weekday is not None:
+            if self.freq != "WEEKLY":
+                raise ValueError("'by_weekday' só é suportado com freq=WEEKLY.")
+            if any(d < 0 or d > 6 for d in self.by_weekday):
+                raise ValueError("'by_weekday' aceita valores de 0 (segunda) a 6 (domingo).")
+        return self
+
+class AppointmentRecurringCreate(BaseModel):
+    patient_id: int
+    professional_id: int | None = None  # só admin pode agendar para outro profissional
+    date: datetime  # primeira ocorrência (DTSTART)
+    reason: str | None = None
+    rule: RecurrenceRule
+    on_conflict: Literal["skip", "abort"] = "skip"
+
+class AppointmentBulkCreate(BaseModel):
+    items: list[AppointmentCreate] = Field(..., min_length=1, max_length=MAX_BATCH_OCCURRENCES)
+    on_conflict: Literal["skip", "abort"] = "skip"
+
+class OccurrenceConflict(BaseModel):
+    index: int
+    professional_id: int
+    date: datetime
+    detail: str
+
+class AppointmentBatchOut(BaseModel):
+    created: list[AppointmentOut]
+    conflicts: list[OccurrenceConflict]
+
+
+# ---------------------------
+# Transição de status em massa
+# ---------------------------
+
+class BulkStatusChange(BaseModel):
+    to_status: AppointmentStatus
+    from_status: list[AppointmentStatus] | None = None  # default: todas as origens permitidas
+    professional_id: int | None = None  # ignorado para não-admin
+    date_from: datetime | None = None
+    date_to: datetime | None = None
+
+class BulkStatusResult(BaseModel):
+    to_status: AppointmentStatus
+    updated: int
+    ids: list[int]
+
+
+# ---------------------------
+# Calendário (agregados)
+# ---------------------------
+
+class CalendarBucket(BaseModel):
+    professional_id: int
+    bucket: date  # dia, ou segunda-feira da semana (group_by=week)
+    counts: dict[str, int]  # status -> quantidade
+    total: int
+
+class CalendarOut(BaseModel):
+    date_from: datetime
+    date_to: datetime
+    group_by: Literal["day", "week"]
+    buckets: list[CalendarBucket]
@@ -0,0 +1,33 @@
+# schemas/attachment.py
+from pydantic import BaseModel, Field, constr
+from datetime import datetime
+
+class UploadCreate(BaseModel):
+    filename: constr(min_length=1, max_length=255)
+    content_type: constr(min_length=1, max_length=120) = "application/octet-stream"
+    size: int = Field(..., ge=0)  # bytes; conferido a cada pedaço
+
+class UploadOut(BaseModel):
+    id: int
+    record_id: int
+    filename: str
+    content_type: str
+    size: int
+    received: int  # próximo offset esperado (retomada)
+    attachment_id: int | None = None
+
+    class Config:
+        from_attributes = True
+
+class AttachmentOut(BaseModel):
+    id: int
+    record_id: int
+    filename: str
+    content_type: str
+    size: int
+    sha256: str
+    uploaded_by: int | None = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
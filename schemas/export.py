@@ -0,0 +1,23 @@
+# schemas/export.py
+from pydantic import BaseModel, Field
+from typing import Literal
+from datetime import datetime
+
+ExportStatus = Literal["PENDING", "RUNNING", "DONE", "FAILED"]
+
+class ExportCreate(BaseModel):
+    patient_ids: list[int] = Field(..., min_length=1)
+
+class ExportJobOut(BaseModel):
+    id: int
+    requested_by: int | None = None
+    patient_ids: list[int]
+    status: ExportStatus
+    size_bytes: int | None = None
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
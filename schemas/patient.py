@@ -1,7 +1,11 @@
 # schemas/patient.py
 from pydantic import BaseModel, constr
-from typing import Optional
-from datetime import date
+from typing import Optional, Literal
+from datetime import date, datetime
+
+from schemas.appointment import AppointmentOut
+from schemas.record import RecordSummaryOut
+from schemas.stock import MovementOut
 
 class PatientCreate(BaseModel):
     name: constr(min_length=2, max_length=160)
@@ -22,3 +26,11 @@ class PatientOut(BaseModel):
     class Config:
         from_attributes = True
 
+class TimelineEvent(BaseModel):
+    """Item da linha do tempo; só o campo correspondente a `kind` vem preenchido."""
+    at: datetime
+    kind: Literal["appointment", "record", "dispense"]
+    id: int
+    appointment: Optional[AppointmentOut] = None
+    record: Optional[RecordSummaryOut] = None  # sem notes: detalhe em /patients/{id}/records
+    dispense: Optional[MovementOut] = None
@@ -8,6 +8,8 @@ class RecordCreate(BaseModel):
 
 class RecordUpdate(BaseModel):
     notes: constr(min_length=1) | None = None
+    reason: constr(max_length=255) | None = None  # justificativa da emenda
+    version: int | None = None  # versão lida pelo cliente; diferente da atual -> 409
 
 class RecordOut(BaseModel):
     id: int
@@ -15,7 +17,41 @@ class RecordOut(BaseModel):
     professional_id: int
     notes: str
     created_at: datetime
+    version: int = 1
+    updated_at: datetime | None = None
 
     class Config:
         from_attributes = True
 
+
+class RecordSummaryOut(BaseModel):
+    """Listagem sem o corpo de `notes` (fields=summary)."""
+    id: int
+    patient_id: int
+    professional_id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class RecordSearchHit(BaseModel):
+    id: int
+    patient_id: int
+    professional_id: int
+    created_at: datetime
+    snippet: str  # trecho com os termos entre <mark>...</mark>
+    rank: float   # bm25: quanto menor, mais relevante
+
+class RecordVersionOut(BaseModel):
+    """Entrada do histórico de emendas (sem o texto)."""
+    version: int
+    kind: str  # snapshot | delta (forma de armazenamento)
+    professional_id: int | None
+    reason: str | None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class RecordVersionDetail(RecordVersionOut):
+    notes: str
@@ -12,6 +12,7 @@ class MovementCreate(BaseModel):
     reason: Optional[constr(max_length=160)] = None
     lot: Optional[constr(max_length=64)] = None
     expiration_date: Optional[date] = None
+    patient_id: Optional[int] = None  # só em OUT: dispensação para o paciente
 
 class MovementOut(BaseModel):
     id: int
@@ -23,6 +24,7 @@ class MovementOut(BaseModel):
     expiration_date: Optional[date] = None
     created_at: datetime
     user_id: Optional[int] = None
+    patient_id: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,37 @@
+# schemas/waitlist.py
+from pydantic import BaseModel, Field, model_validator
+from typing import Literal
+from datetime import datetime
+
+WaitlistStatus = Literal["WAITING", "OFFERED", "ASSIGNED", "CANCELLED"]
+
+class WaitlistCreate(BaseModel):
+    patient_id: int
+    professional_id: int
+    priority: int = Field(3, ge=1, le=5)  # 1 = mais urgente
+    earliest: datetime
+    latest: datetime
+    reason: str | None = None
+
+    @model_validator(mode="after")
+    def _check_range(self):
+        if self.latest < self.earliest:
+            raise ValueError("'latest' deve ser posterior a 'earliest'.")
+        return self
+
+class WaitlistOut(BaseModel):
+    id: int
+    patient_id: int
+    professional_id: int
+    priority: int
+    earliest: datetime
+    latest: datetime
+    status: WaitlistStatus
+    reason: str | None = None
+    offered_date: datetime | None = None
+    offer_expires_at: datetime | None = None
+    appointment_id: int | None = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,125 @@
+# scripts/bench_async_reads.py
+# Benchmark: leitura quente (GET de pacientes) em `def` + Session vs `async def` + AsyncSession,
+# com muitos requests simultâneos, in-process (ASGI) num SQLite temporário.
+# No modo sync cada request ocupa uma das threads do anyio (40 por padrão) enquanto espera o banco.
+#   python scripts/bench_async_reads.py --concurrency 200 --requests 4000
+
+import os
+import sys
+import asyncio
+import argparse
+import tempfile
+from statistics import median
+from time import monotonic, perf_counter
+
+# Garante que a raiz do projeto esteja no PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# O engine lê DATABASE_URL no import: aponta para um banco descartável antes de importar o app
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='bench_async_')}/bench.db"
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from auth.auth_utils import Principal, get_principal
+from auth.jwt_handler import create_access_token
+from database import Base, SessionLocal, engine, get_async_db, get_db
+import models  # noqa: F401
+from models.patient import Patient
+from models.user import User
+from schemas.patient import PatientOut
+
+app = FastAPI()
+
+
+@app.get("/sync/patients", response_model=list[PatientOut])
+def sync_patients(
+    offset: int = 0,
+    db: Session = Depends(get_db),
+    _user: Principal = Depends(get_principal),
+):
+    return db.query(Patient).order_by(Patient.id).offset(offset).limit(50).all()
+
+
+@app.get("/async/patients", response_model=list[PatientOut])
+async def async_patients(
+    offset: int = 0,
+    db: AsyncSession = Depends(get_async_db),
+    _user: Principal = Depends(get_principal),
+):
+    return (await db.scalars(select(Patient).order_by(Patient.id).offset(offset).limit(50))).all()
+
+
+def _setup(patients: int) -> str:
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    user = User(name="Bench", email="bench@x.com", password="-", role="doctor", cpf="00000000000")
+    db.add(user)
+    db.add_all(Patient(name=f"Paciente {i:06d}") for i in range(patients))
+    db.commit()
+    token = create_access_token(sub=user.email, extra={"uid": user.id, "role": user.role, "ver": 0})
+    db.close()
+    return token
+
+
+async def _run(path: str, headers: dict, total: int, concurrency: int, patients: int, max_seconds: float) -> dict:
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as client:
+        for _ in range(20):  # aquece pools e caches
+            (await client.get(path, headers=headers)).raise_for_status()
+
+        latencies: list[float] = []
+        errors = 0
+        remaining = iter(range(total))
+
+        deadline = monotonic() + max_seconds
+
+        async def worker() -> None:
+            nonlocal errors
+            for i in remaining:
+                if monotonic() > deadline:  # o modo sync pode travar esperando o pool: corta a rodada
+                    return
+                t0 = perf_counter()
+                r = await client.get(path, params={"offset": (i * 50) % max(1, patients - 50)}, headers=headers)
+                latencies.append(perf_counter() - t0)
+                if r.status_code != 200:
+                    errors += 1  # ex.: QueuePool esgotado (timeout do pool) vira 500
+
+        t0 = perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = perf_counter() - t0
+
+    latencies.sort()
+    return {
+        "done": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50": median(latencies) * 1000,
+        "p95": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de leituras sync vs async.")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--patients", type=int, default=5000)
+    parser.add_argument("--max-seconds", type=float, default=90, help="Teto de duração por modo")
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {_setup(args.patients)}"}
+    print(f"{args.requests} requests, {args.concurrency} simultâneos, páginas de 50 de {args.patients} pacientes")
+    print(f"{'':20} {'concluídos':>10} {'req/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'erros':>6}")
+    for label, path in (("def + Session", "/sync/patients"), ("async + AsyncSession", "/async/patients")):
+        r = asyncio.run(_run(path, headers, args.requests, args.concurrency, args.patients, args.max_seconds))
+        print(
+            f"{label:20} {r['done']:10d} {r['rps']:8.0f} {r['p50']:9.1f} {r['p95']:9.1f} {r['errors']:6d}"
+        )
+
+
+if __name__ == "__main__":
+    main()
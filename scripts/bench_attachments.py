@@ -0,0 +1,119 @@
+# scripts/bench_attachments.py
+# Benchmark dos anexos de prontuário com arquivos grandes (padrão 128 MB), num diretório temporário.
+# Mede: upload em partes (streaming para o disco, com pico de memória), sha256 da conclusão,
+# download completo via mmap vs read() e leituras Range aleatórias via mmap vs seek+read.
+#   python scripts/bench_attachments.py --size-mb 256 --chunk-mb 8
+
+import os
+import sys
+import random
+import asyncio
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+# Garante que a raiz do projeto esteja no PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.config import settings
+from models.attachment import AttachmentUpload
+from services.records.attachments import file_sha256, iter_file_range, upload_path, write_chunk
+
+PIECE = 64 * 1024  # tamanho típico dos pedaços entregues por request.stream()
+
+
+def _mbps(nbytes: int, seconds: float) -> float:
+    return nbytes / 1024 / 1024 / seconds if seconds else float("inf")
+
+
+async def _body(blocks: list[bytes], nbytes: int):
+    """Simula o corpo de um PUT: pedaços de 64 KB sem materializar o arquivo."""
+    sent, i = 0, 0
+    while sent < nbytes:
+        piece = blocks[i % len(blocks)][: nbytes - sent]
+        sent += len(piece)
+        i += 1
+        yield piece
+
+
+async def _upload(upload: AttachmentUpload, chunk: int, blocks: list[bytes]) -> None:
+    while upload.received < upload.size:
+        n = min(chunk, upload.size - upload.received)
+        upload.received = await write_chunk(upload, upload.received, _body(blocks, n), n)
+
+
+def _read_plain(path: Path, block: int) -> int:
+    total = 0
+    with open(path, "rb") as fh:
+        while data := fh.read(block):
+            total += len(data)
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de upload/download de anexos.")
+    parser.add_argument("--size-mb", type=int, default=128)
+    parser.add_argument("--chunk-mb", type=int, default=8, help="Tamanho de cada PUT")
+    parser.add_argument("--range-reads", type=int, default=2000)
+    parser.add_argument("--range-kb", type=int, default=64)
+    args = parser.parse_args()
+
+    settings.ATTACHMENTS_DIR = Path(tempfile.mkdtemp(prefix="bench_attach_"))
+    size = args.size_mb * 1024 * 1024
+    chunk = args.chunk_mb * 1024 * 1024
+    settings.ATTACHMENT_MAX_CHUNK_BYTES = max(settings.ATTACHMENT_MAX_CHUNK_BYTES, chunk)
+    blocks = [os.urandom(PIECE) for _ in range(16)]
+    upload = AttachmentUpload(id=1, size=size, received=0)
+    path = upload_path(upload.id)
+
+    tracemalloc.start()
+    t0 = perf_counter()
+    asyncio.run(_upload(upload, chunk, blocks))
+    upload_s = perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert path.stat().st_size == size
+
+    t0 = perf_counter()
+    file_sha256(path)
+    hash_s = perf_counter() - t0
+
+    block = settings.ATTACHMENT_READ_CHUNK_BYTES
+    t0 = perf_counter()
+    assert sum(len(b) for b in iter_file_range(path, 0, size - 1, block)) == size
+    mmap_s = perf_counter() - t0
+    t0 = perf_counter()
+    assert _read_plain(path, block) == size
+    read_s = perf_counter() - t0
+
+    rng = random.Random(7)
+    span = args.range_kb * 1024
+    starts = [rng.randrange(0, size - span) for _ in range(args.range_reads)]
+    t0 = perf_counter()
+    for s in starts:
+        for _ in iter_file_range(path, s, s + span - 1, block):
+            pass
+    range_mmap_s = perf_counter() - t0
+    t0 = perf_counter()
+    with open(path, "rb") as fh:
+        for s in starts:
+            fh.seek(s)
+            fh.read(span)
+    range_read_s = perf_counter() - t0
+
+    path.unlink()
+    print(f"arquivo {args.size_mb} MB, PUTs de {args.chunk_mb} MB, bloco de leitura {block // 1024} KB")
+    print(f"{'upload em partes':28} {upload_s:8.3f} s {_mbps(size, upload_s):9.1f} MB/s  (pico Python {peak / 1024:.0f} KB)")
+    print(f"{'sha256 (conclusão)':28} {hash_s:8.3f} s {_mbps(size, hash_s):9.1f} MB/s")
+    print(f"{'download completo (mmap)':28} {mmap_s:8.3f} s {_mbps(size, mmap_s):9.1f} MB/s")
+    print(f"{'download completo (read)':28} {read_s:8.3f} s {_mbps(size, read_s):9.1f} MB/s")
+    print(f"{f'{args.range_reads} Range de {args.range_kb} KB (mmap)':28} {range_mmap_s:8.3f} s "
+          f"{range_mmap_s / args.range_reads * 1e6:9.1f} µs/req")
+    print(f"{f'{args.range_reads} Range de {args.range_kb} KB (read)':28} {range_read_s:8.3f} s "
+          f"{range_read_s / args.range_reads * 1e6:9.1f} µs/req")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# scripts/bench_auth_dependency.py
+# Microbenchmark: custo das dependências de autenticação (get_current_user / get_principal)
+# por chamada, com e sem o cache de JWT verificado (auth/jwt_handler.py), num SQLite temporário.
+#   python scripts/bench_auth_dependency.py --iterations 20000
+
+import os
+import sys
+import argparse
+import tempfile
+from time import perf_counter
+
+from starlette.requests import Request
+
+# Garante que a raiz do projeto esteja no PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# O engine lê DATABASE_URL no import: aponta para um banco descartável antes de importar o app
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='bench_auth_')}/bench.db"
+
+import auth.auth_utils as auth_utils
+from auth.jwt_handler import create_access_token, decode_access_token, verify_access_token, token_cache
+from auth.user_cache import user_cache
+from auth.revocation import token_versions
+from database import Base, SessionLocal, engine
+import models  # noqa: F401
+from models.user import User
+
+
+def _setup() -> str:
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    user = User(name="Bench", email="bench@x.com", password="-", role="doctor", cpf="00000000000")
+    db.add(user)
+    db.commit()
+    token = create_access_token(sub=user.email, extra={"uid": user.id, "role": user.role, "ver": 0})
+    db.close()
+    return token
+
+
+def _time(fn, iterations: int) -> float:
+    fn()  # aquece caches
+    t0 = perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (perf_counter() - t0) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Microbenchmark das dependências de autenticação.")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = _setup()
+    db = SessionLocal()
+    cases = {
+        "verify_access_token": lambda: auth_utils.verify_access_token(token),
+        # Request novo a cada chamada: request.state vazio, como no primeiro uso de um request
+        "get_current_user": lambda: auth_utils.get_current_user(Request({"type": "http"}), token, db),
+        "get_principal (claims)": lambda: auth_utils.get_principal(Request({"type": "http"}), token, db),
+    }
+
+    results = {}
+    for mode in ("sem cache", "com cache"):
+        # sem cache: as dependências chamam o decode puro (HMAC + parse a cada chamada)
+        auth_utils.verify_access_token = decode_access_token if mode == "sem cache" else verify_access_token
+        token_cache.clear()
+        for name, fn in cases.items():
+            results[(name, mode)] = _time(fn, args.iterations)
+    db.close()
+
+    print(f"{args.iterations} chamadas por caso (caches de usuário/versão quentes em ambos)")
+    print(f"{'':24} {'sem cache (µs)':>15} {'com cache (µs)':>15} {'ganho':>7}")
+    for name in cases:
+        before, after = results[(name, "sem cache")], results[(name, "com cache")]
+        print(f"{name:24} {before:15.1f} {after:15.1f} {before / after:6.1f}x")
+    print(f"jwt_cache: {token_cache.stats()}")
+    print(f"user_cache: {user_cache.stats()['hit_rate']:.2%} acertos, token_versions: {token_versions.stats()['hit_rate']:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# scripts/bench_auth_stack.py
+# Benchmark: custo por request da resolução das dependências de autenticação, in-process (ASGI).
+# Compara a pilha anterior (OAuth2PasswordBearer + HTTPBearer + dependências sync, cada uma
+# verificando o token de novo) com a atual (header lido uma vez, resultado em request.state).
+# Cada rota checa o papel e também pede o usuário do banco, como /auth/me + require_role.
+#   python scripts/bench_auth_stack.py --requests 3000
+
+import os
+import sys
+import asyncio
+import argparse
+import tempfile
+from time import perf_counter
+from typing import Optional
+
+# Garante que a raiz do projeto esteja no PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# O engine lê DATABASE_URL no import: aponta para um banco descartável antes de importar o app
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='bench_auth_')}/bench.db"
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException, Security
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer, OAuth2PasswordBearer
+from sqlalchemy.orm import Session
+
+from auth.auth_utils import Principal, get_current_user, require_role
+from auth.jwt_handler import create_access_token, verify_access_token
+from auth.revocation import current_token_version
+from auth.user_cache import cache_user, get_cached_user
+from database import Base, SessionLocal, engine, get_db
+import models  # noqa: F401
+from models.user import User
+
+# ---------------------------
+# Pilha anterior (reproduzida aqui só para comparação)
+# ---------------------------
+
+_legacy_oauth2 = OAuth2PasswordBearer(tokenUrl="/auth/token", auto_error=False)
+_legacy_bearer = HTTPBearer(auto_error=False)
+
+
+def _legacy_token(
+    oauth2_token: Optional[str] = Depends(_legacy_oauth2),
+    bearer: Optional[HTTPAuthorizationCredentials] = Security(_legacy_bearer),
+) -> str:
+    if bearer and bearer.scheme.lower() == "bearer" and bearer.credentials:
+        return bearer.credentials
+    if oauth2_token:
+        return oauth2_token
+    raise HTTPException(status_code=401)
+
+
+def _legacy_user(token: str = Depends(_legacy_token), db: Session = Depends(get_db)) -> User:
+    payload = verify_access_token(token)
+    if payload is None:
+        raise HTTPException(status_code=401)
+    user = get_cached_user(db, payload["sub"], payload.get("iat"))
+    if user is None:
+        user = db.query(User).filter(User.email == payload["sub"]).first()
+        cache_user(payload["sub"], payload.get("iat"), user)
+    if payload.get("ver", 0) < (user.token_version or 0):
+        raise HTTPException(status_code=401)
+    return user
+
+
+def _legacy_principal(token: str = Depends(_legacy_token), db: Session = Depends(get_db)) -> Principal:
+    payload = verify_access_token(token)
+    if payload is None:
+        raise HTTPException(status_code=401)
+    version = current_token_version(db, payload["uid"])
+    if version is None or payload.get("ver", 0) < version:
+        raise HTTPException(status_code=401)
+    return Principal(id=payload["uid"], email=payload["sub"], role=payload["role"])
+
+
+def _legacy_require_role(roles: list[str]):
+    def role_checker(current_user: Principal = Depends(_legacy_principal)):
+        if current_user.role not in roles:
+            raise HTTPException(status_code=403)
+        return current_user
+    return role_checker
+
+
+# ---------------------------
+# App de teste
+# ---------------------------
+
+app = FastAPI()
+
+
+@app.get("/none")
+def no_auth():
+    return {"ok": True}
+
+
+@app.get("/legacy")
+def legacy(
+    _principal: Principal = Depends(_legacy_require_role(["doctor"])),
+    user: User = Depends(_legacy_user),
+):
+    return {"ok": user.id}
+
+
+@app.get("/current")
+def current(
+    _principal: Principal = Depends(require_role(["doctor"])),
+    user: User = Depends(get_current_user),
+):
+    return {"ok": user.id}
+
+
+def _setup() -> str:
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    user = User(name="Bench", email="bench@x.com", password="-", role="doctor", cpf="00000000000")
+    db.add(user)
+    db.commit()
+    token = create_access_token(sub=user.email, extra={"uid": user.id, "role": user.role, "ver": 0})
+    db.close()
+    return token
+
+
+async def _run(path: str, headers: dict, n: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):  # aquece caches e o threadpool
+            (await client.get(path, headers=headers)).raise_for_status()
+        t0 = perf_counter()
+        for _ in range(n):
+            await client.get(path, headers=headers)
+        return (perf_counter() - t0) / n * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark da resolução das dependências de autenticação.")
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--rounds", type=int, default=3, help="Rodadas alternadas (vale a melhor)")
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {_setup()}"}
+    best: dict[str, float] = {}
+    for _ in range(args.rounds):
+        for path in ("/none", "/legacy", "/current"):
+            us = asyncio.run(_run(path, headers, args.requests))
+            best[path] = min(us, best.get(path, us))
+
+    base = best["/none"]
+    print(f"{args.requests} requests sequenciais por rota, melhor de {args.rounds} rodadas")
+    print(f"{'rota':10} {'µs/request':>11} {'overhead de auth (µs)':>22}")
+    for path, us in best.items():
+        print(f"{path:10} {us:11.1f} {us - base:22.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# scripts/bench_login_storm.py
+# Benchmark: rajada de logins (bcrypt) x latência de um endpoint comum (GET /patients/{id}).
+# Sobe o app com uvicorn num SQLite temporário, uma vez com bcrypt em thread
+# (PASSWORD_POOL_WORKERS=0, comportamento antigo) e outra com o pool de processos.
+#   python scripts/bench_login_storm.py --storm 80 --seconds 8
+
+import os
+import sys
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from statistics import median
+from time import monotonic, sleep
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Garante que a raiz do projeto esteja no PYTHONPATH
+sys.path.append(ROOT)
+
+import httpx
+
+PASSWORD = "senha-bench"
+API = "/api/v1"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _prepare_db(url: str) -> None:
+    """Cria o schema, um usuário e um paciente num processo à parte (o engine lê DATABASE_URL no import)."""
+    code = (
+        "from database import Base, engine, SessionLocal\n"
+        "import models\n"
+        "from core.config import settings\n"
+        "from models.user import User\n"
+        "from models.patient import Patient\n"
+        "Base.metadata.create_all(engine)\n"
+        "db = SessionLocal()\n"
+        f"db.add(User(name='Bench', email='bench@x.com', password=settings.pwd_context.hash({PASSWORD!r}),"
+        " role='doctor', cpf='00000000000'))\n"
+        "db.add(Patient(name='Paciente'))\n"
+        "db.commit()\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, env={**os.environ, "DATABASE_URL": url}, check=True)
+
+
+def _start_server(url: str, workers: int, port: int) -> subprocess.Popen:
+    env = {**os.environ, "DATABASE_URL": url, "PASSWORD_POOL_WORKERS": str(workers),
+           "PASSWORD_POOL_MAX_PENDING": "100000"}
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    deadline = monotonic() + 30
+    while monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}{API}/healthz", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            sleep(0.2)
+    proc.kill()
+    raise RuntimeError("servidor não subiu")
+
+
+async def _probe(client: httpx.AsyncClient, headers: dict, stop: asyncio.Event, out: list) -> None:
+    while not stop.is_set():
+        t0 = monotonic()
+        r = await client.get(f"{API}/patients/1", headers=headers)
+        r.raise_for_status()
+        out.append(monotonic() - t0)
+        await asyncio.sleep(0.05)
+
+
+async def _storm_worker(client: httpx.AsyncClient, stop: asyncio.Event, done: list) -> None:
+    while not stop.is_set():
+        r = await client.post(f"{API}/auth/login", json={"email": "bench@x.com", "password": PASSWORD})
+        r.raise_for_status()
+        done.append(1)
+
+
+async def _measure(port: int, storm: int, seconds: float) -> dict:
+    limits = httpx.Limits(max_connections=storm + 10)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=120, limits=limits) as client:
+        r = await client.post(f"{API}/auth/login", json={"email": "bench@x.com", "password": PASSWORD})
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+        # linha de base: só o probe
+        stop, idle = asyncio.Event(), []
+        task = asyncio.create_task(_probe(client, headers, stop, idle))
+        await asyncio.sleep(2)
+        stop.set()
+        await task
+
+        # rajada de logins + probe
+        stop, busy, logins = asyncio.Event(), [], []
+        tasks = [asyncio.create_task(_storm_worker(client, stop, logins)) for _ in range(storm)]
+        await asyncio.sleep(0.5)  # deixa a fila encher
+        probe = asyncio.create_task(_probe(client, headers, stop, busy))
+        await asyncio.sleep(seconds)
+        stop.set()
+        await asyncio.gather(probe, *tasks)
+
+    def p95(values: list) -> float:
+        return sorted(values)[int(0.95 * (len(values) - 1))]
+
+    return {
+        "idle_p50": median(idle) * 1000,
+        "busy_p50": median(busy) * 1000,
+        "busy_p95": p95(busy) * 1000,
+        "probes": len(busy),
+        "logins_s": len(logins) / (seconds + 0.5),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de rajada de logins.")
+    parser.add_argument("--storm", type=int, default=80, help="Logins simultâneos")
+    parser.add_argument("--seconds", type=float, default=8)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1), help="Processos do pool")
+    args = parser.parse_args()
+
+    print(f"{args.storm} logins simultâneos, {args.seconds:.0f}s, {os.cpu_count()} CPU(s)")
+    print(f"{'modo':22} {'probe ocioso p50':>17} {'probe rajada p50':>17} {'p95':>9} {'probes':>7} {'logins/s':>9}")
+    for label, workers in (("bcrypt em thread", 0), (f"pool ({args.workers} proc.)", args.workers)):
+        tmp = tempfile.mkdtemp(prefix="bench_login_")
+        url = f"sqlite:///{tmp}/bench.db"
+        _prepare_db(url)
+        port = _free_port()
+        proc = _start_server(url, workers, port)
+        try:
+            r = asyncio.run(_measure(port, args.storm, args.seconds))
+        finally:
+            proc.terminate()
+            proc.wait()
+        print(
+            f"{label:22} {r['idle_p50']:14.1f} ms {r['busy_p50']:14.1f} ms {r['busy_p95']:6.1f} ms "
+            f"{r['probes']:7d} {r['logins_s']:9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# scripts/bench_record_notes.py
+# Benchmark: records.notes em TEXT puro vs CompressedText (zlib) num SQLite temporário.
+# Mede escrita, leitura (varredura e por id) e tamanho do arquivo, incluindo o índice FTS5
+# da busca: com conteúdo próprio (guarda outra cópia do texto) e "external content".
+#   python scripts/bench_record_notes.py --rows 20000 --avg-words 600
+
+import os
+import sys
+import random
+import argparse
+import tempfile
+from time import perf_counter
+
+# Garante que a raiz do projeto esteja no PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import Column, Integer, MetaData, Table, Text, bindparam, create_engine, event, insert, select
+
+from core.compression import CompressedText, register_sqlite_functions
+from models.record import RECORDS_FTS_DDL, RECORDS_FTS_TABLE
+
+# forma anterior do índice: tabela FTS5 com cópia descomprimida de notes
+FTS_COPY_DDL = [
+    f"CREATE VIRTUAL TABLE {RECORDS_FTS_TABLE} USING fts5("
+    "notes, tokenize = 'unicode61 remove_diacritics 2')",
+    f"INSERT INTO {RECORDS_FTS_TABLE}(rowid, notes) SELECT id, notes_text(notes) FROM records",
+]
+FTS_EXTERNAL_DDL = [*RECORDS_FTS_DDL, f"INSERT INTO {RECORDS_FTS_TABLE}({RECORDS_FTS_TABLE}) VALUES ('rebuild')"]
+
+VOCAB = (
+    "paciente refere dor abdominal há três dias sem febre nega vômitos pressão arterial "
+    "frequência cardíaca glicemia capilar insulina NPH metformina ajuste de dose retorno "
+    "em quinze dias exame físico sem alterações ausculta pulmonar murmúrio vesicular "
+    "presente bilateralmente abdome flácido indolor à palpação orientado hidratado corado "
+    "acianótico anictérico hemograma solicitado creatinina ureia potássio sódio prescrição "
+    "mantida dieta hipossódica caminhada diária conduta orientações fornecidas familiar"
+).split()
+
+
+def _note(rng: random.Random, avg_words: int) -> str:
+    n = max(5, int(rng.gauss(avg_words, avg_words / 3)))
+    words = [rng.choice(VOCAB) for _ in range(n)]
+    words += [str(rng.randint(60, 220)) for _ in range(n // 25)]  # sinais vitais, doses
+    rng.shuffle(words)
+    return " ".join(words).capitalize() + "."
+
+
+def _run(label: str, notes_type, fts_ddl: list[str], notes: list[str], point_reads: int) -> dict:
+    fd, path = tempfile.mkstemp(suffix=".sqlite3")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", future=True)
+    event.listen(engine, "connect", lambda conn, _rec: register_sqlite_functions(conn))
+    md = MetaData()
+    table = Table("records", md, Column("id", Integer, primary_key=True), Column("notes", notes_type))
+    md.create_all(engine)
+
+    t0 = perf_counter()
+    with engine.begin() as conn:
+        for i in range(0, len(notes), 1000):
+            conn.execute(insert(table), [{"notes": n} for n in notes[i:i + 1000]])
+    write_s = perf_counter() - t0
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("VACUUM")
+    table_size = os.path.getsize(path)
+
+    # índice da busca construído depois da carga, para não misturar com o tempo de escrita
+    t0 = perf_counter()
+    with engine.begin() as conn:
+        for stmt in fts_ddl:
+            conn.exec_driver_sql(stmt)
+    fts_s = perf_counter() - t0
+    with engine.begin() as conn:
+        conn.exec_driver_sql("VACUUM")
+    size = os.path.getsize(path)
+
+    t0 = perf_counter()
+    with engine.connect() as conn:
+        total_chars = sum(len(n) for (n,) in conn.execute(select(table.c.notes)))
+    scan_s = perf_counter() - t0
+    assert total_chars == sum(len(n) for n in notes)
+
+    rng = random.Random(1)
+    ids = [rng.randint(1, len(notes)) for _ in range(point_reads)]
+    t0 = perf_counter()
+    with engine.connect() as conn:
+        stmt = select(table.c.notes).where(table.c.id == bindparam("id"))
+        for i in ids:
+            conn.execute(stmt, {"id": i}).scalar_one()
+    point_s = perf_counter() - t0
+
+    engine.dispose()
+    os.remove(path)
+    return {
+        "label": label,
+        "write_s": write_s,
+        "scan_s": scan_s,
+        "point_us": point_s / point_reads * 1e6,
+        "fts_s": fts_s,
+        "fts_mb": (size - table_size) / 1024 / 1024,
+        "size_mb": size / 1024 / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de compressão de records.notes.")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--avg-words", type=int, default=400, help="Palavras médias por nota")
+    parser.add_argument("--point-reads", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    notes = [_note(rng, args.avg_words) for _ in range(args.rows)]
+    raw_mb = sum(len(n.encode("utf-8")) for n in notes) / 1024 / 1024
+    print(f"{args.rows} notas, {raw_mb:.1f} MB de texto (média {raw_mb * 1024 * 1024 / args.rows:.0f} B)")
+
+    results = [
+        _run("TEXT + FTS cópia", Text(), FTS_COPY_DDL, notes, args.point_reads),
+        _run("Compr. + FTS cópia", CompressedText(), FTS_COPY_DDL, notes, args.point_reads),
+        _run("Compr. + FTS externo", CompressedText(), FTS_EXTERNAL_DDL, notes, args.point_reads),
+    ]
+    print(
+        f"{'':20} {'escrita (s)':>12} {'varredura (s)':>14} {'leitura/id (µs)':>16} "
+        f"{'índice (s)':>11} {'FTS (MB)':>9} {'arquivo (MB)':>13}"
+    )
+    for r in results:
+        print(
+            f"{r['label']:20} {r['write_s']:12.3f} {r['scan_s']:14.3f} {r['point_us']:16.1f} "
+            f"{r['fts_s']:11.3f} {r['fts_mb']:9.2f} {r['size_mb']:13.2f}"
+        )
+    base = results[0]
+    for r in results[1:]:
+        print(f"Redução de armazenamento ({r['label']}): {100 * (1 - r['size_mb'] / base['size_mb']):.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# scripts/bench_sqlite_contention.py
+# Benchmark: escritas concorrentes no SQLite (movimentação de estoque + agendamento), vários
+# processos no mesmo arquivo, sem e com o perfil SQLITE_* (WAL, synchronous=NORMAL, busy_timeout...).
+# Cada modo usa um banco novo (journal_mode=WAL fica gravado no arquivo).
+#   python scripts/bench_sqlite_contention.py --processes 4 --transactions 300
+
+import os
+import sys
+import json
+import random
+import argparse
+import tempfile
+import subprocess
+from time import perf_counter, sleep
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Garante que a raiz do projeto esteja no PYTHONPATH
+sys.path.append(ROOT)
+
+
+def _prepare(url: str, env: dict) -> None:
+    code = (
+        "from database import Base, engine, SessionLocal\n"
+        "import models\n"
+        "from models.user import User\n"
+        "from models.patient import Patient\n"
+        "from models.item import Item\n"
+        "Base.metadata.create_all(engine)\n"
+        "db = SessionLocal()\n"
+        "db.add_all([User(name=f'P{i}', email=f'p{i}@x.com', password='-', role='doctor', cpf=f'{i:011d}')"
+        " for i in range(1, 9)])\n"
+        "db.add_all([Patient(name=f'Paciente {i}') for i in range(50)])\n"
+        "db.add_all([Item(name=f'Item {i}', unit='un', min_stock=0) for i in range(20)])\n"
+        "db.commit()\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, env={**env, "DATABASE_URL": url}, check=True)
+
+
+def _worker(seed: int, transactions: int, start_at: float) -> None:
+    """Roda no processo filho: mistura move_stock (lê saldo + insere) e create_appointment."""
+    from datetime import datetime, timedelta
+    from sqlalchemy.exc import OperationalError
+    from time import time
+
+    from database import SessionLocal
+    from models.appointment import Appointment
+    from models.stock_movement import StockMovement
+    from routers.stock_router import get_balance
+
+    rng = random.Random(seed)
+    ok = locked = 0
+    while time() < start_at:  # todos começam juntos
+        sleep(0.001)
+    t0 = perf_counter()
+    for i in range(transactions):
+        db = SessionLocal()
+        try:
+            if i % 2 == 0:
+                item_id = rng.randint(1, 20)
+                kind = "OUT" if get_balance(db, item_id) > 0 and rng.random() < 0.5 else "IN"
+                db.add(StockMovement(item_id=item_id, type=kind, quantity=1, user_id=1 + seed % 8))
+            else:
+                db.add(Appointment(
+                    patient_id=rng.randint(1, 50),
+                    professional_id=1 + seed % 8,
+                    date=datetime(2030, 1, 1) + timedelta(minutes=rng.randint(0, 10 ** 6)),
+                    status="SCHEDULED",
+                ))
+            db.commit()
+            ok += 1
+        except OperationalError as exc:  # "database is locked"
+            db.rollback()
+            if "locked" not in str(exc):
+                raise
+            locked += 1
+        finally:
+            db.close()
+    print(json.dumps({"ok": ok, "locked": locked, "seconds": perf_counter() - t0}))
+
+
+def _run_mode(pragmas: bool, processes: int, transactions: int) -> dict:
+    tmp = tempfile.mkdtemp(prefix="bench_sqlite_")
+    url = f"sqlite:///{tmp}/bench.db"
+    env = {**os.environ, "SQLITE_PRAGMAS_ENABLED": "true" if pragmas else "false"}
+    _prepare(url, env)
+
+    from time import time
+    start_at = time() + 2.0  # margem para todos os processos importarem o app
+    procs = [
+        subprocess.Popen(
+            [sys.executable, __file__, "--worker", str(seed), "--transactions", str(transactions),
+             "--start-at", str(start_at)],
+            cwd=ROOT, env={**env, "DATABASE_URL": url}, stdout=subprocess.PIPE, text=True,
+        )
+        for seed in range(processes)
+    ]
+    results = [json.loads(p.communicate()[0].strip().splitlines()[-1]) for p in procs]
+    ok = sum(r["ok"] for r in results)
+    return {
+        "ok": ok,
+        "locked": sum(r["locked"] for r in results),
+        "tps": ok / max(r["seconds"] for r in results),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de escrita concorrente no SQLite.")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--transactions", type=int, default=300, help="Transações por processo")
+    parser.add_argument("--worker", type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--start-at", type=float, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        _worker(args.worker, args.transactions, args.start_at)
+        return
+
+    print(f"{args.processes} processos x {args.transactions} transações (metade estoque, metade agenda)")
+    print(f"{'':22} {'commits':>8} {'locked':>7} {'tx/s':>8}")
+    for label, pragmas in (("padrão do SQLite", False), ("perfil SQLITE_*", True)):
+        r = _run_mode(pragmas, args.processes, args.transactions)
+        print(f"{label:22} {r['ok']:8d} {r['locked']:7d} {r['tps']:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
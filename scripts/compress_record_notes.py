@@ -0,0 +1,88 @@
+# scripts/compress_record_notes.py
+# Migração em background: reescreve records.notes no formato comprimido, em lotes por id.
+# Seguro para rodar com a aplicação no ar (commit por lote, pausa configurável) e idempotente:
+# o UPDATE só vale se notes ainda for o valor lido; linha editada no meio do lote é pulada
+# (a aplicação já gravou no formato novo) e contada em "skipped".
+
+import os
+import sys
+import time
+import argparse
+
+# Garante que a raiz do projeto esteja no PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.types import LargeBinary
+
+from core.compression import FORMAT_RAW, decode_notes, encode_notes, is_encoded
+from core.config import settings
+from database import SessionLocal
+
+
+def _needs_rewrite(raw) -> bool:
+    if not is_encoded(raw):
+        return True  # TEXT legado ou UTF-8 sem marcador
+    data = bytes(raw)
+    # RAW grande (gravado antes do limiar atual) pode valer a pena comprimir
+    return data[0] == FORMAT_RAW and len(data) - 1 >= settings.RECORD_NOTES_COMPRESS_MIN_BYTES
+
+
+def compress_record_notes(batch_size: int = 500, pause_ms: int = 0) -> dict:
+    """Percorre `records` por keyset em id; retorna contadores e bytes antes/depois."""
+    select_batch = text(
+        "SELECT id, notes FROM records WHERE id > :last_id ORDER BY id LIMIT :limit"
+    )
+    # :old vai sem tipo: TEXT legado chega como str, o resto como bytes
+    update_one = text("UPDATE records SET notes = :notes WHERE id = :id AND notes = :old").bindparams(
+        bindparam("notes", type_=LargeBinary)
+    )
+    stats = {"scanned": 0, "rewritten": 0, "skipped": 0, "bytes_before": 0, "bytes_after": 0}
+
+    db = SessionLocal()
+    try:
+        last_id = 0
+        while True:
+            rows = db.execute(select_batch, {"last_id": last_id, "limit": batch_size}).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            stats["scanned"] += len(rows)
+
+            for row in rows:
+                if not _needs_rewrite(row.notes):
+                    continue
+                plain = decode_notes(row.notes)
+                packed = encode_notes(plain)
+                if is_encoded(row.notes) and bytes(row.notes) == packed:
+                    continue
+                old = row.notes if isinstance(row.notes, str) else bytes(row.notes)
+                if db.execute(update_one, {"id": row.id, "notes": packed, "old": old}).rowcount != 1:
+                    stats["skipped"] += 1  # editada (ou removida) depois do SELECT
+                    continue
+                before = old.encode("utf-8") if isinstance(old, str) else old
+                stats["bytes_before"] += len(before)
+                stats["bytes_after"] += len(packed)
+                stats["rewritten"] += 1
+            db.commit()
+            if pause_ms:
+                time.sleep(pause_ms / 1000)
+    finally:
+        db.close()
+    return stats
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Comprime records.notes existentes (SGHSS).")
+    parser.add_argument("--batch-size", type=int, default=500, help="Linhas por lote/commit")
+    parser.add_argument("--pause-ms", type=int, default=0, help="Pausa entre lotes (alivia o banco)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    s = compress_record_notes(args.batch_size, args.pause_ms)
+    print(
+        f"[OK] {s['scanned']} lidas, {s['rewritten']} reescritas, {s['skipped']} puladas (editadas); "
+        f"{s['bytes_before']} -> {s['bytes_after']} bytes."
+    )
@@ -0,0 +1,50 @@
+# scripts/mark_no_shows.py
+# Varredura de fim de dia: marca como NO_SHOW as consultas passadas ainda SCHEDULED/CONFIRMED.
+# Pensado para rodar via cron, ex.: 0 23 * * * python scripts/mark_no_shows.py
+
+import os
+import sys
+import argparse
+from datetime import datetime, timedelta, timezone
+
+# Garante que a raiz do projeto esteja no PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import SessionLocal
+from services.appointments.service import bulk_transition, DEFAULT_BATCH_SIZE
+
+
+def mark_no_shows(
+    grace_minutes: int = 60,
+    professional_id: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> list[int]:
+    """Marca NO_SHOW tudo que passou de `date + grace_minutes` sem ser concluído/cancelado."""
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=grace_minutes)
+    db = SessionLocal()
+    try:
+        rows = bulk_transition(
+            db,
+            "NO_SHOW",
+            from_statuses=["SCHEDULED", "CONFIRMED"],
+            professional_id=professional_id,
+            date_to=cutoff,
+            batch_size=batch_size,
+        )
+        return [r.id for r in rows]
+    finally:
+        db.close()
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Marca consultas passadas como NO_SHOW (SGHSS).")
+    parser.add_argument("--grace-minutes", type=int, default=60, help="Tolerância após o horário (min)")
+    parser.add_argument("--professional-id", type=int, default=None, help="Restringe a um profissional")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Linhas por UPDATE")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    ids = mark_no_shows(args.grace_minutes, args.professional_id, args.batch_size)
+    print(f"[OK] {len(ids)} consulta(s) marcadas como NO_SHOW.")
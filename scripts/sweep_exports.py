@@ -0,0 +1,29 @@
+# scripts/sweep_exports.py
+# Retenção das exportações LGPD: apaga os .zip vencidos (EXPORT_RETENTION_HOURS) e encerra
+# como FAILED os jobs presos em RUNNING (EXPORT_STALE_RUNNING_MINUTES).
+# Pensado para rodar via cron, ex.: 15 * * * * python scripts/sweep_exports.py
+
+import os
+import sys
+import argparse
+
+# Garante que a raiz do projeto esteja no PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import SessionLocal
+from services.patients.export import sweep_exports
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Limpa exportações vencidas ou travadas (SGHSS).")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    _parse_args()
+    db = SessionLocal()
+    try:
+        s = sweep_exports(db)
+    finally:
+        db.close()
+    print(f"[OK] {s['expired']} arquivo(s) vencido(s) removido(s), {s['stale']} job(s) travado(s) encerrado(s).")
@@ -0,0 +1,30 @@
+# scripts/sweep_sessions.py
+# Varredura de sessões (refresh tokens) expiradas, em lotes.
+# Pensado para rodar via cron, ex.: 30 3 * * * python scripts/sweep_sessions.py
+
+import os
+import sys
+import argparse
+
+# Garante que a raiz do projeto esteja no PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.config import settings
+from database import SessionLocal
+from auth.sessions import sweep_expired_sessions
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Remove sessões expiradas (SGHSS).")
+    parser.add_argument("--batch-size", type=int, default=settings.SESSION_SWEEP_BATCH_SIZE, help="Linhas por DELETE")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    db = SessionLocal()
+    try:
+        deleted = sweep_expired_sessions(db, args.batch_size)
+    finally:
+        db.close()
+    print(f"[OK] {deleted} sessão(ões) expirada(s) removida(s).")
@@ -0,0 +1,30 @@
+# scripts/sweep_waitlist_offers.py
+# Devolve à fila as ofertas da lista de espera vencidas e reoferece cada horário liberado
+# ao próximo candidato (WAITLIST_AUTOFILL_MODE=offer).
+# Pensado para rodar via cron, ex.: */5 * * * * python scripts/sweep_waitlist_offers.py
+
+import os
+import sys
+import argparse
+
+# Garante que a raiz do projeto esteja no PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import SessionLocal
+from services.appointments.waitlist import expire_offers
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Libera e reoferece ofertas vencidas da lista de espera (SGHSS).")
+    parser.add_argument("--professional-id", type=int, default=None, help="Só a agenda deste profissional")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    db = SessionLocal()
+    try:
+        released = expire_offers(db, args.professional_id)
+    finally:
+        db.close()
+    print(f"[OK] {released} oferta(s) vencida(s) devolvida(s) à fila.")
@@ -0,0 +1,115 @@
+# services/appointments/ical.py
+"""
+Geração incremental (streaming) do feed iCalendar (RFC 5545) da agenda de um profissional.
+Não inclui dados do paciente: o feed vai parar em apps de calendário de terceiros.
+"""
+
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models.appointment import Appointment
+
+# status interno -> STATUS do VEVENT
+_ICS_STATUS = {
+    "SCHEDULED": "TENTATIVE",
+    "CONFIRMED": "CONFIRMED",
+    "COMPLETED": "CONFIRMED",
+    "NO_SHOW": "CONFIRMED",
+    "CANCELLED": "CANCELLED",
+}
+
+_STATUS_LABEL = {
+    "SCHEDULED": "agendada",
+    "CONFIRMED": "confirmada",
+    "COMPLETED": "concluída",
+    "NO_SHOW": "não compareceu",
+    "CANCELLED": "cancelada",
+}
+
+
+def _fmt(dt: datetime) -> str:
+    # datas são UTC-naive no banco
+    return dt.strftime("%Y%m%dT%H%M%SZ")
+
+
+def _escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Quebra linhas > 75 octetos (RFC 5545 §3.1) e termina com CRLF."""
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return line + "\r\n"
+    parts, chunk = [], b""
+    for ch in line:
+        b = ch.encode("utf-8")
+        if len(chunk) + len(b) > (75 if not parts else 74):
+            parts.append(chunk.decode("utf-8"))
+            chunk = b""
+        chunk += b
+    parts.append(chunk.decode("utf-8"))
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _vevent(appt: Appointment, duration: timedelta) -> str:
+    label = _STATUS_LABEL.get(appt.status, appt.status.lower())
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:appointment-{appt.id}@sghss",
+        f"DTSTAMP:{_fmt(appt.created_at)}",
+        f"DTSTART:{_fmt(appt.date)}",
+        f"DTEND:{_fmt(appt.date + duration)}",
+        f"SUMMARY:{_escape(f'Consulta #{appt.id} ({label})')}",
+        f"STATUS:{_ICS_STATUS.get(appt.status, 'TENTATIVE')}",
+        "END:VEVENT",
+    ]
+    return "".join(_fold(line) for line in lines)
+
+
+def iter_professional_calendar(
+    db: Session,
+    professional_id: int,
+    window_start: datetime,
+    window_end: datetime,
+    batch_size: int = 500,
+) -> Iterator[str]:
+    """Gera o .ics em pedaços, lendo a faixa via ix_appointments_professional_date com yield_per."""
+    yield "".join(_fold(line) for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//SGHSS//Agenda//PT-BR",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(f'{settings.APP_NAME} — agenda')}",
+    ))
+
+    duration = timedelta(minutes=settings.ICS_EVENT_MINUTES)
+    q = (
+        db.query(Appointment)
+        .filter(
+            Appointment.professional_id == professional_id,
+            Appointment.date >= window_start,
+            Appointment.date <= window_end,
+        )
+        .order_by(Appointment.date)
+        .yield_per(batch_size)
+    )
+    buf: list[str] = []
+    for appt in q:
+        buf.append(_vevent(appt, duration))
+        if len(buf) >= 50:
+            yield "".join(buf)
+            buf = []
+    if buf:
+        yield "".join(buf)
+
+    yield _fold("END:VCALENDAR")
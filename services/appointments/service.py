@@ -0,0 +1,164 @@
+# services/appointments/service.py
+"""
+Regras de agendamento compartilhadas entre routers e jobs (scripts/).
+"""
+
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import Row, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from core.events import appointment_events
+from models.appointment import Appointment
+from models.calendar_version import CalendarVersion
+from models.waitlist import WaitlistEntry
+from schemas.appointment import AppointmentOut
+
+# Status finais não saem mais do lugar; os demais seguem o mapa abaixo
+ALLOWED_TRANSITIONS: dict[str, set[str]] = {
+    "SCHEDULED": {"CONFIRMED", "CANCELLED", "COMPLETED", "NO_SHOW"},
+    "CONFIRMED": {"SCHEDULED", "CANCELLED", "COMPLETED", "NO_SHOW"},
+    "CANCELLED": set(),
+    "COMPLETED": set(),
+    "NO_SHOW": set(),
+}
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def held_offers(db: Session, professional_id: int):
+    """Ofertas da lista de espera ainda válidas do profissional: seguram o horário até vencer."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return db.query(WaitlistEntry).filter(
+        WaitlistEntry.professional_id == professional_id,
+        WaitlistEntry.status == "OFFERED",
+        WaitlistEntry.offer_expires_at >= now,
+    )
+
+
+def slot_taken(
+    db: Session,
+    professional_id: int,
+    date: datetime,
+    exclude_id: Optional[int] = None,
+    exclude_offer_id: Optional[int] = None,
+) -> bool:
+    """
+    Anti-overbooking exato (mesma data/hora). Consultas canceladas liberam o horário;
+    oferta pendente da lista de espera (WAITLIST_AUTOFILL_MODE=offer) o mantém reservado.
+    """
+    q = db.query(Appointment).filter(
+        Appointment.professional_id == professional_id,
+        Appointment.date == date,
+        Appointment.status != "CANCELLED",
+    )
+    if exclude_id is not None:
+        q = q.filter(Appointment.id != exclude_id)
+    if db.query(q.exists()).scalar():
+        return True
+    offers = held_offers(db, professional_id).filter(WaitlistEntry.offered_date == date)
+    if exclude_offer_id is not None:
+        offers = offers.filter(WaitlistEntry.id != exclude_offer_id)
+    return db.query(offers.exists()).scalar() is True
+
+
+def publish_change(kind: str, appt: Appointment | dict) -> None:
+    """Publica no feed de mudanças de consultas (chamar só depois do commit)."""
+    data = appt if isinstance(appt, dict) else AppointmentOut.model_validate(appt).model_dump(mode="json")
+    appointment_events.publish({"type": kind, "appointment": data})
+
+
+def bump_calendar_version(db: Session, professional_ids: Iterable[int]) -> None:
+    """
+    Incrementa o contador da agenda de cada profissional (upsert), na MESMA transação
+    da escrita na consulta; o commit fica a cargo de quem chamou.
+    """
+    ids = sorted(set(professional_ids))
+    if not ids:
+        return
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert(CalendarVersion).values(
+            [{"professional_id": pid, "version": 1, "updated_at": now} for pid in ids]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CalendarVersion.professional_id],
+            set_={"version": CalendarVersion.version + 1, "updated_at": now},
+        )
+        db.execute(stmt)
+        return
+
+    # fallback genérico: update + insert dos que ainda não existem
+    existing = set(
+        db.execute(
+            update(CalendarVersion)
+            .where(CalendarVersion.professional_id.in_(ids))
+            .values(version=CalendarVersion.version + 1, updated_at=now)
+            .returning(CalendarVersion.professional_id)
+            .execution_options(synchronize_session=False)
+        ).scalars()
+    )
+    db.add_all(
+        CalendarVersion(professional_id=pid, version=1, updated_at=now)
+        for pid in ids if pid not in existing
+    )
+
+
+def sources_for(to_status: str) -> set[str]:
+    """Status de origem que podem transicionar para `to_status`."""
+    return {src for src, targets in ALLOWED_TRANSITIONS.items() if to_status in targets}
+
+
+def bulk_transition(
+    db: Session,
+    to_status: str,
+    *,
+    from_statuses: Optional[Iterable[str]] = None,
+    professional_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> list[Row]:
+    """
+    Transição de status em massa, orientada a conjunto.
+    Cada lote é um único `UPDATE ... WHERE id IN (SELECT ... LIMIT n) RETURNING id`;
+    a validação da transição fica no próprio WHERE (status IN origens permitidas).
+    Commita por lote para não segurar o lock de escrita durante a varredura inteira.
+    Retorna as linhas afetadas (id, professional_id, date).
+    """
+    sources = sources_for(to_status)
+    if from_statuses is not None:
+        sources &= set(from_statuses)
+    if not sources:
+        return []
+
+    conds = [Appointment.status.in_(sorted(sources))]
+    if professional_id is not None:
+        conds.append(Appointment.professional_id == professional_id)
+    if date_from is not None:
+        conds.append(Appointment.date >= date_from)
+    if date_to is not None:
+        conds.append(Appointment.date <= date_to)
+
+    affected: list[Row] = []
+    while True:
+        batch = select(Appointment.id).where(*conds).order_by(Appointment.id).limit(batch_size)
+        stmt = (
+            update(Appointment)
+            .where(Appointment.id.in_(batch), *conds)
+            .values(status=to_status)
+            .returning(Appointment.id, Appointment.professional_id, Appointment.date)
+            .execution_options(synchronize_session=False)
+        )
+        rows = db.execute(stmt).all()
+        bump_calendar_version(db, (r.professional_id for r in rows))
+        db.commit()
+        affected.extend(rows)
+        # linhas atualizadas deixam de casar com o filtro; lote incompleto = fim
+        if len(rows) < batch_size:
+            break
+    return affected
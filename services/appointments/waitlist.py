@@ -0,0 +1,177 @@
+# services/appointments/waitlist.py
+"""
+Lista de espera: quando uma consulta é cancelada, oferece/agenda a vaga para o melhor
+candidato do profissional cuja janela cobre o horário (menor priority, depois mais antigo).
+Roda fora do request (BackgroundTasks), com sessão própria.
+
+Oferta pendente reserva o horário (slot_taken) até offer_expires_at. Ofertas vencidas
+voltam para a fila e a vaga é reoferecida ao próximo candidato: no próximo preenchimento
+do profissional ou na varredura periódica (scripts/sweep_waitlist_offers.py).
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from database import SessionLocal
+from models.appointment import Appointment
+from models.waitlist import WaitlistEntry
+from services.appointments.service import slot_taken, bump_calendar_version, publish_change
+
+# Tentativas de "claim" se outro worker pegar o mesmo candidato ao mesmo tempo
+MAX_CLAIM_ATTEMPTS = 5
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def best_candidate(
+    db: Session,
+    professional_id: int,
+    slot: datetime,
+    exclude_ids: Iterable[int] = (),
+) -> Optional[WaitlistEntry]:
+    """Topo da fila de prioridade via ix_waitlist_queue (para no primeiro que cabe)."""
+    q = db.query(WaitlistEntry).filter(
+        WaitlistEntry.professional_id == professional_id,
+        WaitlistEntry.status == "WAITING",
+        WaitlistEntry.earliest <= slot,
+        WaitlistEntry.latest >= slot,
+    )
+    exclude = list(exclude_ids)
+    if exclude:
+        q = q.filter(WaitlistEntry.id.notin_(exclude))
+    return (
+        q.order_by(WaitlistEntry.priority, WaitlistEntry.created_at, WaitlistEntry.id)
+        .first()
+    )
+
+
+def _claim(db: Session, entry_id: int, from_status: str, **values) -> bool:
+    """Transição condicional (compare-and-set) para não atribuir o mesmo candidato duas vezes."""
+    result = db.execute(
+        update(WaitlistEntry)
+        .where(WaitlistEntry.id == entry_id, WaitlistEntry.status == from_status)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def _assign(db: Session, entry: WaitlistEntry, slot: datetime, from_status: str) -> Optional[Appointment]:
+    if not _claim(db, entry.id, from_status, status="ASSIGNED", offered_date=slot):
+        db.rollback()
+        return None
+    appt = Appointment(
+        patient_id=entry.patient_id,
+        professional_id=entry.professional_id,
+        date=slot,
+        status="SCHEDULED",
+        reason=entry.reason,
+    )
+    db.add(appt)
+    db.flush()
+    db.execute(
+        update(WaitlistEntry)
+        .where(WaitlistEntry.id == entry.id)
+        .values(appointment_id=appt.id)
+        .execution_options(synchronize_session=False)
+    )
+    bump_calendar_version(db, [appt.professional_id])
+    db.commit()
+    db.refresh(appt)
+    publish_change("created", appt)
+    return appt
+
+
+def release_expired_offers(db: Session, professional_id: Optional[int] = None) -> list[tuple[int, int, datetime]]:
+    """
+    Ofertas vencidas voltam para a fila (WAITING), mantendo prioridade e antiguidade.
+    Retorna (entry_id, professional_id, horário) de cada oferta liberada.
+    """
+    q = select(WaitlistEntry.id, WaitlistEntry.professional_id, WaitlistEntry.offered_date).where(
+        WaitlistEntry.status == "OFFERED",
+        WaitlistEntry.offer_expires_at < _now(),
+    )
+    if professional_id is not None:
+        q = q.where(WaitlistEntry.professional_id == professional_id)
+    released = [
+        (entry_id, prof_id, slot)
+        for entry_id, prof_id, slot in db.execute(q).all()
+        if _claim(db, entry_id, "OFFERED", status="WAITING", offered_date=None, offer_expires_at=None)
+    ]
+    db.commit()
+    return released
+
+
+def expire_offers(db: Session, professional_id: Optional[int] = None) -> int:
+    """Libera as ofertas vencidas e reoferece cada horário ao próximo candidato."""
+    released = release_expired_offers(db, professional_id)
+    for entry_id, prof_id, slot in released:
+        _fill(db, prof_id, slot, {entry_id})  # quem deixou vencer não recebe a mesma vaga de novo
+    return len(released)
+
+
+def _fill(db: Session, professional_id: int, slot: datetime, exclude: set[int]) -> Optional[WaitlistEntry]:
+    for _ in range(MAX_CLAIM_ATTEMPTS):
+        # consulta ou oferta pendente no horário: nada a preencher
+        if slot_taken(db, professional_id, slot):
+            return None
+        entry = best_candidate(db, professional_id, slot, exclude)
+        if entry is None:
+            return None
+
+        if settings.WAITLIST_AUTOFILL_MODE == "offer":
+            expires = _now() + timedelta(minutes=settings.WAITLIST_OFFER_MINUTES)
+            if _claim(db, entry.id, "WAITING", status="OFFERED", offered_date=slot, offer_expires_at=expires):
+                db.commit()
+                db.refresh(entry)
+                return entry
+            db.rollback()
+        elif _assign(db, entry, slot, "WAITING") is not None:
+            db.refresh(entry)
+            return entry
+
+        exclude.add(entry.id)  # perdeu a corrida: tenta o próximo
+    return None
+
+
+def fill_slot_in_session(
+    db: Session,
+    professional_id: int,
+    slot: datetime,
+    exclude_ids: Iterable[int] = (),
+) -> Optional[WaitlistEntry]:
+    """Oferece ou agenda (WAITLIST_AUTOFILL_MODE) a vaga para o melhor candidato."""
+    expire_offers(db, professional_id)
+    return _fill(db, professional_id, slot, set(exclude_ids))
+
+
+def fill_slot(professional_id: int, slot: datetime, exclude_ids: Iterable[int] = ()) -> Optional[int]:
+    """Ponto de entrada do worker (BackgroundTasks). Retorna o id da entrada atendida."""
+    db = SessionLocal()
+    try:
+        entry = fill_slot_in_session(db, professional_id, slot, exclude_ids)
+        return entry.id if entry else None
+    finally:
+        db.close()
+
+
+def accept_offer(db: Session, entry: WaitlistEntry) -> Optional[Appointment]:
+    """Converte a oferta em consulta, se ainda válida e o horário continuar livre."""
+    if entry.offer_expires_at is not None and entry.offer_expires_at < _now():
+        return None
+    if slot_taken(db, entry.professional_id, entry.offered_date, exclude_offer_id=entry.id):
+        return None
+    return _assign(db, entry, entry.offered_date, "OFFERED")
+
+
+def decline_offer(db: Session, entry: WaitlistEntry) -> bool:
+    """Devolve o paciente à fila, mantendo prioridade e antiguidade."""
+    ok = _claim(db, entry.id, "OFFERED", status="WAITING", offered_date=None, offer_expires_at=None)
+    db.commit()
+    return ok
@@ -0,0 +1,180 @@
+# services/patients/export.py
+"""
+Exportação LGPD (portabilidade): um .zip com um diretório por paciente e um NDJSON por
+tipo de dado. Cada arquivo é escrito em streaming dentro do zip a partir de cursores
+yield_per, então a memória não cresce com o histórico do paciente. Roda fora do request
+(BackgroundTasks), com sessão própria; o arquivo só aparece com o nome final quando completo.
+O .zip expira depois de EXPORT_RETENTION_HOURS (sweep_exports, via cron).
+"""
+
+import json
+import os
+import zipfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from database import SessionLocal
+from models.appointment import Appointment
+from models.export_job import ExportJob
+from models.patient import Patient
+from models.record import Record
+from models.stock_movement import StockMovement
+from models.waitlist import WaitlistEntry
+from schemas.appointment import AppointmentOut
+from schemas.patient import PatientOut
+from schemas.record import RecordOut
+from schemas.stock import MovementOut
+from schemas.waitlist import WaitlistOut
+
+# arquivo NDJSON -> (modelo, schema de saída, ordenação)
+_SECTIONS = {
+    "appointments.ndjson": (Appointment, AppointmentOut, Appointment.date),
+    "records.ndjson": (Record, RecordOut, Record.created_at),
+    "dispensations.ndjson": (StockMovement, MovementOut, StockMovement.created_at),
+    "waitlist.ndjson": (WaitlistEntry, WaitlistOut, WaitlistEntry.created_at),
+}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def export_path(job: ExportJob) -> Optional[Path]:
+    return settings.EXPORT_DIR / job.file_name if job.file_name else None
+
+
+def _write_ndjson(zf: zipfile.ZipFile, name: str, rows: Iterable, schema: type[BaseModel]) -> int:
+    count = 0
+    with zf.open(name, "w") as fh:
+        for row in rows:
+            fh.write(schema.model_validate(row).model_dump_json().encode("utf-8") + b"\n")
+            count += 1
+    return count
+
+
+def _write_patient(db: Session, zf: zipfile.ZipFile, patient: Patient) -> dict:
+    base = f"patient_{patient.id}"
+    zf.writestr(f"{base}/profile.json", PatientOut.model_validate(patient).model_dump_json(indent=2))
+
+    counts = {}
+    batch = settings.EXPORT_BATCH_SIZE
+    for name, (model, schema, order_col) in _SECTIONS.items():
+        q = db.query(model).filter(model.patient_id == patient.id).order_by(order_col, model.id)
+        counts[name] = _write_ndjson(zf, f"{base}/{name}", q.yield_per(batch), schema)
+        db.expunge_all()  # solta as linhas já escritas da identity map
+    return counts
+
+
+def write_export(db: Session, patient_ids: list[int], path: Path) -> dict:
+    """Gera o zip em `path`; retorna o manifesto (também gravado no próprio zip)."""
+    manifest = {"generated_at": _now().isoformat(), "format": "ndjson", "patients": []}
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for pid in patient_ids:
+            patient = db.get(Patient, pid)
+            if patient is None:  # removido depois do pedido
+                manifest["patients"].append({"id": pid, "missing": True})
+                continue
+            manifest["patients"].append({"id": pid, "files": _write_patient(db, zf, patient)})
+        zf.writestr("manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2))
+    return manifest
+
+
+def _claim(db: Session, job_id: int) -> bool:
+    """PENDING -> RUNNING condicional: o mesmo job não roda duas vezes."""
+    result = db.execute(
+        update(ExportJob)
+        .where(ExportJob.id == job_id, ExportJob.status == "PENDING")
+        .values(status="RUNNING", started_at=_now())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def run_export(job_id: int) -> None:
+    """Ponto de entrada do worker (BackgroundTasks)."""
+    db = SessionLocal()
+    try:
+        if not _claim(db, job_id):
+            return
+        job = db.get(ExportJob, job_id)
+        patient_ids = list(job.patient_ids)
+
+        settings.EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+        file_name = f"export_{job_id}.zip"
+        final = settings.EXPORT_DIR / file_name
+        partial = final.with_suffix(".zip.part")
+        try:
+            write_export(db, patient_ids, partial)
+            os.replace(partial, final)
+        except Exception as exc:
+            db.rollback()
+            partial.unlink(missing_ok=True)
+            db.execute(
+                update(ExportJob)
+                .where(ExportJob.id == job_id)
+                .values(status="FAILED", error=str(exc)[:500], finished_at=_now())
+            )
+            db.commit()
+            return  # o erro fica registrado no job (status FAILED)
+
+        result = db.execute(
+            update(ExportJob)
+            .where(ExportJob.id == job_id, ExportJob.status == "RUNNING")
+            .values(status="DONE", file_name=file_name, size_bytes=final.stat().st_size, finished_at=_now())
+        )
+        db.commit()
+        if result.rowcount != 1:  # dado como travado pelo sweep_exports enquanto rodava
+            final.unlink(missing_ok=True)
+    finally:
+        db.close()
+
+
+def sweep_exports(db: Session) -> dict:
+    """
+    Apaga os .zip vencidos (o job fica, sem arquivo: o download responde 410) e marca como
+    FAILED os jobs presos em RUNNING, removendo o .part deixado pelo worker.
+    """
+    now = _now()
+    stats = {"expired": 0, "stale": 0}
+
+    expired = (
+        db.query(ExportJob)
+        .filter(
+            ExportJob.status == "DONE",
+            ExportJob.file_name.isnot(None),
+            ExportJob.finished_at < now - timedelta(hours=settings.EXPORT_RETENTION_HOURS),
+        )
+        .all()
+    )
+    for job in expired:
+        export_path(job).unlink(missing_ok=True)
+        job.file_name = None
+        stats["expired"] += 1
+    db.commit()
+
+    stale_ids = [
+        job_id
+        for (job_id,) in db.query(ExportJob.id).filter(
+            ExportJob.status == "RUNNING",
+            ExportJob.started_at < now - timedelta(minutes=settings.EXPORT_STALE_RUNNING_MINUTES),
+        )
+    ]
+    for job_id in stale_ids:
+        result = db.execute(
+            update(ExportJob)
+            .where(ExportJob.id == job_id, ExportJob.status == "RUNNING")
+            .values(status="FAILED", error="Exportação interrompida (worker parou).", finished_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        if result.rowcount == 1:
+            (settings.EXPORT_DIR / f"export_{job_id}.zip.part").unlink(missing_ok=True)
+            stats["stale"] += 1
+    return stats
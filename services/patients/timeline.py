@@ -0,0 +1,92 @@
+# services/patients/timeline.py
+"""
+Linha do tempo do paciente: consultas, prontuários e dispensações de estoque num único
+feed ordenado por (at, kind, id).
+
+Cada fonte vira um SELECT (at, kind, id) com o filtro do cursor e LIMIT próprios, servido
+por um índice (patient_id, at, id); o UNION ALL junta no máximo 3 x limit chaves e o
+ORDER BY/LIMIT externo escolhe a página. Só depois as linhas da página são carregadas
+(um IN por fonte).
+"""
+
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import literal, select, union_all, and_, or_
+from sqlalchemy.orm import Session
+
+from models.appointment import Appointment
+from models.record import Record
+from models.stock_movement import StockMovement
+
+KINDS = ("appointment", "record", "dispense")
+
+# kind -> (modelo, coluna de tempo, filtro extra)
+_SOURCES = {
+    "appointment": (Appointment, Appointment.date, None),
+    "record": (Record, Record.created_at, None),
+    "dispense": (StockMovement, StockMovement.created_at, StockMovement.type == "OUT"),
+}
+
+
+def _after(kind: str, at_col, id_col, cursor: tuple[datetime, str, int], ascending: bool):
+    """
+    (at, kind, id) depois do cursor, com kind constante nesta fonte: vira uma condição
+    só em (at, id), que o índice resolve como range scan.
+    """
+    c_at, c_kind, c_id = cursor
+    if kind == c_kind:
+        if ascending:
+            return or_(at_col > c_at, and_(at_col == c_at, id_col > c_id))
+        return or_(at_col < c_at, and_(at_col == c_at, id_col < c_id))
+    # empate em `at` decide pelo kind
+    kind_after = kind > c_kind if ascending else kind < c_kind
+    if ascending:
+        return at_col >= c_at if kind_after else at_col > c_at
+    return at_col <= c_at if kind_after else at_col < c_at
+
+
+def _branch(kind: str, patient_id: int, limit: int, cursor, ascending: bool):
+    model, at_col, extra = _SOURCES[kind]
+    stmt = select(
+        at_col.label("at"), literal(kind).label("kind"), model.id.label("id")
+    ).where(model.patient_id == patient_id)
+    if extra is not None:
+        stmt = stmt.where(extra)
+    if cursor is not None:
+        stmt = stmt.where(_after(kind, at_col, model.id, cursor, ascending))
+    order = (at_col.asc(), model.id.asc()) if ascending else (at_col.desc(), model.id.desc())
+    # subquery: SQLite não aceita ORDER BY/LIMIT direto nos membros de um UNION
+    return select(stmt.order_by(*order).limit(limit).subquery())
+
+
+def timeline_page(
+    db: Session,
+    patient_id: int,
+    limit: int,
+    cursor: Optional[tuple[datetime, str, int]] = None,
+    ascending: bool = False,
+    kinds: Iterable[str] = KINDS,
+) -> list[tuple[datetime, str, object]]:
+    """Página da linha do tempo: lista de (at, kind, objeto ORM), na ordem pedida."""
+    branches = [_branch(k, patient_id, limit, cursor, ascending) for k in KINDS if k in set(kinds)]
+    if not branches:
+        return []
+
+    merged = union_all(*branches).subquery()
+    if ascending:
+        order = (merged.c.at.asc(), merged.c.kind.asc(), merged.c.id.asc())
+    else:
+        order = (merged.c.at.desc(), merged.c.kind.desc(), merged.c.id.desc())
+    keys = db.execute(
+        select(merged.c.at, merged.c.kind, merged.c.id).order_by(*order).limit(limit)
+    ).all()
+
+    # hidrata só as linhas da página
+    loaded: dict[tuple[str, int], object] = {}
+    for kind in {k for _, k, _ in keys}:
+        model = _SOURCES[kind][0]
+        ids = [i for _, k, i in keys if k == kind]
+        for obj in db.query(model).filter(model.id.in_(ids)):
+            loaded[(kind, obj.id)] = obj
+    return [(at, kind, loaded[(kind, id_)]) for at, kind, id_ in keys if (kind, id_) in loaded]
@@ -0,0 +1,180 @@
+# services/records/attachments.py
+"""
+Armazenamento dos anexos de prontuário.
+
+Upload em partes: cada PUT grava direto no arquivo parcial, a partir do offset esperado,
+sem montar o arquivo em memória; um pedaço interrompido é descartado no próximo PUT
+(trunca no offset confirmado). A escrita roda no threadpool (em blocos de até 1 MiB) e os
+PUTs de um mesmo upload são serializados por upload_lock(). Ao concluir, o sha256 é calculado lendo o arquivo em
+blocos e ele vira blobs/ab/cd/<sha256>; se o blob já existe, o parcial é apagado (dedupe).
+
+Download: leitura por mmap do intervalo pedido (Range), em blocos.
+"""
+
+import asyncio
+import hashlib
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Iterator, Optional
+from weakref import WeakValueDictionary
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from models.attachment import Attachment, AttachmentBlob, AttachmentUpload
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_HASH_BLOCK = 1024 ** 2
+_WRITE_BLOCK = 1024 ** 2  # acumula o corpo até este tamanho antes de cada ida ao threadpool
+
+# um lock por upload em andamento (some quando ninguém mais o referencia)
+_upload_locks: "WeakValueDictionary[int, asyncio.Lock]" = WeakValueDictionary()
+
+
+class ChunkError(Exception):
+    """Pedaço fora de ordem ou além do tamanho declarado."""
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def blob_path(sha256: str) -> Path:
+    return settings.ATTACHMENTS_DIR / "blobs" / sha256[:2] / sha256[2:4] / sha256
+
+
+def upload_path(upload_id: int) -> Path:
+    return settings.ATTACHMENTS_DIR / "uploads" / f"{upload_id}.part"
+
+
+def upload_lock(upload_id: int) -> asyncio.Lock:
+    """
+    Serializa os PUTs de um mesmo upload neste processo: conferir o offset, gravar e salvar
+    o novo offset precisam acontecer sem outro PUT no meio. Entre processos, o UPDATE
+    condicional do offset (no router) recusa o PUT que chegar depois.
+    """
+    lock = _upload_locks.get(upload_id)
+    if lock is None:
+        lock = _upload_locks[upload_id] = asyncio.Lock()
+    return lock
+
+
+def _open_at(path: Path, start: int) -> BinaryIO:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fh = open(path, "r+b" if path.exists() else "wb")
+    fh.seek(start)
+    fh.truncate()  # descarta sobra de um PUT interrompido
+    return fh
+
+
+async def write_chunk(
+    upload: AttachmentUpload,
+    start: int,
+    chunks: AsyncIterator[bytes],
+    length: Optional[int] = None,
+) -> int:
+    """
+    Grava o pedaço que começa em `start` (deve ser igual a upload.received); com `length`,
+    exige exatamente esse número de bytes. Retorna o novo offset; não altera o banco.
+    O I/O de arquivo roda no threadpool, fora do event loop.
+    """
+    if start != upload.received:
+        raise ChunkError(f"Offset esperado: {upload.received}")
+
+    limit = min(upload.size - start, settings.ATTACHMENT_MAX_CHUNK_BYTES)
+    fh = await run_in_threadpool(_open_at, upload_path(upload.id), start)
+    written = 0
+    buffer = bytearray()
+    try:
+        async for data in chunks:
+            written += len(data)
+            if written > limit:
+                raise ChunkError("Pedaço maior que o permitido ou além do tamanho declarado.")
+            buffer += data
+            if len(buffer) >= _WRITE_BLOCK:
+                await run_in_threadpool(fh.write, buffer)
+                buffer.clear()
+        if length is not None and written != length:
+            raise ChunkError(f"Pedaço incompleto: {written} de {length} bytes.")
+        if buffer:
+            await run_in_threadpool(fh.write, buffer)
+    except ChunkError:
+        await run_in_threadpool(fh.truncate, start)
+        raise
+    finally:
+        await run_in_threadpool(fh.close)
+    return start + written
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while block := fh.read(_HASH_BLOCK):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def finalize_upload(db: Session, upload: AttachmentUpload, user_id: Optional[int]) -> Attachment:
+    """Upload completo -> blob (com dedupe) + Attachment. Não faz commit."""
+    part = upload_path(upload.id)
+    sha = file_sha256(part)
+
+    if db.get(AttachmentBlob, sha) is not None:
+        part.unlink()
+    else:
+        target = blob_path(sha)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(part, target)
+        db.add(AttachmentBlob(sha256=sha, size=upload.size))
+
+    attachment = Attachment(
+        record_id=upload.record_id,
+        sha256=sha,
+        filename=upload.filename,
+        content_type=upload.content_type,
+        size=upload.size,
+        uploaded_by=user_id,
+    )
+    db.add(attachment)
+    db.flush()
+    upload.attachment_id = attachment.id
+    return attachment
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Header Range -> (início, fim inclusivo), ou None para o arquivo inteiro.
+    Só um intervalo por pedido; multipart/byteranges não é suportado (vira arquivo inteiro).
+    """
+    if not header:
+        return None
+    m = _RANGE_RE.match(header.strip())
+    if not m or m.groups() == ("", ""):
+        return None
+    first, last = m.groups()
+    if first == "":  # sufixo: últimos N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+def iter_file_range(path: Path, start: int, end: int, block: Optional[int] = None) -> Iterator[bytes]:
+    """Bytes [start, end] de `path` via mmap, em blocos de ATTACHMENT_READ_CHUNK_BYTES."""
+    if end < start:
+        return
+    block = block or settings.ATTACHMENT_READ_CHUNK_BYTES
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = start
+        while pos <= end:
+            stop = min(pos + block, end + 1)
+            yield mm[pos:stop]
+            pos = stop
@@ -0,0 +1,202 @@
+# services/records/versioning.py
+"""
+Emendas de prontuário com histórico append-only.
+
+A versão atual fica denormalizada em records (notes/version): ler o prontuário continua
+custando uma linha. Cada emenda grava em record_versions um delta em relação à versão
+anterior; a cada RECORD_VERSION_SNAPSHOT_INTERVAL versões (ou quando o delta não compensa)
+grava o texto completo. Reconstruir a versão v = último snapshot <= v + no máximo
+INTERVAL-1 deltas.
+
+Prontuário nunca emendado não tem linhas em record_versions: o snapshot base só é gravado
+na primeira emenda, e até lá a versão atual é a própria linha de records.
+"""
+
+import difflib
+import json
+import re
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models.record import Record
+from models.record_version import RecordVersion
+
+SNAPSHOT = "snapshot"
+DELTA = "delta"
+
+# palavras e espaços separados: diff por token é bem mais barato que por caractere
+_TOKEN_RE = re.compile(r"\s+|[^\s]+")
+
+
+class VersionConflict(Exception):
+    """O prontuário mudou desde a versão que o cliente leu."""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def make_delta(old: str, new: str) -> list:
+    """
+    Delta compacto de `old` para `new`: lista de operações aplicadas em sequência sobre `old`.
+    ["=", n] copia n caracteres, ["-", n] pula n, ["+", s] insere s.
+    """
+    a, b = _TOKEN_RE.findall(old), _TOKEN_RE.findall(new)
+    ops: list = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append(["=", sum(map(len, a[i1:i2]))])
+            continue
+        if i2 > i1:
+            ops.append(["-", sum(map(len, a[i1:i2]))])
+        if j2 > j1:
+            ops.append(["+", "".join(b[j1:j2])])
+    return ops
+
+
+def apply_delta(old: str, ops: list) -> str:
+    out, pos = [], 0
+    for op, arg in ops:
+        if op == "=":
+            out.append(old[pos:pos + arg])
+            pos += arg
+        elif op == "-":
+            pos += arg
+        else:
+            out.append(arg)
+    return "".join(out)
+
+
+def _entry(record: Record, version: int, kind: str, payload: str,
+           professional_id: Optional[int], reason: Optional[str]) -> RecordVersion:
+    return RecordVersion(
+        record_id=record.id,
+        version=version,
+        kind=kind,
+        payload=payload,
+        professional_id=professional_id,
+        reason=reason,
+        created_at=_now(),
+    )
+
+
+def _current_entry(record: Record) -> RecordVersion:
+    """Versão atual de um prontuário sem histórico gravado (transiente, fora da sessão)."""
+    return RecordVersion(
+        record_id=record.id,
+        version=record.version,
+        kind=SNAPSHOT,
+        professional_id=record.professional_id,
+        reason=None,
+        created_at=record.updated_at or record.created_at,
+    )
+
+
+def amend_record(
+    db: Session,
+    record: Record,
+    notes: str,
+    professional_id: int,
+    reason: Optional[str] = None,
+    expected_version: Optional[int] = None,
+) -> Record:
+    """
+    Grava uma nova versão de `record` e atualiza a linha corrente. Não faz commit.
+    A troca de versão é condicional (compare-and-set): duas emendas concorrentes não
+    gravam a mesma versão; a perdedora recebe VersionConflict.
+    """
+    current = record.version
+    if expected_version is not None and expected_version != current:
+        raise VersionConflict(current)
+    if notes == record.notes:
+        return record
+
+    # primeira emenda (ou prontuário anterior ao versionamento): a versão atual vira o snapshot base
+    if not db.query(RecordVersion.id).filter(
+        RecordVersion.record_id == record.id, RecordVersion.version == current
+    ).first():
+        db.add(_entry(record, current, SNAPSHOT, record.notes, record.professional_id, None))
+
+    new_version = current + 1
+    interval = max(1, settings.RECORD_VERSION_SNAPSHOT_INTERVAL)
+    kind, payload = SNAPSHOT, notes
+    if (new_version - 1) % interval:
+        delta = json.dumps(make_delta(record.notes, notes), ensure_ascii=False, separators=(",", ":"))
+        if len(delta) < len(notes):  # emenda que reescreve quase tudo: snapshot sai mais barato
+            kind, payload = DELTA, delta
+
+    now = _now()
+    result = db.execute(
+        update(Record)
+        .where(Record.id == record.id, Record.version == current)
+        .values(notes=notes, version=new_version, updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        raise VersionConflict(current)
+
+    db.add(_entry(record, new_version, kind, payload, professional_id, reason))
+    db.flush()
+    db.refresh(record)
+    return record
+
+
+def list_versions(db: Session, record: Record) -> list[RecordVersion]:
+    entries = (
+        db.query(RecordVersion)
+        .filter(RecordVersion.record_id == record.id)
+        .order_by(RecordVersion.version.desc())
+        .all()
+    )
+    return entries or [_current_entry(record)]
+
+
+def get_version(db: Session, record: Record, version: int) -> Optional[RecordVersion]:
+    entry = (
+        db.query(RecordVersion)
+        .filter(RecordVersion.record_id == record.id, RecordVersion.version == version)
+        .first()
+    )
+    if entry is None and version == record.version:
+        return _current_entry(record)
+    return entry
+
+
+def notes_at(db: Session, record: Record, version: int) -> Optional[str]:
+    """Texto de `record` na versão `version` (None se não existir)."""
+    if version == record.version:
+        return record.notes  # O(1): linha corrente
+    if version < 1 or version > record.version:
+        return None
+
+    base = (
+        db.query(RecordVersion)
+        .filter(
+            RecordVersion.record_id == record.id,
+            RecordVersion.version <= version,
+            RecordVersion.kind == SNAPSHOT,
+        )
+        .order_by(RecordVersion.version.desc())
+        .first()
+    )
+    if base is None:
+        return None
+
+    text = base.payload
+    deltas = (
+        db.query(RecordVersion)
+        .filter(
+            RecordVersion.record_id == record.id,
+            RecordVersion.version > base.version,
+            RecordVersion.version <= version,
+        )
+        .order_by(RecordVersion.version)
+        .all()
+    )
+    for entry in deltas:
+        text = entry.payload if entry.kind == SNAPSHOT else apply_delta(text, json.loads(entry.payload))
+    return text
@@ -0,0 +1,80 @@
+# tests/conftest.py
+# Banco SQLite descartável por sessão de testes: o engine lê DATABASE_URL no import,
+# então o ambiente é ajustado antes de importar o app.
+
+import os
+import sys
+import tempfile
+from itertools import count
+
+_TMP = tempfile.mkdtemp(prefix="sghss_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP}/test.db"
+os.environ["ATTACHMENTS_DIR"] = os.path.join(_TMP, "attachments")
+os.environ["EXPORT_DIR"] = os.path.join(_TMP, "exports")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-with-at-least-32-bytes")
+os.environ.setdefault("LOGIN_THROTTLE_BACKEND", "memory")
+os.environ.setdefault("PASSWORD_POOL_WORKERS", "0")  # bcrypt inline; tests/test_passwords.py cria o próprio pool
+
+# Garante que a raiz do projeto esteja no PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.config import settings
+from database import Base, SessionLocal, engine
+import models  # noqa: F401
+from models.patient import Patient
+from models.user import User
+
+API = settings.API_V1_PREFIX
+PASSWORD = "secret"
+_seq = count(1)
+
+
+@pytest.fixture(scope="session")
+def client():
+    from main import app
+
+    Base.metadata.create_all(engine)
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_user(client, db):
+    """Cria um usuário com o papel pedido; devolve (id, headers com Bearer)."""
+
+    def _make(role: str) -> tuple[int, dict]:
+        n = next(_seq)
+        user = User(
+            name=f"{role} {n}",
+            email=f"{role}{n}@test.com",
+            password=settings.pwd_context.hash(PASSWORD),
+            role=role,
+            cpf=f"{n:011d}",
+        )
+        db.add(user)
+        db.commit()
+        r = client.post(f"{API}/auth/login", json={"email": user.email, "password": PASSWORD})
+        assert r.status_code == 200, r.text
+        return user.id, {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    return _make
+
+
+@pytest.fixture
+def patient_id(db) -> int:
+    patient = Patient(name=f"Paciente {next(_seq)}")
+    db.add(patient)
+    db.commit()
+    return patient.id
@@ -0,0 +1,39 @@
+# tests/test_appointment_events.py
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from conftest import API
+from auth.auth_utils import Principal
+from routers.appointment_router import appointment_events_stream
+
+
+class _ConnectedRequest:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+def test_sse_filter_accepts_offset_aware_bounds(client, make_user, patient_id):
+    doctor_id, headers = make_user("doctor")
+    brt = timezone(timedelta(hours=-3))
+
+    async def first_event() -> str:
+        response = await appointment_events_stream(
+            _ConnectedRequest(),
+            professional_id=None,
+            date_from=datetime(2031, 1, 1, tzinfo=brt),
+            date_to=datetime(2031, 12, 31, tzinfo=brt),
+            last_event_id=None,
+            last_event_id_header=None,
+            current_user=Principal(id=doctor_id, email="-", role="doctor"),
+        )
+        pending = asyncio.ensure_future(response.body_iterator.__anext__())
+        await asyncio.sleep(0.05)  # assinatura feita antes da escrita
+        r = await asyncio.to_thread(client.post, f"{API}/appointments/", headers=headers, json={
+            "patient_id": patient_id, "professional_id": doctor_id, "date": "2031-06-01T10:00:00-03:00",
+        })
+        assert r.status_code == 201, r.text
+        return await asyncio.wait_for(pending, 5)
+
+    chunk = asyncio.run(first_event())
+    assert "\nevent: created\n" in chunk
@@ -0,0 +1,67 @@
+# tests/test_appointments_batch.py
+
+from datetime import datetime
+
+from conftest import API
+
+
+def test_bulk_reports_unknown_professional_as_conflict(client, make_user, patient_id):
+    _, admin = make_user("admin")
+    doctor_id, _ = make_user("doctor")
+    when = datetime(2031, 3, 3, 9, 0)
+    r = client.post(f"{API}/appointments/bulk", headers=admin, json={"items": [
+        {"patient_id": patient_id, "professional_id": doctor_id, "date": when.isoformat()},
+        {"patient_id": patient_id, "professional_id": 999999, "date": when.isoformat()},
+    ]})
+    assert r.status_code == 201, r.text
+    body = r.json()
+    assert [a["professional_id"] for a in body["created"]] == [doctor_id]
+    assert body["conflicts"] == [{
+        "index": 1, "professional_id": 999999, "date": when.isoformat(), "detail": "Profissional não encontrado",
+    }]
+
+
+def test_bulk_abort_with_unknown_professional_is_409(client, make_user, patient_id):
+    _, admin = make_user("admin")
+    r = client.post(f"{API}/appointments/bulk", headers=admin, json={"on_conflict": "abort", "items": [
+        {"patient_id": patient_id, "professional_id": 999999, "date": "2031-03-04T09:00:00"},
+    ]})
+    assert r.status_code == 409
+
+
+def test_recurring_unknown_professional_is_404(client, make_user, patient_id):
+    _, admin = make_user("admin")
+    r = client.post(f"{API}/appointments/recurring", headers=admin, json={
+        "patient_id": patient_id,
+        "professional_id": 999999,
+        "date": (datetime(2031, 3, 5, 9, 0)).isoformat(),
+        "rule": {"freq": "WEEKLY", "count": 3},
+    })
+    assert r.status_code == 404
+    assert r.json()["detail"] == "Profissional não encontrado"
+
+
+def test_recurring_accepts_naive_start_with_aware_until(client, make_user, patient_id):
+    _, doctor = make_user("doctor")
+    r = client.post(f"{API}/appointments/recurring", headers=doctor, json={
+        "patient_id": patient_id,
+        "date": "2031-03-05T09:00:00",
+        "rule": {"freq": "DAILY", "until": "2031-03-10T09:00:00Z"},
+    })
+    assert r.status_code == 201, r.text
+    assert len(r.json()["created"]) == 6
+
+
+def test_bulk_mixes_naive_and_aware_dates_as_utc(client, make_user, patient_id):
+    _, admin = make_user("admin")
+    doctor_id, _ = make_user("doctor")
+    r = client.post(f"{API}/appointments/bulk", headers=admin, json={"items": [
+        {"patient_id": patient_id, "professional_id": doctor_id, "date": "2031-04-01T09:00:00"},
+        {"patient_id": patient_id, "professional_id": doctor_id, "date": "2031-04-01T10:00:00+00:00"},
+        # mesmo instante do primeiro item, escrito em -03:00: conflito dentro do lote
+        {"patient_id": patient_id, "professional_id": doctor_id, "date": "2031-04-01T06:00:00-03:00"},
+    ]})
+    assert r.status_code == 201, r.text
+    body = r.json()
+    assert [a["date"] for a in body["created"]] == ["2031-04-01T09:00:00", "2031-04-01T10:00:00"]
+    assert [(c["index"], c["date"]) for c in body["conflicts"]] == [(2, "2031-04-01T09:00:00")]
@@ -0,0 +1,28 @@
+# tests/test_appointments_status.py
+
+from conftest import API
+from models.waitlist import WaitlistEntry
+
+
+def test_bulk_cancel_offers_freed_slots_to_waitlist(client, make_user, db, patient_id):
+    doctor_id, doctor = make_user("doctor")
+    r = client.post(f"{API}/appointments/", headers=doctor, json={
+        "patient_id": patient_id, "professional_id": doctor_id, "date": "2031-08-01T09:00:00",
+    })
+    assert r.status_code == 201, r.text
+    r = client.post(f"{API}/waitlist/", headers=doctor, json={
+        "patient_id": patient_id, "professional_id": doctor_id,
+        "earliest": "2031-08-01T00:00:00", "latest": "2031-08-02T00:00:00",
+    })
+    assert r.status_code == 201, r.text
+    entry_id = r.json()["id"]
+
+    r = client.post(f"{API}/appointments/bulk/status", headers=doctor, json={
+        "to_status": "CANCELLED", "date_from": "2031-08-01T00:00:00", "date_to": "2031-08-01T23:59:59",
+    })
+    assert r.status_code == 200 and r.json()["updated"] == 1, r.text
+
+    # BackgroundTasks rodam antes do TestClient devolver a resposta
+    entry = db.get(WaitlistEntry, entry_id)
+    assert entry.status in ("ASSIGNED", "OFFERED")
+    assert entry.offered_date.isoformat() == "2031-08-01T09:00:00"
@@ -0,0 +1,53 @@
+# tests/test_attachments.py
+
+import asyncio
+
+import httpx
+import pytest
+
+from conftest import API
+from services.records.attachments import upload_path
+
+CONTENT = bytes(range(256)) * 64  # 16 KiB
+
+
+@pytest.fixture
+def upload(client, make_user, patient_id):
+    """Upload aberto num prontuário novo; devolve (url do upload, headers do médico)."""
+    _, headers = make_user("doctor")
+    r = client.post(f"{API}/patients/{patient_id}/records", headers=headers, json={"patient_id": patient_id, "notes": "Evolução"})
+    assert r.status_code in (200, 201), r.text
+    base = f"{API}/patients/{patient_id}/records/{r.json()['id']}/attachments/uploads"
+    r = client.post(base, headers=headers, json={"filename": "exame.bin", "size": len(CONTENT)})
+    assert r.status_code == 201, r.text
+    return f"{base}/{r.json()['id']}", r.json()["id"], headers
+
+
+async def _slow_body():
+    for i in range(0, len(CONTENT), 1024):
+        await asyncio.sleep(0.001)  # intercala os dois PUTs no event loop
+        yield CONTENT[i:i + 1024]
+
+
+def test_concurrent_puts_of_same_chunk_are_serialized(client, upload):
+    url, upload_id, headers = upload
+    from main import app
+
+    async def put_twice():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            put_headers = {**headers, "Content-Range": f"bytes 0-{len(CONTENT) - 1}/{len(CONTENT)}"}
+            return await asyncio.gather(*(ac.put(url, headers=put_headers, content=_slow_body()) for _ in range(2)))
+
+    responses = asyncio.run(put_twice())
+    assert sorted(r.status_code for r in responses) == [200, 409]
+    assert client.get(url, headers=headers).json()["received"] == len(CONTENT)
+    assert upload_path(upload_id).read_bytes() == CONTENT
+
+
+def test_oversized_chunk_is_rejected_and_truncated(client, upload):
+    url, upload_id, headers = upload
+    r = client.put(url, headers=headers, content=CONTENT + b"x")
+    assert r.status_code == 400
+    assert client.get(url, headers=headers).json()["received"] == 0
+    assert upload_path(upload_id).read_bytes() == b""
@@ -0,0 +1,35 @@
+# tests/test_calendar.py
+
+from conftest import API
+
+RANGE = {"from": "2031-09-01T00:00:00Z", "to": "2031-09-30T23:59:59Z"}
+
+
+def _total(client, headers, **params) -> int:
+    r = client.get(f"{API}/appointments/calendar", headers=headers, params={**RANGE, **params})
+    assert r.status_code == 200, r.text
+    return sum(b["total"] for b in r.json()["buckets"])
+
+
+def test_calendar_reflects_writes_immediately(client, make_user, patient_id):
+    doctor_id, doctor = make_user("doctor")
+    _, admin = make_user("admin")
+    assert _total(client, doctor) == 0
+    before_all = _total(client, admin)
+
+    r = client.post(f"{API}/appointments/", headers=doctor, json={
+        "patient_id": patient_id, "professional_id": doctor_id, "date": "2031-09-10T09:00:00",
+    })
+    assert r.status_code == 201, r.text
+
+    assert _total(client, doctor) == 1
+    assert _total(client, admin) == before_all + 1
+
+
+def test_calendar_accepts_offset_bounds(client, make_user):
+    _, doctor = make_user("doctor")
+    r = client.get(f"{API}/appointments/calendar", headers=doctor, params={
+        "from": "2031-09-01T00:00:00-03:00", "to": "2031-09-02T00:00:00",
+    })
+    assert r.status_code == 200, r.text
+    assert r.json()["date_from"] == "2031-09-01T03:00:00"
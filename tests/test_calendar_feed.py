@@ -0,0 +1,32 @@
+# tests/test_calendar_feed.py
+
+from conftest import API
+
+
+def _feed(client, headers) -> str:
+    r = client.post(f"{API}/appointments/calendar/feed-token", headers=headers)
+    assert r.status_code == 200, r.text
+    return r.json()["url"]
+
+
+def test_logout_all_revokes_feed_token(client, make_user):
+    _, doctor = make_user("doctor")
+    url = _feed(client, doctor)
+    assert client.get(url).status_code == 200
+
+    assert client.post(f"{API}/auth/logout-all", headers=doctor).status_code == 204
+    assert client.get(url).status_code == 401
+
+
+def test_deleted_professional_feed_is_revoked(client, make_user):
+    doctor_id, doctor = make_user("doctor")
+    _, admin = make_user("admin")
+    url = _feed(client, doctor)
+    assert client.delete(f"{API}/users/{doctor_id}", headers=admin).status_code == 204
+    assert client.get(url).status_code == 401
+
+
+def test_admin_cannot_issue_feed_for_unknown_professional(client, make_user):
+    _, admin = make_user("admin")
+    r = client.post(f"{API}/appointments/calendar/feed-token", headers=admin, params={"professional_id": 999999})
+    assert r.status_code == 404
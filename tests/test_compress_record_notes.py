@@ -0,0 +1,49 @@
+# tests/test_compress_record_notes.py
+
+from sqlalchemy import text
+
+from database import SessionLocal
+from models.record import Record
+from scripts import compress_record_notes as job
+
+
+def _legacy(db, patient_id: int, doctor_id: int, notes: str) -> int:
+    """Linha no formato antigo (TEXT puro, sem marcador de formato)."""
+    db.execute(
+        text(
+            "INSERT INTO records (patient_id, professional_id, notes, created_at, version) "
+            "VALUES (:p, :d, :n, CURRENT_TIMESTAMP, 1)"
+        ),
+        {"p": patient_id, "d": doctor_id, "n": notes},
+    )
+    db.commit()
+    return db.execute(text("SELECT max(id) FROM records")).scalar_one()
+
+
+def test_skips_rows_edited_during_the_batch(client, make_user, db, patient_id, monkeypatch):
+    doctor_id, _ = make_user("doctor")
+    edited_id = _legacy(db, patient_id, doctor_id, "Antiga A " * 100)
+    kept_id = _legacy(db, patient_id, doctor_id, "Antiga B " * 100)
+
+    encode = job.encode_notes
+    edited = False
+
+    def encode_and_race(plain: str) -> bytes:
+        nonlocal edited
+        if not edited and plain.startswith("Antiga A"):  # a aplicação edita entre o SELECT e o UPDATE
+            edited = True
+            with SessionLocal() as other:
+                other.get(Record, edited_id).notes = "Editada pela aplicação"
+                other.commit()
+        return encode(plain)
+
+    monkeypatch.setattr(job, "encode_notes", encode_and_race)
+    stats = job.compress_record_notes(batch_size=10)
+
+    assert stats["skipped"] == 1
+    assert stats["rewritten"] >= 1
+    db.expire_all()
+    assert db.get(Record, edited_id).notes == "Editada pela aplicação"
+    assert db.get(Record, kept_id).notes == "Antiga B " * 100
+    raw = db.execute(text("SELECT typeof(notes) FROM records WHERE id = :id"), {"id": kept_id}).scalar_one()
+    assert raw == "blob"
@@ -0,0 +1,42 @@
+# tests/test_exports.py
+
+from datetime import timedelta
+
+from conftest import API
+from core.config import settings
+from models.export_job import ExportJob
+from services.patients.export import _now, export_path, sweep_exports
+
+
+def test_sweep_removes_expired_zip(client, make_user, db, patient_id):
+    _, headers = make_user("admin")
+    job = client.post(f"{API}/exports/", json={"patient_ids": [patient_id]}, headers=headers).json()
+    url = f"{API}/exports/{job['id']}/download"
+    assert client.get(url, headers=headers).status_code == 200
+
+    row = db.get(ExportJob, job["id"])
+    path = export_path(row)
+    row.finished_at = _now() - timedelta(hours=settings.EXPORT_RETENTION_HOURS, minutes=1)
+    db.commit()
+
+    assert sweep_exports(db)["expired"] >= 1
+    assert not path.exists()
+    assert client.get(url, headers=headers).status_code == 410
+
+
+def test_sweep_fails_stale_running_job(client, make_user, db, patient_id):
+    admin_id, _ = make_user("admin")
+    started = _now() - timedelta(minutes=settings.EXPORT_STALE_RUNNING_MINUTES + 1)
+    stale = ExportJob(requested_by=admin_id, patient_ids=[patient_id], status="RUNNING", started_at=started)
+    fresh = ExportJob(requested_by=admin_id, patient_ids=[patient_id], status="RUNNING", started_at=_now())
+    db.add_all([stale, fresh])
+    db.commit()
+    settings.EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    partial = settings.EXPORT_DIR / f"export_{stale.id}.zip.part"
+    partial.write_bytes(b"PK")
+
+    assert sweep_exports(db)["stale"] == 1
+    db.expire_all()
+    assert db.get(ExportJob, stale.id).status == "FAILED"
+    assert db.get(ExportJob, fresh.id).status == "RUNNING"
+    assert not partial.exists()
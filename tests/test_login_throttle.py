@@ -0,0 +1,22 @@
+# tests/test_login_throttle.py
+
+from auth.throttle import MemoryBackend
+
+WINDOW, NOW = 300, 1_000_000.0
+
+
+def test_full_memory_backend_evicts_least_recent_keys():
+    backend = MemoryBackend(max_keys=10)
+    for _ in range(3):
+        assert backend.acquire("email:alvo", 3, WINDOW, NOW) is not None
+    for i in range(9):
+        backend.acquire(f"ip:{i}", 3, WINDOW, NOW)  # chaves com falhas: nenhuma é "stale"
+
+    assert backend.acquire("email:alvo", 3, WINDOW, NOW) is None  # bloqueada e usada por último
+    backend.acquire("ip:novo", 3, WINDOW, NOW)  # teto atingido: limpeza
+
+    assert len(backend._data) <= 10
+    assert "ip:0" not in backend._data
+    assert "ip:novo" in backend._data
+    # a rajada de chaves novas não zera o contador de quem já estava bloqueado
+    assert backend.acquire("email:alvo", 3, WINDOW, NOW) is None
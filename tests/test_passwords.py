@@ -0,0 +1,32 @@
+# tests/test_passwords.py
+
+from time import monotonic, sleep
+
+from auth.passwords import _PasswordPool, _hash
+from core.config import settings
+
+
+def _wait_completed(pool: _PasswordPool, n: int) -> None:
+    deadline = monotonic() + 5
+    while pool.completed < n and monotonic() < deadline:  # o callback roda após o result()
+        sleep(0.01)
+
+
+def test_queue_wait_excludes_hash_time_when_idle(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_POOL_WORKERS", 1)
+    pool = _PasswordPool()
+    try:
+        pool.submit(_hash, "aquecimento").result()  # sobe o processo (spawn) fora da amostra
+        _wait_completed(pool, 1)
+        pool._samples.clear()
+        for _ in range(3):  # um por vez: a fila está sempre vazia
+            pool.submit(_hash, "segredo").result()
+        _wait_completed(pool, 4)
+        stats = pool.stats()
+    finally:
+        pool.shutdown()
+
+    assert stats["completed"] == 4
+    wait, total = stats["queue_wait_ms"]["p50"], stats["total_ms"]["p50"]
+    assert total > 0
+    assert wait < total / 4, stats
@@ -0,0 +1,33 @@
+# tests/test_patients.py
+
+from conftest import API
+from models.appointment import Appointment
+from models.patient import Patient
+
+
+def test_patient_with_records_is_kept(client, make_user, db, patient_id):
+    _, admin = make_user("admin")
+    _, doctor = make_user("doctor")
+    r = client.post(f"{API}/patients/{patient_id}/records", headers=doctor, json={
+        "patient_id": patient_id, "notes": "Primeira evolução",
+    })
+    assert r.status_code in (200, 201), r.text
+
+    r = client.delete(f"{API}/patients/{patient_id}", headers=admin)
+    assert r.status_code == 409
+    assert "prontuários" in r.json()["detail"]
+    assert db.get(Patient, patient_id) is not None
+
+
+def test_patient_without_records_is_deleted_with_appointments(client, make_user, db, patient_id):
+    _, admin = make_user("admin")
+    doctor_id, doctor = make_user("doctor")
+    r = client.post(f"{API}/appointments/", headers=doctor, json={
+        "patient_id": patient_id, "professional_id": doctor_id, "date": "2031-07-01T10:00:00",
+    })
+    assert r.status_code == 201, r.text
+
+    assert client.delete(f"{API}/patients/{patient_id}", headers=admin).status_code == 204
+    db.expire_all()
+    assert db.get(Patient, patient_id) is None
+    assert db.query(Appointment).filter(Appointment.patient_id == patient_id).count() == 0
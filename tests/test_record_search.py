@@ -0,0 +1,42 @@
+# tests/test_record_search.py
+
+from sqlalchemy import text
+
+from conftest import API
+from models.record import RECORDS_FTS_TABLE, Record
+
+SEARCH = f"{API}/records/search"
+
+
+def _hits(client, headers, q: str) -> list[int]:
+    r = client.get(SEARCH, headers=headers, params={"q": q})
+    assert r.status_code == 200
+    return [item["id"] for item in r.json()["items"]]
+
+
+def test_search_follows_updates_and_deletes(client, make_user, db, patient_id):
+    doctor_id, headers = make_user("doctor")
+    long_note = "Hipoglicemia noturna recorrente. " + "Sem outras queixas. " * 200  # comprimida no disco
+    rec = Record(patient_id=patient_id, professional_id=doctor_id, notes=long_note)
+    db.add(rec)
+    db.commit()
+
+    r = client.get(SEARCH, headers=headers, params={"q": "hipoglicemia"})
+    assert [item["id"] for item in r.json()["items"]] == [rec.id]
+    assert "<mark>Hipoglicemia</mark>" in r.json()["items"][0]["snippet"]
+
+    rec.notes = "Trocado para metformina."
+    db.commit()
+    assert rec.id not in _hits(client, headers, "hipoglicemia")
+    assert rec.id in _hits(client, headers, "metformina")
+
+    db.delete(rec)
+    db.commit()
+    assert rec.id not in _hits(client, headers, "metformina")
+    # o índice continua íntegro (conteúdo externo fora de sincronia falha aqui)
+    db.execute(text(f"INSERT INTO {RECORDS_FTS_TABLE}({RECORDS_FTS_TABLE}, rank) VALUES ('integrity-check', 1)"))
+
+
+def test_fts_keeps_no_copy_of_notes(client, db):
+    tables = db.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars().all()
+    assert f"{RECORDS_FTS_TABLE}_content" not in tables
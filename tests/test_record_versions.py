@@ -0,0 +1,23 @@
+# tests/test_record_versions.py
+
+from conftest import API
+from models.record_version import RecordVersion
+
+
+def test_history_is_written_on_first_amendment(client, make_user, db, patient_id):
+    _, headers = make_user("doctor")
+    base = f"{API}/patients/{patient_id}/records"
+    rec = client.post(base, json={"patient_id": patient_id, "notes": "Primeira evolução"}, headers=headers).json()
+    url = f"{base}/{rec['id']}/versions"
+
+    # criar não grava histórico: a versão 1 é a própria linha de records
+    assert db.query(RecordVersion).filter_by(record_id=rec["id"]).count() == 0
+    assert [v["version"] for v in client.get(url, headers=headers).json()] == [1]
+    assert client.get(f"{url}/1", headers=headers).json()["notes"] == "Primeira evolução"
+
+    r = client.patch(f"{base}/{rec['id']}", json={"notes": "Evolução corrigida", "version": 1}, headers=headers)
+    assert r.status_code == 200
+    assert [v["version"] for v in client.get(url, headers=headers).json()] == [2, 1]
+    assert client.get(f"{url}/1", headers=headers).json()["notes"] == "Primeira evolução"
+    assert client.get(f"{url}/2", headers=headers).json()["notes"] == "Evolução corrigida"
+    assert client.get(f"{url}/3", headers=headers).status_code == 404
@@ -0,0 +1,30 @@
+# tests/test_records_read_routing.py
+
+import pytest
+
+import database
+from conftest import API
+from models.record import Record
+
+
+@pytest.fixture
+def empty_replica(monkeypatch, tmp_path):
+    """Réplica vazia (só o schema): o que vier dela não tem os registros do primário."""
+    replica = database._make_engine(f"sqlite:///{tmp_path}/replica.db", "test_replica")
+    database.Base.metadata.create_all(replica)
+    monkeypatch.setattr(database, "replica_engines", [replica])
+    yield replica
+    database.pool_monitors.pop("test_replica", None)
+    replica.dispose()
+
+
+def test_ndjson_export_reads_from_replica(client, make_user, db, patient_id, empty_replica):
+    doctor_id, headers = make_user("doctor")
+    db.add(Record(patient_id=patient_id, professional_id=doctor_id, notes="Evolução"))  # sem HTTP: não fixa
+    db.commit()
+
+    url = f"{API}/patients/{patient_id}/records"
+    assert client.get(url, headers=headers).json() == []
+    r = client.get(url, headers=headers, params={"format": "ndjson"})
+    assert r.status_code == 200
+    assert r.text == ""
@@ -0,0 +1,126 @@
+# tests/test_waitlist.py
+
+from datetime import datetime
+
+import pytest
+
+from conftest import API
+from models.waitlist import WaitlistEntry
+
+WINDOW = {"earliest": "2031-05-01T08:00:00", "latest": "2031-05-31T18:00:00"}
+
+
+@pytest.fixture
+def entry(client, make_user, patient_id):
+    """Entrada na lista do médico dono; devolve (entry_id, professional_id, headers do dono)."""
+    doctor_id, headers = make_user("doctor")
+    r = client.post(f"{API}/waitlist/", headers=headers, json={
+        "patient_id": patient_id, "professional_id": doctor_id, **WINDOW,
+    })
+    assert r.status_code == 201, r.text
+    return r.json()["id"], doctor_id, headers
+
+
+@pytest.mark.parametrize("role", ["nurse", "doctor"])
+def test_cannot_add_to_another_professionals_list(client, make_user, patient_id, entry, role):
+    _, owner_id, _ = entry
+    _, headers = make_user(role)
+    r = client.post(f"{API}/waitlist/", headers=headers, json={
+        "patient_id": patient_id, "professional_id": owner_id, **WINDOW,
+    })
+    assert r.status_code == 403
+
+
+def test_list_is_restricted_to_own_entries(client, make_user, entry):
+    entry_id, owner_id, owner_headers = entry
+    _, other = make_user("nurse")
+    _, admin = make_user("admin")
+
+    # o filtro de outro profissional é ignorado para não-admin
+    r = client.get(f"{API}/waitlist/", headers=other, params={"professional_id": owner_id})
+    assert r.status_code == 200 and r.json() == []
+    assert entry_id in [e["id"] for e in client.get(f"{API}/waitlist/", headers=owner_headers).json()]
+    r = client.get(f"{API}/waitlist/", headers=admin, params={"professional_id": owner_id})
+    assert entry_id in [e["id"] for e in r.json()]
+
+
+@pytest.mark.parametrize("action", ["accept", "decline"])
+def test_cannot_answer_offer_of_another_professional(client, make_user, db, entry, action):
+    entry_id, _, _ = entry
+    row = db.get(WaitlistEntry, entry_id)
+    row.status, row.offered_date = "OFFERED", datetime(2031, 5, 10, 9, 0)
+    db.commit()
+
+    _, other = make_user("technician")
+    assert client.post(f"{API}/waitlist/{entry_id}/{action}", headers=other).status_code == 403
+    db.refresh(row)
+    assert row.status == "OFFERED"
+
+
+def test_cannot_cancel_entry_of_another_professional(client, make_user, entry):
+    entry_id, _, owner_headers = entry
+    _, other = make_user("doctor")
+    assert client.delete(f"{API}/waitlist/{entry_id}", headers=other).status_code == 403
+    assert client.delete(f"{API}/waitlist/{entry_id}", headers=owner_headers).status_code == 204
+
+
+@pytest.fixture
+def offer_mode(monkeypatch):
+    from core.config import settings
+
+    monkeypatch.setattr(settings, "WAITLIST_AUTOFILL_MODE", "offer")
+
+
+def _offered_slot(client, db, headers, doctor_id, patient_id, when: str) -> tuple[int, int]:
+    """Consulta cancelada com duas entradas na fila; devolve (primeira, segunda) entrada."""
+    ids = []
+    for priority in (1, 2):
+        r = client.post(f"{API}/waitlist/", headers=headers, json={
+            "patient_id": patient_id, "professional_id": doctor_id, "priority": priority, **WINDOW,
+        })
+        assert r.status_code == 201, r.text
+        ids.append(r.json()["id"])
+    r = client.post(f"{API}/appointments/", headers=headers, json={
+        "patient_id": patient_id, "professional_id": doctor_id, "date": when,
+    })
+    assert r.status_code == 201, r.text
+    assert client.post(f"{API}/appointments/{r.json()['id']}/cancel", headers=headers).status_code == 200
+    db.expire_all()
+    assert db.get(WaitlistEntry, ids[0]).status == "OFFERED"
+    return ids[0], ids[1]
+
+
+def test_outstanding_offer_holds_the_slot(client, make_user, db, patient_id, offer_mode):
+    from services.appointments.waitlist import fill_slot
+
+    doctor_id, headers = make_user("doctor")
+    first, second = _offered_slot(client, db, headers, doctor_id, patient_id, "2031-05-10T09:00:00")
+
+    r = client.post(f"{API}/appointments/", headers=headers, json={
+        "patient_id": patient_id, "professional_id": doctor_id, "date": "2031-05-10T09:00:00",
+    })
+    assert r.status_code == 409
+    assert fill_slot(doctor_id, datetime(2031, 5, 10, 9, 0)) is None  # não oferece de novo
+    db.expire_all()
+    assert db.get(WaitlistEntry, second).status == "WAITING"
+
+    r = client.post(f"{API}/waitlist/{first}/accept", headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["date"] == "2031-05-10T09:00:00"
+
+
+def test_expired_offer_is_offered_to_next_candidate(client, make_user, db, patient_id, offer_mode):
+    from services.appointments.waitlist import expire_offers
+
+    doctor_id, headers = make_user("doctor")
+    first, second = _offered_slot(client, db, headers, doctor_id, patient_id, "2031-05-11T09:00:00")
+    row = db.get(WaitlistEntry, first)
+    row.offer_expires_at = datetime(2000, 1, 1)
+    db.commit()
+
+    assert expire_offers(db, doctor_id) == 1
+    db.expire_all()
+    assert db.get(WaitlistEntry, first).status == "WAITING"
+    offered = db.get(WaitlistEntry, second)
+    assert offered.status == "OFFERED"
+    assert offered.offered_date == datetime(2031, 5, 11, 9, 0)